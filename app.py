@@ -26,6 +26,11 @@ from PIL import Image
 import pdf2image
 import pytesseract
 import io
+import hashlib
+
+from src.candidate_index import CandidateIndex
+from src.encoders import get_encoder
+from src.resource_manager import get_resource_manager
 
 # Import Milestone 1 modules
 try:
@@ -2025,33 +2030,45 @@ class EnhancedSkillExtractor:
 
 # Enhanced gap analysis with better partial matching
 class EnhancedGapAnalyzer:
-    def __init__(self):
+    def __init__(self, encoder=None):
+        """
+        Args:
+            encoder: Any SkillEncoder (see src.encoders); defaults to the character
+                n-gram TF-IDF backend fitted to the skill taxonomy, built on first use
+        """
         self.similarity_threshold = 0.6
+        self.encoder = encoder
     
     def analyze_skills_similarity(self, resume_skills, jd_skills):
         """Enhanced similarity analysis with better partial matching"""
-        from sklearn.feature_extraction.text import TfidfVectorizer
-        from sklearn.metrics.pairwise import cosine_similarity
-        import numpy as np
-        
         # Extract skill names
         resume_skill_names = [skill['name'] if isinstance(skill, dict) else skill for skill in resume_skills]
         jd_skill_names = [skill['name'] if isinstance(skill, dict) else skill for skill in jd_skills]
         
-        # Create combined skill list for vectorization
-        all_skills = resume_skill_names + jd_skill_names
-        
-        # Use TF-IDF for semantic similarity
-        vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 4))
         try:
-            skill_vectors = vectorizer.fit_transform(all_skills)
-            similarity_matrix = cosine_similarity(skill_vectors[:len(resume_skill_names)], 
-                                                skill_vectors[len(resume_skill_names):])
-        except:
-            # Fallback to simple string matching
+            encoder = self.encoder or get_encoder('tfidf')
+            similarity_matrix = self._similarity_matrix(encoder, resume_skill_names, jd_skill_names)
+        except Exception:
+            # Fallback to the dependency-free hashing encoder
             return self._fallback_similarity(resume_skill_names, jd_skill_names)
         
-        # Analyze matches
+        return self._classify_matches(resume_skill_names, jd_skill_names, similarity_matrix)
+    
+    def _fallback_similarity(self, resume_skills, jd_skills):
+        """Fallback similarity calculation using character n-gram hashing"""
+        similarity_matrix = self._similarity_matrix(get_encoder('hashing'), resume_skills, jd_skills)
+        return self._classify_matches(resume_skills, jd_skills, similarity_matrix)
+    
+    @staticmethod
+    def _similarity_matrix(encoder, resume_skill_names, jd_skill_names):
+        """Resume x JD cosine similarities under ``encoder``"""
+        if not resume_skill_names or not jd_skill_names:
+            return np.zeros((len(resume_skill_names), len(jd_skill_names)))
+        return cosine_similarity(encoder.encode_skills(resume_skill_names),
+                                 encoder.encode_skills(jd_skill_names))
+    
+    def _classify_matches(self, resume_skill_names, jd_skill_names, similarity_matrix):
+        """Best resume skill per JD skill, bucketed into exact / partial / missing"""
         matched_skills = []
         partial_matches = []
         missing_skills = []
@@ -2092,54 +2109,7 @@ class EnhancedGapAnalyzer:
             'partial_matches': partial_matches,
             'missing_skills': missing_skills,
             'similarity_matrix': similarity_matrix,
-            'overall_score': self._calculate_overall_score(matched_skills, partial_matches, jd_skills)
-        }
-    
-    def _fallback_similarity(self, resume_skills, jd_skills):
-        """Fallback similarity calculation using string matching"""
-        from difflib import SequenceMatcher
-        
-        matched_skills = []
-        partial_matches = []
-        missing_skills = []
-        
-        for jd_skill in jd_skills:
-            best_match = None
-            best_similarity = 0
-            
-            for resume_skill in resume_skills:
-                similarity = SequenceMatcher(None, jd_skill.lower(), resume_skill.lower()).ratio()
-                if similarity > best_similarity:
-                    best_similarity = similarity
-                    best_match = resume_skill
-            
-            if best_similarity >= 0.9:
-                matched_skills.append({
-                    'jd_skill': jd_skill,
-                    'resume_skill': best_match,
-                    'similarity': best_similarity,
-                    'match_type': 'exact'
-                })
-            elif best_similarity >= self.similarity_threshold:
-                partial_matches.append({
-                    'jd_skill': jd_skill,
-                    'resume_skill': best_match,
-                    'similarity': best_similarity,
-                    'match_type': 'partial'
-                })
-            else:
-                missing_skills.append({
-                    'jd_skill': jd_skill,
-                    'similarity': best_similarity,
-                    'match_type': 'missing'
-                })
-        
-        return {
-            'matched_skills': matched_skills,
-            'partial_matches': partial_matches,
-            'missing_skills': missing_skills,
-            'similarity_matrix': None,
-            'overall_score': self._calculate_overall_score(matched_skills, partial_matches, jd_skills)
+            'overall_score': self._calculate_overall_score(matched_skills, partial_matches, jd_skill_names)
         }
     
     def _calculate_overall_score(self, matched_skills, partial_matches, jd_skills):
@@ -2168,7 +2138,9 @@ class AISkillGapAnalyzer:
         # Initialize Milestone 3 components if available
         if MILESTONE3_AVAILABLE:
             try:
-                self.encoder = SentenceBERTEncoder()
+                manager = get_resource_manager()
+                manager.register('sentence_bert_encoder', SentenceBERTEncoder, kind='encoder')
+                self.encoder = manager.acquire('sentence_bert_encoder', owner='app')
                 self.calculator = SimilarityCalculator()
                 self.analyzer = SkillGapAnalyzer(self.encoder, self.calculator)
                 self.learning_generator = LearningPathGenerator()
@@ -2751,7 +2723,9 @@ class AISkillGapAnalyzer:
         # Initialize Milestone 3 components if available
         if MILESTONE3_AVAILABLE:
             try:
-                self.encoder = SentenceBERTEncoder()
+                manager = get_resource_manager()
+                manager.register('sentence_bert_encoder', SentenceBERTEncoder, kind='encoder')
+                self.encoder = manager.acquire('sentence_bert_encoder', owner='app')
                 self.calculator = SimilarityCalculator()
                 self.analyzer = SkillGapAnalyzer(self.encoder, self.calculator)
                 self.learning_generator = LearningPathGenerator()
@@ -2763,6 +2737,9 @@ class AISkillGapAnalyzer:
             self.analyzer = None
             self.learning_generator = None
         
+        # Persistent talent pool, opened on first use
+        self.candidate_index = None
+        
         # Initialize embedding models
         self.embedding_models = {
             'all-MiniLM-L6-v2': 'sentence-transformers/all-MiniLM-L6-v2',
@@ -2779,8 +2756,12 @@ class AISkillGapAnalyzer:
             logger.setLevel(logging.INFO)
         return logger
     
-    def process_file(self, uploaded_file, file_type):
+    def process_file(self, uploaded_file, file_type, model_type=None, confidence_threshold=None):
         """Process uploaded file with detailed status tracking"""
+        if model_type is None:
+            model_type = st.session_state.selected_model
+        if confidence_threshold is None:
+            confidence_threshold = st.session_state.confidence_threshold
         try:
             # Save temporary file
             with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp:
@@ -2848,8 +2829,8 @@ class AISkillGapAnalyzer:
                 # Extract skills
                 skills = self.skill_extractor.extract_skills(
                     cleaned_text,
-                    st.session_state.selected_model,
-                    st.session_state.confidence_threshold
+                    model_type,
+                    confidence_threshold
                 )
                 
                 # Update status
@@ -2899,6 +2880,89 @@ class AISkillGapAnalyzer:
                 }
             }
     
+    def process_files(self, uploaded_files, file_type, max_workers=None, on_complete=None):
+        """Process many uploaded files concurrently, returning results in upload order
+        
+        Reading, OCR and cleaning dominate per-file cost and mostly run outside the
+        GIL (file I/O, pdf2image, tesseract), so files are spread over a thread pool.
+        Session settings are read once here because worker threads cannot see
+        st.session_state. ``on_complete(done, total, result)`` is called in the
+        calling thread as each file finishes, so it may update Streamlit widgets.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        
+        model_type = st.session_state.selected_model
+        confidence_threshold = st.session_state.confidence_threshold
+        total = len(uploaded_files)
+        
+        def process_one(uploaded_file):
+            result = self.process_file(uploaded_file, file_type, model_type, confidence_threshold)
+            result['file_name'] = uploaded_file.name
+            return result
+        
+        results = [None] * total
+        if total <= 1:
+            for i, uploaded_file in enumerate(uploaded_files):
+                results[i] = process_one(uploaded_file)
+                if on_complete:
+                    on_complete(i + 1, total, results[i])
+            return results
+        
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            futures = {executor.submit(process_one, f): i for i, f in enumerate(uploaded_files)}
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                if on_complete:
+                    on_complete(done, total, results[futures[future]])
+        return results
+    
+    def get_candidate_index(self):
+        """Talent pool index shared across sessions (requires the Milestone 3 encoder)"""
+        if self.candidate_index is None and self.analyzer:
+            backend = os.environ.get("SKILLGAP_SCREENING_ENCODER", "transformer")
+            if backend == 'transformer':
+                self.candidate_index = CandidateIndex(self.encoder, model_name=self.encoder.model_name)
+            else:
+                # A cheap encoder shortlists the pool; finalists are re-scored with the transformer analyzer
+                self.candidate_index = CandidateIndex(get_encoder(backend), name=backend)
+        return self.candidate_index
+    
+    def index_candidates(self, resume_results):
+        """Add processed resumes to the talent pool, keyed by a hash of their cleaned text"""
+        index = self.get_candidate_index()
+        if index is None:
+            return 0
+        
+        candidates = [
+            (hashlib.sha1(result['cleaned_text'].encode('utf-8')).hexdigest(),
+             result['skills'],
+             {'file_name': result['file_name'], 'indexed_at': datetime.now().isoformat()})
+            for result in resume_results if result['success']
+        ]
+        try:
+            count = index.add_many(candidates)
+            index.save()
+        except Exception as e:
+            self.logger.warning(f"Could not update candidate index: {e}")
+            return 0
+        return count
+    
+    def find_top_candidates(self, jd_skills, top_k=10):
+        """Best candidates in the talent pool for a JD, shortlisted by matrix search and re-scored exactly"""
+        index = self.get_candidate_index()
+        if index is None or not len(index):
+            return []
+        
+        jd_skill_names = [s['name'] if isinstance(s, dict) else s for s in jd_skills]
+        results = index.search(jd_skill_names, top_k=top_k, analyzer=self.analyzer)
+        return [{
+            'candidate_id': r['candidate_id'],
+            'file_name': r['metadata'].get('file_name', r['candidate_id'][:8]),
+            'score': r['score'] * 100,
+            'approx_score': r['approx_score'] * 100,
+            'skill_count': len(r['skills'])
+        } for r in results]
+    
     def analyze_gap(self, resume_skills, jd_skills):
         """Perform enhanced gap analysis using Milestone 3"""
         # Convert skills to simple lists for Milestone 3
@@ -3576,14 +3640,13 @@ def process_documents():
             
             if resume_files:
                 total_resumes = len(resume_files)
-                for idx, resume_file in enumerate(resume_files):
-                    status_text.text(f"Processing resume {idx+1} of {total_resumes}...")
-                    progress = 30 + (idx * 70 // total_resumes)
-                    progress_bar.progress(progress)
-                    
-                    resume_result = analyzer.process_file(resume_file, "resume")
-                    resume_result['file_name'] = resume_file.name
-                    all_resume_results.append(resume_result)
+                status_text.text(f"Processing {total_resumes} resume(s)...")
+                
+                def on_resume_done(done, total, result):
+                    status_text.text(f"Processed resume {done} of {total}: {result['file_name']}")
+                    progress_bar.progress(30 + (done * 70 // total))
+                
+                all_resume_results = analyzer.process_files(resume_files, "resume", on_complete=on_resume_done)
             elif resume_text:
                 status_text.text("Processing pasted resume...")
                 progress_bar.progress(60)
@@ -3619,6 +3682,10 @@ def process_documents():
             # Store all resume results
             st.session_state.all_resume_results = all_resume_results
             
+            # Keep the processed resumes in the talent pool and rank the whole pool for this JD
+            analyzer.index_candidates(all_resume_results)
+            st.session_state.top_candidates = analyzer.find_top_candidates(st.session_state.jd_skills)
+            
             # Set first resume as active for backward compatibility
             if all_resume_results and all_resume_results[0]['success']:
                 st.session_state.cleaned_resume = all_resume_results[0]['cleaned_text']
@@ -3856,7 +3923,24 @@ def perform_gap_analysis():
         except Exception as e:
             st.error(f"Analysis error: {str(e)}")
 
+def render_top_candidates():
+    """Best matches for the JD across every resume indexed so far"""
+    top_candidates = st.session_state.get('top_candidates')
+    if not top_candidates:
+        return
+    
+    with st.expander(f"🏆 Top {len(top_candidates)} Candidates in Talent Pool", expanded=False):
+        candidates_df = pd.DataFrame([{
+            'Rank': rank,
+            'Candidate': c['file_name'],
+            'Match Score': f"{c['score']:.1f}%",
+            'Skills': c['skill_count']
+        } for rank, c in enumerate(top_candidates, 1)])
+        st.dataframe(candidates_df, use_container_width=True, hide_index=True)
+
 def render_gap_analysis():
+    render_top_candidates()
+    
     # Check if we have multiple resume results
     if st.session_state.get('all_analysis_results') and len(st.session_state.all_analysis_results) > 1:
         # Display multiple resume results
@@ -1,260 +1,260 @@
 import streamlit as st
 import spacy
 from spacy.training import Example
+from spacy.util import minibatch
+from thinc.api import compounding
 import re
 import json
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Set, Tuple, Optional
 from collections import defaultdict, Counter
-from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 import logging
 from datetime import datetime
 import tempfile
 import os
+import uuid
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+import hashlib
+from bisect import bisect_right
+from types import MappingProxyType
 from io import BytesIO
 import random
 import plotly.graph_objects as go
 import plotly.express as px
 
+from src.cache_paths import get_cache_dir
+from src.compact_storage import CompactVectorStore, get_storage_codec
+from src.context_patterns import ContextPatternEngine
+from src.embedding_registry import get_shared_encoder, shared_model_name
+from src.encoders import SkillEncoder, get_encoder
+from src.extraction_cache import ExtractionCache, get_extraction_cache
+from src.keyword_automaton import KeywordAutomaton
+from src.nlp_registry import get_nlp, profile_disables, select_profile
+from src.resource_manager import get_resource_manager
+from src.skill_taxonomy import (ABBREVIATIONS, SKILL_CATEGORIES, SKILL_PATTERNS, SKILL_RELATIONSHIPS,
+                                 SKILL_VARIATIONS)
+from src.taxonomy_embeddings import get_taxonomy_embeddings
+from src.weak_supervision import load_examples
+
 # Enhanced skill database with comprehensive coverage
 class ComprehensiveSkillDatabase:
-    def __init__(self):
-        self.skills = self._initialize_comprehensive_skill_database()
-        self.abbreviations = self._initialize_abbreviations()
-        self.skill_patterns = self._initialize_skill_patterns()
-        self.skill_relationships = self._initialize_skill_relationships()
-        self.skill_variations = self._initialize_skill_variations()
-    
-    def _initialize_comprehensive_skill_database(self) -> Dict[str, List[str]]:
+    def __init__(self, tables: Optional[Dict] = None):
+        """
+        Args:
+            tables: Output of ``get_tables()`` to rebuild another database's
+                (possibly edited) contents; defaults to the built-in taxonomy
+        """
+        if tables is None:
+            tables = {
+                'skills': self._initialize_comprehensive_skill_database(),
+                'abbreviations': self._initialize_abbreviations(),
+                'skill_patterns': self._initialize_skill_patterns(),
+                'skill_relationships': self._initialize_skill_relationships(),
+                'skill_variations': self._initialize_skill_variations(),
+            }
+        self.skills = tables['skills']
+        self.abbreviations = tables['abbreviations']
+        self.skill_patterns = tables['skill_patterns']
+        self.skill_relationships = tables['skill_relationships']
+        self.skill_variations = tables['skill_variations']
+        self._keyword_automaton = None
+        self.build_indexes()
+    
+    def get_tables(self) -> Dict:
+        """The editable tables as plain data, e.g. to rebuild this database in a worker process"""
         return {
-            'programming_languages': [
-                'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'C', 'Rust',
-                'Go', 'Kotlin', 'Swift', 'Dart', 'Ruby', 'PHP', 'Scala', 'R', 'MATLAB',
-                'Perl', 'Haskell', 'Elixir', 'Clojure', 'Julia', 'Lua', 'Objective-C',
-                'F#', 'VB.NET', 'Solidity', 'Bash', 'PowerShell', 'SQL', 'HTML', 'CSS'
-            ],
-            'web_frameworks': [
-                'React', 'Angular', 'Vue.js', 'Node.js', 'Express.js', 'Django', 'Flask',
-                'FastAPI', 'Spring Boot', 'Spring', 'ASP.NET', '.NET Core', 'Ruby on Rails',
-                'Laravel', 'Next.js', 'Nuxt.js', 'Svelte', 'SolidJS', 'Qwik', 'Gatsby',
-                'Ember.js', 'Backbone.js', 'jQuery', 'Bootstrap', 'Tailwind CSS', 'Material-UI'
-            ],
-            'mobile_development': [
-                'React Native', 'Flutter', 'Android Development', 'iOS Development',
-                'SwiftUI', 'Kotlin Multiplatform', 'Xamarin', 'Ionic', 'Cordova',
-                'Unity', 'Unreal Engine', 'Mobile UI/UX', 'App Development'
-            ],
-            'databases': [
-                'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Cassandra', 'Oracle',
-                'SQL Server', 'SQLite', 'MariaDB', 'DynamoDB', 'Elasticsearch',
-                'Firebase', 'Neo4j', 'Snowflake', 'BigQuery', 'CosmosDB', 'ClickHouse',
-                'InfluxDB', 'CouchDB', 'Supabase', 'PlanetScale', 'FaunaDB'
-            ],
-            'ml_ai': [
-                'Machine Learning', 'Deep Learning', 'Neural Networks', 'Natural Language Processing',
-                'NLP', 'Computer Vision', 'Reinforcement Learning', 'Transfer Learning',
-                'Feature Engineering', 'MLOps', 'Generative AI', 'Large Language Models',
-                'LLM', 'CNN', 'RNN', 'LSTM', 'Transformer', 'BERT', 'GPT', 'Diffusion Models',
-                'Prompt Engineering', 'AI Ethics', 'Explainable AI', 'Data Science', 'Analytics'
-            ],
-            'ml_frameworks': [
-                'TensorFlow', 'PyTorch', 'Keras', 'Scikit-learn', 'XGBoost', 'LightGBM',
-                'CatBoost', 'Pandas', 'NumPy', 'SciPy', 'Matplotlib', 'Seaborn',
-                'Plotly', 'NLTK', 'spaCy', 'Hugging Face', 'OpenCV', 'LangChain', 'LlamaIndex',
-                'MLflow', 'Kubeflow', 'Airflow', 'DVC', 'Weights & Biases'
-            ],
-            'cloud_platforms': [
-                'AWS', 'Amazon Web Services', 'Azure', 'Microsoft Azure',
-                'Google Cloud Platform', 'GCP', 'Heroku', 'DigitalOcean',
-                'IBM Cloud', 'Oracle Cloud', 'Alibaba Cloud', 'Vercel', 'Netlify'
-            ],
-            'cloud_services': [
-                'AWS Lambda', 'AWS S3', 'AWS EC2', 'Azure Functions', 'Google Cloud Functions',
-                'Kubernetes', 'Docker', 'Terraform', 'Ansible', 'Jenkins', 'GitHub Actions',
-                'GitLab CI', 'CircleCI', 'Prometheus', 'Grafana', 'Datadog', 'New Relic',
-                'CloudFormation', 'Azure DevOps', 'Google Cloud Build', 'Serverless'
-            ],
-            'devops_tools': [
-                'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI', 'GitHub Actions',
-                'CircleCI', 'Ansible', 'Terraform', 'Prometheus', 'Grafana',
-                'ELK Stack', 'Datadog', 'New Relic', 'Splunk', 'PagerDuty',
-                'Bash', 'Shell Scripting', 'CI/CD', 'Infrastructure as Code'
-            ],
-            'version_control': [
-                'Git', 'GitHub', 'GitLab', 'Bitbucket', 'SVN', 'Mercurial',
-                'Source Control', 'Version Management', 'Code Repository'
-            ],
-            'testing': [
-                'Jest', 'Mocha', 'Pytest', 'JUnit', 'Selenium', 'Cypress',
-                'Playwright', 'Postman', 'JMeter', 'LoadRunner', 'Cucumber',
-                'Test-Driven Development', 'Behavior-Driven Development', 'Unit Testing',
-                'Integration Testing', 'E2E Testing', 'Performance Testing'
-            ],
-            'soft_skills': [
-                'Leadership', 'Team Management', 'Communication', 'Problem Solving',
-                'Critical Thinking', 'Analytical Skills', 'Project Management',
-                'Collaboration', 'Teamwork', 'Adaptability', 'Creativity',
-                'Time Management', 'Emotional Intelligence', 'Conflict Resolution',
-                'Strategic Thinking', 'Public Speaking', 'Mentoring', 'Negotiation',
-                'Decision Making', 'Attention to Detail', 'Organization', 'Planning'
-            ],
-            'emerging_tech': [
-                'Blockchain', 'Web3', 'Smart Contracts', 'IoT', 'Edge Computing',
-                'Quantum Computing', 'AR/VR', 'Metaverse', 'Digital Twins',
-                'Robotic Process Automation', 'RPA', '5G', 'Serverless Computing',
-                'Microservices', 'GraphQL', 'WebAssembly', 'Low-Code/No-Code'
-            ],
-            'data_engineering': [
-                'Data Warehousing', 'ETL', 'Data Pipeline', 'Apache Spark', 'Apache Hadoop',
-                'Apache Kafka', 'Apache Flink', 'Data Lake', 'Data Modeling', 'Data Governance',
-                'Streaming Analytics', 'Real-time Processing', 'Batch Processing'
-            ],
-            'cybersecurity': [
-                'Network Security', 'Application Security', 'Cryptography', 'Penetration Testing',
-                'Security Auditing', 'Compliance', 'Risk Assessment', 'Incident Response',
-                'Security Operations', 'Threat Intelligence', 'Identity Management'
-            ],
-            'ui_ux': [
-                'User Interface Design', 'User Experience Design', 'UI/UX', 'Prototyping',
-                'Wireframing', 'Figma', 'Sketch', 'Adobe XD', 'InVision', 'Design Systems',
-                'Responsive Design', 'Accessibility', 'Usability Testing'
-            ],
-            'business_intelligence': [
-                'Tableau', 'Power BI', 'Looker', 'Qlik', 'Domo', 'Data Visualization',
-                'Business Analytics', 'Reporting', 'Dashboarding', 'KPIs', 'Metrics'
-            ]
+            'skills': self.skills,
+            'abbreviations': self.abbreviations,
+            'skill_patterns': self.skill_patterns,
+            'skill_relationships': self.skill_relationships,
+            'skill_variations': self.skill_variations,
         }
     
+    def _initialize_comprehensive_skill_database(self) -> Dict[str, List[str]]:
+        return {category: list(skills) for category, skills in SKILL_CATEGORIES.items()}
+    
     def _initialize_abbreviations(self) -> Dict[str, str]:
-        return {
-            'ML': 'Machine Learning', 'DL': 'Deep Learning', 'AI': 'Artificial Intelligence',
-            'NLP': 'Natural Language Processing', 'CV': 'Computer Vision', 'NN': 'Neural Networks',
-            'CNN': 'Convolutional Neural Networks', 'RNN': 'Recurrent Neural Networks',
-            'LLM': 'Large Language Models', 'GPT': 'Generative Pre-trained Transformer',
-            'K8s': 'Kubernetes', 'CI/CD': 'Continuous Integration/Continuous Deployment',
-            'API': 'Application Programming Interface', 'REST': 'Representational State Transfer',
-            'SQL': 'Structured Query Language', 'NoSQL': 'Not Only SQL',
-            'OOP': 'Object-Oriented Programming', 'FP': 'Functional Programming',
-            'TDD': 'Test-Driven Development', 'BDD': 'Behavior-Driven Development',
-            'AWS': 'Amazon Web Services', 'GCP': 'Google Cloud Platform',
-            'RPA': 'Robotic Process Automation', 'IoT': 'Internet of Things',
-            'AR': 'Augmented Reality', 'VR': 'Virtual Reality', 'UX': 'User Experience',
-            'UI': 'User Interface', 'SaaS': 'Software as a Service', 'PaaS': 'Platform as a Service',
-            'IaaS': 'Infrastructure as a Service', 'CRM': 'Customer Relationship Management',
-            'ERP': 'Enterprise Resource Planning', 'BI': 'Business Intelligence'
-        }
+        return dict(ABBREVIATIONS)
     
     def _initialize_skill_patterns(self) -> List[str]:
-        return [
-            r'experienced? (?:in|with) ([\w\s\+\#\.\-]+)',
-            r'proficient (?:in|with|at) ([\w\s\+\#\.\-]+)',
-            r'expertise (?:in|with) ([\w\s\+\#\.\-]+)',
-            r'knowledge (?:of|in) ([\w\s\+\#\.\-]+)',
-            r'skilled (?:in|at|with) ([\w\s\+\#\.\-]+)',
-            r'familiar (?:with|in) ([\w\s\+\#\.\-]+)',
-            r'strong (?:background|experience) (?:in|with) ([\w\s\+\#\.\-]+)',
-            r'hands.on experience (?:in|with) ([\w\s\+\#\.\-]+)',
-            r'(\d+)\+?\s*years? of (?:experience )?(?:in|with) ([\w\s\+\#\.\-]+)',
-            r'working knowledge of ([\w\s\+\#\.\-]+)',
-            r'proven ability (?:in|with) ([\w\s\+\#\.\-]+)',
-            r'developed (?:using|with) ([\w\s\+\#\.\-]+)',
-            r'built (?:using|with) ([\w\s\+\#\.\-]+)',
-            r'implemented (?:using|with) ([\w\s\+\#\.\-]+)',
-            r'created (?:using|with) ([\w\s\+\#\.\-]+)',
-            r'designed (?:using|with) ([\w\s\+\#\.\-]+)',
-            r'architected (?:using|with) ([\w\s\+\#\.\-]+)',
-            r'worked (?:with|on) ([\w\s\+\#\.\-]+)',
-            r'used ([\w\s\+\#\.\-]+) to',
-            r'certified (?:in|for) ([\w\s\+\#\.\-]+)',
-            r'specialized (?:in|with) ([\w\s\+\#\.\-]+)',
-            r'focused (?:on|in) ([\w\s\+\#\.\-]+)'
-        ]
+        return list(SKILL_PATTERNS)
     
     def _initialize_skill_relationships(self) -> Dict[str, List[str]]:
-        return {
-            'Python': ['Django', 'Flask', 'FastAPI', 'Pandas', 'NumPy', 'scikit-learn', 'PyTorch'],
-            'JavaScript': ['React', 'Vue.js', 'Angular', 'Node.js', 'TypeScript', 'Express.js'],
-            'Machine Learning': ['Deep Learning', 'TensorFlow', 'PyTorch', 'scikit-learn'],
-            'AWS': ['AWS Lambda', 'AWS S3', 'AWS EC2', 'DynamoDB', 'CloudFormation'],
-            'Docker': ['Kubernetes', 'Containerization', 'Microservices'],
-            'React': ['React Native', 'Redux', 'Next.js', 'Webpack'],
-            'Data Science': ['Python', 'R', 'Pandas', 'NumPy', 'Machine Learning'],
-            'DevOps': ['CI/CD', 'Docker', 'Kubernetes', 'Jenkins', 'Terraform'],
-            'Frontend': ['HTML', 'CSS', 'JavaScript', 'React', 'Vue.js', 'Angular'],
-            'Backend': ['Node.js', 'Python', 'Java', 'Databases', 'APIs']
-        }
+        return {skill: list(related) for skill, related in SKILL_RELATIONSHIPS.items()}
     
     def _initialize_skill_variations(self) -> Dict[str, List[str]]:
-        return {
-            'Python': ['Python 3', 'Python 2', 'Py'],
-            'JavaScript': ['JS', 'JavaScript ES6', 'ES6', 'JavaScript ES2015'],
-            'TypeScript': ['TS'],
-            'React': ['React.js', 'ReactJS'],
-            'Node.js': ['Node', 'NodeJS'],
-            'Machine Learning': ['ML'],
-            'Deep Learning': ['DL'],
-            'Natural Language Processing': ['NLP'],
-            'Computer Vision': ['CV'],
-            'User Interface': ['UI'],
-            'User Experience': ['UX'],
-            'Amazon Web Services': ['AWS'],
-            'Google Cloud Platform': ['GCP'],
-            'Microsoft Azure': ['Azure'],
-            'Structured Query Language': ['SQL'],
-            'Not Only SQL': ['NoSQL'],
-            'Continuous Integration': ['CI'],
-            'Continuous Deployment': ['CD'],
-            'Application Programming Interface': ['API'],
-            'Representational State Transfer': ['REST']
-        }
+        return {skill: list(variations) for skill, variations in SKILL_VARIATIONS.items()}
+    
+    def build_indexes(self):
+        """Compile the skill lists into read-only lookup tables; call again after editing them"""
+        all_skills = tuple(skill for skills in self.skills.values() for skill in skills)
+        unique_skills = tuple(dict.fromkeys(all_skills))
+        
+        # Casefolded name -> spelling used in the database, and canonical name -> category
+        # (the first occurrence wins for skills listed in several categories)
+        canonical = {}
+        categories = {}
+        for category, skills in self.skills.items():
+            for skill in skills:
+                canonical.setdefault(skill.casefold(), skill)
+                categories.setdefault(skill.casefold(), category)
+        
+        # Abbreviation or variation -> standard name; abbreviations take precedence
+        aliases = {}
+        for abbr, full_skill in self.abbreviations.items():
+            aliases.setdefault(abbr.casefold(), full_skill)
+        for standard_skill, variations in self.skill_variations.items():
+            for variation in variations:
+                aliases.setdefault(variation.casefold(), standard_skill)
+        
+        self._all_skills = all_skills
+        self.unique_skills = unique_skills
+        self.skill_names = frozenset(unique_skills)
+        self.lowered_skills = tuple((skill, skill.lower()) for skill in unique_skills)
+        
+        # Inverted index: lowercased word -> ids (positions in unique_skills) of skills using it
+        skill_words = tuple(frozenset(skill_lower.split()) for _, skill_lower in self.lowered_skills)
+        word_index = defaultdict(list)
+        for skill_id, words in enumerate(skill_words):
+            for word in words:
+                word_index[word].append(skill_id)
+        self._skill_words = skill_words
+        self._word_index = MappingProxyType({word: tuple(ids) for word, ids in word_index.items()})
+        
+        # Every lowercased name in one string, for "fragment occurs inside a skill" lookups
+        starts = []
+        offset = 0
+        for _, skill_lower in self.lowered_skills:
+            starts.append(offset)
+            offset += len(skill_lower) + 1
+        self._joined_skills = '\x00'.join(skill_lower for _, skill_lower in self.lowered_skills)
+        self._joined_starts = tuple(starts)
+        self._canonical_index = MappingProxyType(canonical)
+        self._category_index = MappingProxyType(categories)
+        self._alias_index = MappingProxyType(aliases)
+        self.version = hashlib.sha1(json.dumps(
+            [self.skills, self.abbreviations, self.skill_variations], sort_keys=True
+        ).encode('utf-8')).hexdigest()[:16]
+        self._keyword_automaton = None
+        self._substring_automaton = None
+        self.context_engine = ContextPatternEngine(self.skill_patterns)
     
     def get_all_skills(self) -> List[str]:
-        all_skills = []
-        for skills in self.skills.values():
-            all_skills.extend(skills)
-        return all_skills
+        return list(self._all_skills)
+    
+    def is_known_skill(self, skill: str) -> bool:
+        """Exact (case-sensitive) membership test against the skill database"""
+        return skill in self.skill_names
+    
+    def get_canonical_skill(self, skill: str) -> Optional[str]:
+        """Database spelling of ``skill`` compared case-insensitively, or None"""
+        return self._canonical_index.get(skill.casefold())
     
     def get_category_for_skill(self, skill: str) -> Optional[str]:
-        skill_lower = skill.lower()
-        for category, skills in self.skills.items():
-            if any(s.lower() == skill_lower for s in skills):
-                return category
-        return 'other'
+        return self._category_index.get(skill.casefold(), 'other')
+    
+    def get_keyword_automaton(self) -> KeywordAutomaton:
+        """Automaton over every skill name, abbreviation and variation, built on first use"""
+        if self._keyword_automaton is None:
+            keywords = [(skill, skill) for skill in self.unique_skills]
+            keywords.extend(self.abbreviations.items())
+            keywords.extend((variation, standard_skill)
+                            for standard_skill, variations in self.skill_variations.items()
+                            for variation in variations)
+            self._keyword_automaton = KeywordAutomaton(keywords)
+        return self._keyword_automaton
+    
+    def skills_in_text(self, text: str) -> Set[str]:
+        """Skills whose lowercased name occurs anywhere in ``text`` (plain substring test)"""
+        if self._substring_automaton is None:
+            self._substring_automaton = KeywordAutomaton(
+                ((skill_lower, skill) for skill, skill_lower in self.lowered_skills),
+                word_boundaries=False
+            )
+        return set(self._substring_automaton.find_values(text, overlapping=True))
+    
+    def skills_containing(self, fragment: str) -> Set[str]:
+        """Skills whose lowercased name contains ``fragment`` (plain substring test)"""
+        fragment = fragment.lower()
+        if not fragment or '\x00' in fragment:
+            return {skill for skill, skill_lower in self.lowered_skills if fragment in skill_lower}
+        
+        found = set()
+        joined, starts = self._joined_skills, self._joined_starts
+        pos = joined.find(fragment)
+        while pos != -1:
+            skill_id = bisect_right(starts, pos) - 1
+            found.add(self.unique_skills[skill_id])
+            # Continue with the next skill; one hit per skill is enough
+            next_start = starts[skill_id + 1] if skill_id + 1 < len(starts) else len(joined)
+            pos = joined.find(fragment, next_start)
+        return found
+    
+    def skills_with_word_overlap(self, words: Set[str], min_ratio: float = 0.7) -> Set[str]:
+        """
+        Skills sharing enough words with ``words``
+        
+        A skill qualifies when the number of shared words is at least ``min_ratio`` times
+        the smaller of the two word sets. Only skills sharing a word are ever compared.
+        """
+        if not words:
+            return set()
+        candidates = set()
+        for word in words:
+            candidates.update(self._word_index.get(word, ()))
+        
+        found = set()
+        for skill_id in candidates:
+            skill_words = self._skill_words[skill_id]
+            overlap = len(words & skill_words)
+            if overlap >= min(len(words), len(skill_words)) * min_ratio:
+                found.add(self.unique_skills[skill_id])
+        return found
+    
+    def match_context_patterns(self, text: str) -> Set[str]:
+        """Known skills captured by the context patterns ("experience with X", ...)"""
+        return {skill for skill, _ in self.context_engine.extract(text, self._lookup_skill)}
+    
+    def _lookup_skill(self, candidate: str) -> Optional[str]:
+        """Canonical skill for a captured phrase (abbreviations and case-insensitive names)"""
+        candidate = candidate.strip()
+        if not candidate:
+            return None
+        normalized = self.normalize_skill_name(candidate)
+        if self.is_known_skill(normalized):
+            return normalized
+        return self.get_canonical_skill(normalized) or self.get_canonical_skill(candidate)
     
     def get_related_skills(self, skill: str) -> List[str]:
         return self.skill_relationships.get(skill, [])
     
     def normalize_skill_name(self, skill: str) -> str:
-        # Check if it's an abbreviation
-        if skill.upper() in self.abbreviations:
-            return self.abbreviations[skill.upper()]
-        
-        # Check if it's a variation
-        skill_lower = skill.lower()
-        for standard_skill, variations in self.skill_variations.items():
-            if skill_lower in [v.lower() for v in variations]:
-                return standard_skill
-        
-        return skill
+        # Abbreviations first, then variations
+        return self._alias_index.get(skill.casefold(), skill)
 
 # Enhanced text preprocessor
 class EnhancedTextPreprocessor:
     def __init__(self):
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-            if "sentencizer" not in self.nlp.pipe_names:
-                self.nlp.add_pipe("sentencizer")
-        except OSError:
-            st.warning("🚀 Installing and downloading required NLP models...")
-            import subprocess
-            subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
-            if "sentencizer" not in self.nlp.pipe_names:
-                self.nlp.add_pipe("sentencizer")
-        
-        self._customize_pipeline()
+        # The spaCy pipeline comes from the shared registry on first use
+        self._nlp = None
+    
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            try:
+                self._nlp = get_nlp("en_core_web_sm", owner='EnhancedTextPreprocessor', add_sentencizer=True)
+            except OSError:
+                st.warning("🚀 Installing and downloading required NLP models...")
+                import subprocess
+                subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
+                self._nlp = get_nlp("en_core_web_sm", owner='EnhancedTextPreprocessor', add_sentencizer=True)
+            
+            self._customize_pipeline()
+        return self._nlp
     
     def _customize_pipeline(self):
         # Add technical terms to the stop word list removal exception
@@ -267,21 +267,71 @@ class EnhancedTextPreprocessor:
         }
         
         for term in technical_terms:
-            if term in self.nlp.Defaults.stop_words:
-                self.nlp.Defaults.stop_words.remove(term)
-    
-    def preprocess(self, text: str) -> Dict:
+            if term in self._nlp.Defaults.stop_words:
+                self._nlp.Defaults.stop_words.remove(term)
+    
+    def preprocess(self, text: str, profile: str = 'full') -> Dict:
+        """
+        Run the spaCy pipeline with only the components ``profile`` needs
+        
+        Args:
+            text: Raw document text
+            profile: One of PIPELINE_PROFILES ('tokenizer', 'tagger', 'ner',
+                'tagger_ner', 'parser', 'full')
+        """
         if not text or not text.strip():
             return {'success': False, 'error': 'Empty text'}
         
         try:
-            doc = self.nlp(text)
+            disabled = profile_disables(self.nlp, profile)
+            doc = self.nlp(text, disable=disabled)
+            return self._analyse_doc(doc, profile, disabled)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    def preprocess_batch(self, texts: List[str], profile: str = 'full',
+                         n_process: int = 1, batch_size: int = 32) -> List[Dict]:
+        """
+        Stream many documents through ``nlp.pipe``
+        
+        Returns one preprocess result per input text, in input order. Empty texts
+        and documents that fail are reported individually instead of aborting the
+        whole batch.
+        """
+        results: List[Optional[Dict]] = [None] * len(texts)
+        valid = []
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                results[i] = {'success': False, 'error': 'Empty text'}
+            else:
+                valid.append(i)
+        
+        disabled = profile_disables(self.nlp, profile)
+        try:
+            docs = self.nlp.pipe((texts[i] for i in valid), disable=disabled,
+                                 n_process=n_process, batch_size=batch_size)
+            for i, doc in zip(valid, docs):
+                results[i] = self._analyse_doc(doc, profile, disabled)
+        except Exception:
+            # A failing document aborts nlp.pipe; redo the rest one by one so the
+            # error is attributed to that document only
+            for i in valid:
+                if results[i] is None:
+                    results[i] = self.preprocess(texts[i], profile=profile)
+        
+        return results
+    
+    def _analyse_doc(self, doc, profile: str, disabled: List[str]) -> Dict:
+        """Pull chunks, entities, sentences and tokens out of a parsed Doc"""
+        try:
+            enabled = set(self.nlp.pipe_names) - set(disabled)
             
-            # Extract noun chunks
+            # Extract noun chunks (requires the dependency parse)
             noun_chunks = []
-            for chunk in doc.noun_chunks:
-                if len(chunk.text.split()) <= 4:
-                    noun_chunks.append(chunk.text)
+            if 'parser' in enabled:
+                for chunk in doc.noun_chunks:
+                    if len(chunk.text.split()) <= 4:
+                        noun_chunks.append(chunk.text)
             
             # Extract technical entities
             technical_entities = []
@@ -295,12 +345,13 @@ class EnhancedTextPreprocessor:
             # Extract tokens (non-stop words, non-punctuation)
             tokens = [token for token in doc if not token.is_stop and not token.is_punct]
             
-            # Process text for analysis
-            processed_text = ' '.join([token.lemma_.lower() for token in doc if not token.is_stop and not token.is_space])
+            # Process text for analysis (falls back to the surface form without a lemmatizer)
+            processed_text = ' '.join([(token.lemma_ or token.text).lower() for token in doc if not token.is_stop and not token.is_space])
             
             return {
                 'success': True,
                 'doc': doc,
+                'profile': profile,
                 'noun_chunks': noun_chunks,
                 'entities': technical_entities,
                 'sentences': sentences,
@@ -310,14 +361,92 @@ class EnhancedTextPreprocessor:
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
+# Extraction methods in the order they run, and the spaCy components each one reads
+# from the parsed Doc. Methods with no requirements only look at the raw text.
+EXTRACTION_METHODS = (
+    'keyword_matching', 'pos_patterns', 'context_based', 'ner',
+    'noun_chunks', 'semantic_matching', 'custom_ner'
+)
+
+METHOD_PIPELINE_REQUIREMENTS = {
+    'keyword_matching': (),
+    'pos_patterns': ('tagger', 'parser'),
+    'context_based': (),
+    'ner': ('ner',),
+    'noun_chunks': ('tagger', 'parser'),
+    'semantic_matching': (),
+    'custom_ner': ()
+}
+
+# Methods that read the parsed Doc; the others only need the raw text and can run
+# while spaCy is still parsing
+DOC_METHODS = ('pos_patterns', 'ner', 'noun_chunks')
+
+# Methods that read the Doc's sentences; in threads and processes modes they start on
+# the thread pool once spaCy is done, so their input is the same in every mode
+SENTENCE_METHODS = ('semantic_matching',)
+
+# Rough relative cost, cheapest first: under a deadline the cheap methods run first
+# and the expensive ones are the ones skipped
+METHOD_COST_ORDER = (
+    'keyword_matching', 'context_based', 'ner', 'pos_patterns',
+    'noun_chunks', 'custom_ner', 'semantic_matching'
+)
+
+# Named latency budgets: the methods each profile runs and its default deadline (seconds,
+# None for no limit). Interactive screening uses 'fast', overnight batches 'thorough'.
+EXTRACTION_PROFILES = {
+    'fast': {'methods': ('keyword_matching', 'context_based'), 'deadline': 1.0},
+    'balanced': {'methods': ('keyword_matching', 'context_based', 'ner', 'pos_patterns', 'noun_chunks'),
+                 'deadline': 5.0},
+    'thorough': {'methods': EXTRACTION_METHODS, 'deadline': None},
+}
+
+# 'sequential' runs one method after another; 'threads' runs the text-only methods on
+# a thread pool alongside spaCy; 'processes' additionally moves the context regexes
+# to a worker process so they do not compete for the GIL
+EXECUTOR_MODES = ('sequential', 'threads', 'processes')
+
+_worker_skill_db = None
+
+def _init_context_patterns_worker(tables: Dict) -> None:
+    """Process-pool initializer: rebuild the parent's skill database, edits included"""
+    global _worker_skill_db
+    _worker_skill_db = ComprehensiveSkillDatabase(tables)
+
+def _context_patterns_worker(text: str) -> Tuple[Set[str], float]:
+    """Process-pool entry point: context-pattern extraction with the per-process skill database"""
+    start = time.perf_counter()
+    return _worker_skill_db.match_context_patterns(text), time.perf_counter() - start
+
 # Advanced skill extractor with multiple methods
 class AdvancedSkillExtractor:
     def __init__(self):
-        self.skill_db = ComprehensiveSkillDatabase()
-        self.preprocessor = EnhancedTextPreprocessor()
+        # Skill database and spaCy pipeline are built once per process
+        manager = get_resource_manager()
+        manager.register('comprehensive_skill_database', ComprehensiveSkillDatabase, kind='skill_database')
+        manager.register('enhanced_text_preprocessor', EnhancedTextPreprocessor, kind='model')
+        self.skill_db = manager.acquire('comprehensive_skill_database', owner='AdvancedSkillExtractor')
+        self.preprocessor = manager.acquire('enhanced_text_preprocessor', owner='AdvancedSkillExtractor')
         self.embedder = None  # Lazy loading
         self.logger = self._setup_logger()
         self.custom_ner = None
+        
+        # Semantic matching: documents are scored window by window against the taxonomy
+        self.semantic_threshold = 0.5  # Lowered threshold to catch more skills
+        self.semantic_top_k = None  # Keep every skill above the threshold
+        self.semantic_window_chars = 500  # Well under MiniLM's 256 word-piece limit
+        
+        # How extraction methods are scheduled (see EXECUTOR_MODES)
+        self.executor_mode = 'sequential'
+        self.max_workers = len(EXTRACTION_METHODS)
+        self._thread_pool = None
+        self._process_pool = None
+        self._process_pool_signature = None
+        
+        # Results are reused for identical text, taxonomy, methods and models
+        self.extraction_cache = get_extraction_cache()
+        self.use_cache = True
     
     def _setup_logger(self):
         logger = logging.getLogger('AdvancedSkillExtractor')
@@ -333,7 +462,7 @@ class AdvancedSkillExtractor:
         """Lazy loading of the sentence transformer model"""
         if self.embedder is None:
             try:
-                self.embedder = SentenceTransformer('all-MiniLM-L6-v2')
+                self.embedder = get_shared_encoder('all-MiniLM-L6-v2', owner=self.__class__.__name__)
                 self.logger.info("Sentence-BERT model loaded successfully")
             except Exception as e:
                 self.logger.error(f"Failed to load Sentence-BERT model: {e}")
@@ -342,26 +471,14 @@ class AdvancedSkillExtractor:
     
     def _extract_by_enhanced_keywords(self, text: str) -> Set[str]:
         """Extract skills using keyword matching with variations and abbreviations"""
-        found_skills = set()
-        text_lower = text.lower()
-        
-        # Direct keyword matching
-        for skill in self.skill_db.get_all_skills():
-            if skill.lower() in text_lower:
-                found_skills.add(skill)
-        
-        # Check for abbreviations
-        for abbr, full_skill in self.skill_db.abbreviations.items():
-            if abbr.lower() in text_lower:
-                found_skills.add(full_skill)
-        
-        # Check for variations
-        for standard_skill, variations in self.skill_db.skill_variations.items():
-            for variation in variations:
-                if variation.lower() in text_lower:
-                    found_skills.add(standard_skill)
-        
-        return found_skills
+        # One pass over the text for every name, abbreviation and variation, matching
+        # whole tokens only so "R" or "Go" do not fire inside "React" or "Google"
+        return set(self.skill_db.get_keyword_automaton().find_values(text))
+    
+    def find_keyword_mentions(self, text: str) -> List[Dict]:
+        """Keyword matches with the canonical skill, the matched text and character offsets"""
+        return [{'skill': skill, 'text': text[start:end], 'start': start, 'end': end}
+                for skill, start, end in self.skill_db.get_keyword_automaton().find_all(text)]
     
     def _extract_by_advanced_pos_patterns(self, doc) -> Set[str]:
         """Extract skills using advanced part-of-speech patterns"""
@@ -371,12 +488,12 @@ class AdvancedSkillExtractor:
         for chunk in doc.noun_chunks:
             chunk_text = chunk.text.strip()
             normalized_skill = self.skill_db.normalize_skill_name(chunk_text)
-            if normalized_skill in self.skill_db.get_all_skills():
+            if self.skill_db.is_known_skill(normalized_skill):
                 found_skills.add(normalized_skill)
         
         # Pattern 2: Adjective + Noun combinations
         for token in doc:
-            if token.pos_ == 'NOUN' and token.text in self.skill_db.get_all_skills():
+            if token.pos_ == 'NOUN' and self.skill_db.is_known_skill(token.text):
                 found_skills.add(token.text)
         
         # Pattern 3: Compound nouns
@@ -386,35 +503,14 @@ class AdvancedSkillExtractor:
                 if token.dep_ == 'compound' and token.head.pos_ == 'NOUN':
                     compound = f"{token.text} {token.head.text}"
                     normalized_compound = self.skill_db.normalize_skill_name(compound)
-                    if normalized_compound in self.skill_db.get_all_skills():
+                    if self.skill_db.is_known_skill(normalized_compound):
                         found_skills.add(normalized_compound)
         
         return found_skills
     
     def _extract_by_context_patterns(self, text: str) -> Set[str]:
         """Extract skills using context-based patterns"""
-        found_skills = set()
-        
-        for pattern in self.skill_db.skill_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Handle patterns with multiple capture groups
-                if len(match.groups()) > 1:
-                    # For patterns like "(\d+) years of experience in (skill)"
-                    skill = match.group(2).strip()
-                else:
-                    skill = match.group(1).strip()
-                
-                # Clean and normalize the skill
-                skill = re.sub(r'[^\w\s\-\+\.]', '', skill)
-                skill = skill.strip()
-                
-                if skill and len(skill) > 1:
-                    normalized_skill = self.skill_db.normalize_skill_name(skill)
-                    if normalized_skill in self.skill_db.get_all_skills():
-                        found_skills.add(normalized_skill)
-        
-        return found_skills
+        return self.skill_db.match_context_patterns(text)
     
     def _extract_by_enhanced_ner(self, entities: List[Tuple[str, str]]) -> Set[str]:
         """Extract skills using enhanced named entity recognition"""
@@ -423,13 +519,12 @@ class AdvancedSkillExtractor:
         for entity, label in entities:
             # Check if entity matches a known skill
             normalized_entity = self.skill_db.normalize_skill_name(entity)
-            if normalized_entity in self.skill_db.get_all_skills():
+            if self.skill_db.is_known_skill(normalized_entity):
                 found_skills.add(normalized_entity)
             
-            # Check if entity contains a skill
-            for skill in self.skill_db.get_all_skills():
-                if skill.lower() in entity.lower() or entity.lower() in skill.lower():
-                    found_skills.add(skill)
+            # Check if entity contains a skill, or is part of one
+            found_skills.update(self.skill_db.skills_in_text(entity))
+            found_skills.update(self.skill_db.skills_containing(entity))
         
         return found_skills
     
@@ -440,29 +535,19 @@ class AdvancedSkillExtractor:
         for chunk in noun_chunks:
             # Direct match
             normalized_chunk = self.skill_db.normalize_skill_name(chunk)
-            if normalized_chunk in self.skill_db.get_all_skills():
+            if self.skill_db.is_known_skill(normalized_chunk):
                 found_skills.add(normalized_chunk)
             
             # Check if chunk contains a skill
-            for skill in self.skill_db.get_all_skills():
-                if skill.lower() in chunk.lower():
-                    found_skills.add(skill)
+            found_skills.update(self.skill_db.skills_in_text(chunk))
             
-            # Check for partial matches with length constraints
+            # Check for partial matches with length constraints (high word overlap)
             if len(chunk.split()) <= 3:
-                for skill in self.skill_db.get_all_skills():
-                    # Check for high overlap
-                    chunk_words = set(chunk.lower().split())
-                    skill_words = set(skill.lower().split())
-                    
-                    if chunk_words and skill_words:
-                        overlap = len(chunk_words.intersection(skill_words))
-                        if overlap >= min(len(chunk_words), len(skill_words)) * 0.7:
-                            found_skills.add(skill)
+                found_skills.update(self.skill_db.skills_with_word_overlap(set(chunk.lower().split()), 0.7))
         
         return found_skills
     
-    def _extract_by_semantic_similarity(self, text: str) -> Set[str]:
+    def _extract_by_semantic_similarity(self, text: str, sentences: Optional[List[str]] = None) -> Set[str]:
         """Extract skills using semantic similarity with Sentence-BERT"""
         found_skills = set()
         embedder = self._get_embedder()
@@ -472,40 +557,71 @@ class AdvancedSkillExtractor:
             return found_skills
         
         try:
-            # Get all skills from database
-            all_skills = self.skill_db.get_all_skills()
-            
-            # Encode text and skills
-            text_embedding = embedder.encode([text])
-            skill_embeddings = embedder.encode(all_skills)
-            
-            # Calculate similarities
-            similarities = cosine_similarity(text_embedding, skill_embeddings)[0]
-            
-            # Get skills with similarity above threshold
-            threshold = 0.5  # Lowered threshold to catch more skills
-            for i, similarity in enumerate(similarities):
-                if similarity >= threshold:
-                    found_skills.add(all_skills[i])
-            
-            self.logger.info(f"Semantic extraction found {len(found_skills)} skills")
+            windows = self._semantic_windows(text, sentences)
+            if not windows:
+                return found_skills
+            
+            # Skill embeddings are computed once per model and skill list, then reused;
+            # every window is encoded in one batch and each skill keeps its best score
+            taxonomy = self._get_taxonomy_embeddings(embedder)
+            window_embeddings = embedder.encode(windows)
+            matches = taxonomy.top_matches(window_embeddings, self.semantic_threshold, self.semantic_top_k)
+            found_skills.update(skill for skill, _ in matches)
+            
+            self.logger.info(f"Semantic extraction found {len(found_skills)} skills in {len(windows)} windows")
         except Exception as e:
             self.logger.error(f"Error in semantic extraction: {e}")
         
         return found_skills
     
-    def _extract_by_custom_ner(self, text: str) -> Set[str]:
-        """Extract skills using custom NER model if available"""
+    def _semantic_windows(self, text: str, sentences: Optional[List[str]] = None) -> List[str]:
+        """Pack sentences (or lines) into windows short enough for the encoder, skipping repeats"""
+        if not sentences:
+            sentences = [part.strip() for part in re.split(r'(?<=[.!?])\s+|\n+', text) if part.strip()]
+        
+        # Sentences longer than a window are cut at word boundaries so nothing is truncated
+        pieces = []
+        for sentence in sentences:
+            while len(sentence) > self.semantic_window_chars:
+                cut = sentence.rfind(' ', 0, self.semantic_window_chars)
+                cut = cut if cut > 0 else self.semantic_window_chars
+                pieces.append(sentence[:cut].strip())
+                sentence = sentence[cut:].strip()
+            if sentence:
+                pieces.append(sentence)
+        
+        windows = []
+        seen = set()
+        current = ''
+        for sentence in pieces + ['']:
+            if current and (not sentence or len(current) + len(sentence) + 1 > self.semantic_window_chars):
+                key = ' '.join(current.lower().split())
+                if key not in seen:
+                    seen.add(key)
+                    windows.append(current)
+                current = ''
+            if sentence:
+                current = f"{current} {sentence}" if current else sentence
+        
+        return windows
+    
+    def _get_taxonomy_embeddings(self, embedder):
+        """Unit-length skill database embeddings, memory-mapped from the on-disk cache"""
+        return get_taxonomy_embeddings(embedder, self.skill_db.unique_skills)
+    
+    def _extract_by_custom_ner(self, text: str, predictions: Optional[List] = None) -> Set[str]:
+        """Extract skills using custom NER model if available (``predictions`` may be precomputed)"""
         found_skills = set()
         
         if self.custom_ner is None:
             return found_skills
         
         try:
-            predictions = self.custom_ner.predict(text)
+            if predictions is None:
+                predictions = self.custom_ner.predict(text)
             for skill, _, _ in predictions:
                 normalized_skill = self.skill_db.normalize_skill_name(skill)
-                if normalized_skill in self.skill_db.get_all_skills():
+                if self.skill_db.is_known_skill(normalized_skill):
                     found_skills.add(normalized_skill)
         except Exception as e:
             self.logger.error(f"Error in custom NER extraction: {e}")
@@ -521,15 +637,12 @@ class AdvancedSkillExtractor:
             return False
         
         # Check against skill database
-        skill_lower = skill.lower()
-        for db_skill in self.skill_db.get_all_skills():
-            if db_skill.lower() == skill_lower:
-                return True
+        if self.skill_db.get_canonical_skill(skill) is not None:
+            return True
         
         # Check for partial matches
-        for db_skill in self.skill_db.get_all_skills():
-            if skill_lower in db_skill.lower() or db_skill.lower() in skill_lower:
-                return True
+        if self.skill_db.skills_in_text(skill) or self.skill_db.skills_containing(skill):
+            return True
         
         return False
     
@@ -622,85 +735,360 @@ class AdvancedSkillExtractor:
         
         return insights
     
-    def extract_skills(self, text: str, document_type: str = 'resume') -> Dict:
-        """Main method to extract skills using multiple approaches"""
+    def _resolve_methods(self, methods: Optional[List[str]] = None) -> List[str]:
+        """Validate requested methods and put them in canonical order"""
+        requested = set(EXTRACTION_METHODS if methods is None else methods)
+        unknown = requested - set(EXTRACTION_METHODS)
+        if unknown:
+            raise ValueError(f"Unknown extraction method(s): {', '.join(sorted(unknown))}")
+        
+        resolved = [m for m in EXTRACTION_METHODS if m in requested]
+        # Custom NER only counts once a model has been trained or loaded
+        if not self.custom_ner:
+            resolved = [m for m in resolved if m != 'custom_ner']
+        return resolved
+    
+    def _profile_for_methods(self, methods: List[str]) -> str:
+        """Cheapest spaCy pipeline profile that serves every requested method"""
+        required = set()
+        for method in methods:
+            required.update(METHOD_PIPELINE_REQUIREMENTS[method])
+        return select_profile(required)
+    
+    def _run_method(self, method: str, text: str, preprocess_result: Dict) -> Set[str]:
+        """Run a single extraction method"""
+        if method == 'keyword_matching':
+            return self._extract_by_enhanced_keywords(text)
+        if method == 'pos_patterns':
+            return self._extract_by_advanced_pos_patterns(preprocess_result['doc'])
+        if method == 'context_based':
+            return self._extract_by_context_patterns(text)
+        if method == 'ner':
+            return self._extract_by_enhanced_ner(preprocess_result['entities'])
+        if method == 'noun_chunks':
+            return self._extract_from_enhanced_chunks(preprocess_result['noun_chunks'])
+        if method == 'semantic_matching':
+            sentences = preprocess_result.get('sentences') if preprocess_result else None
+            return self._extract_by_semantic_similarity(text, sentences)
+        if method == 'custom_ner':
+            predictions = preprocess_result.get('custom_ner_predictions') if preprocess_result else None
+            return self._extract_by_custom_ner(text, predictions)
+        raise ValueError(f"Unknown extraction method: {method}")
+    
+    def _timed_method(self, method: str, text: str, preprocess_result: Optional[Dict]) -> Tuple[Set[str], float]:
+        start = time.perf_counter()
+        skills = self._run_method(method, text, preprocess_result)
+        return skills, time.perf_counter() - start
+    
+    def _resolve_request(self, methods: Optional[List[str]], extraction_profile: Optional[str],
+                         deadline: Optional[float]) -> Tuple[List[str], Optional[float]]:
+        """Methods to run and the time budget in seconds for one extraction call"""
+        if extraction_profile is not None:
+            if extraction_profile not in EXTRACTION_PROFILES:
+                raise ValueError(f"Unknown extraction profile: {extraction_profile}")
+            settings = EXTRACTION_PROFILES[extraction_profile]
+            if methods is None:
+                methods = settings['methods']
+            if deadline is None:
+                deadline = settings['deadline']
+        return self._resolve_methods(methods), deadline
+    
+    def _execute_methods(self, methods: List[str], text: str, preprocess, executor: str,
+                         deadline: Optional[float] = None):
+        """
+        Run the preprocessing callable and the extraction methods under ``executor``
+        
+        Args:
+            deadline: ``time.perf_counter()`` value after which no further method is
+                started or waited for; such methods are left out of the results. The
+                cheapest method always runs so the result is never empty.
+        
+        Returns:
+            (preprocess_result, method_results, method_timings); the last two are None
+            when preprocessing fails
+        """
+        if executor not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode: {executor}")
+        
+        def remaining():
+            return None if deadline is None else deadline - time.perf_counter()
+        
+        method_results = {}
+        method_timings = {}
+        futures = {}
+        ordered = sorted(methods, key=METHOD_COST_ORDER.index)
+        if executor != 'sequential':
+            # Text-only methods start before spaCy runs
+            for method in ordered:
+                if method in DOC_METHODS or method in SENTENCE_METHODS:
+                    continue
+                if method == 'context_based' and executor == 'processes':
+                    futures[method] = self._get_process_pool().submit(_context_patterns_worker, text)
+                else:
+                    futures[method] = self._get_thread_pool().submit(self._timed_method, method, text, None)
+        
+        preprocess_result = preprocess()
+        if not preprocess_result['success']:
+            for future in futures.values():
+                future.cancel()
+            return preprocess_result, None, None
+        
+        if executor != 'sequential':
+            for method in ordered:
+                if method in SENTENCE_METHODS:
+                    futures[method] = self._get_thread_pool().submit(self._timed_method, method, text,
+                                                                     preprocess_result)
+        
+        for method in ordered:
+            if method in futures:
+                continue
+            if deadline is not None and method != ordered[0] and remaining() <= 0:
+                break
+            method_results[method], method_timings[method] = self._timed_method(method, text, preprocess_result)
+        for method, future in futures.items():
+            budget = None if method == ordered[0] else remaining()
+            try:
+                method_results[method], method_timings[method] = future.result(
+                    timeout=None if budget is None else max(budget, 0)
+                )
+            except FuturesTimeoutError:
+                # Out of budget: the result is dropped (a running method is not interrupted)
+                future.cancel()
+        
+        # Keep the canonical method order
+        method_results = {method: method_results[method] for method in methods if method in method_results}
+        method_timings = {method: method_timings[method] for method in method_results}
+        return preprocess_result, method_results, method_timings
+    
+    def _cache_key(self, text: str, methods: List[str], extraction_profile: Optional[str]) -> str:
+        """Extraction cache key: text, skill database version, methods and model settings"""
+        config = {
+            'spacy_model': 'en_core_web_sm',
+            'extraction_profile': extraction_profile,
+        }
+        if 'semantic_matching' in methods:
+            # Includes the variant, so fp32 and int8 ("...@int8") results never mix; the
+            # name comes from the registry so a cache hit does not load the model
+            config['embedding_model'] = (self.embedder.model_name if self.embedder is not None
+                                         else shared_model_name('all-MiniLM-L6-v2'))
+            config['semantic'] = [self.semantic_threshold, self.semantic_top_k, self.semantic_window_chars]
+        if 'custom_ner' in methods:
+            config['custom_ner'] = getattr(self.custom_ner, 'fingerprint', None)
+        return ExtractionCache.make_key(text, self.skill_db.version, methods, config)
+    
+    def _cached_result(self, key: str) -> Optional[Dict]:
+        if not self.use_cache:
+            return None
+        result = self.extraction_cache.get(key)
+        if result is not None:
+            result['statistics']['cache_hit'] = True
+        return result
+    
+    def _store_result(self, key: str, result: Dict) -> None:
+        # Results cut short by a deadline are not reused
+        if self.use_cache and result['success'] and not result['skipped_methods']:
+            self.extraction_cache.put(key, result)
+    
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                   thread_name_prefix='skill-extraction')
+        return self._thread_pool
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Worker process holding a copy of ``skill_db``, restarted after the database is re-indexed"""
+        signature = (self.skill_db.version, tuple(self.skill_db.context_engine.patterns))
+        if self._process_pool is not None and self._process_pool_signature != signature:
+            self._process_pool.shutdown(wait=False)
+            self._process_pool = None
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=1, initializer=_init_context_patterns_worker,
+                                                     initargs=(self.skill_db.get_tables(),))
+            self._process_pool_signature = signature
+        return self._process_pool
+    
+    def close(self):
+        """Shut down the method executors (they are recreated on demand)"""
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = None
+        self._process_pool = None
+        self._process_pool_signature = None
+    
+    def _build_extraction_result(self, method_results: Dict[str, Set[str]], start_time: datetime,
+                                 profile: str, method_timings: Optional[Dict[str, float]] = None,
+                                 requested_methods: Optional[List[str]] = None,
+                                 extraction_profile: Optional[str] = None) -> Dict:
+        """Combine per-method skill sets into the extraction result"""
+        all_methods = list(method_results.values())
+        
+        # Combine and normalize skills
+        all_skills = self._combine_and_deduplicate(all_methods)
+        normalized_skills = self._enhanced_normalize_skills(all_skills)
+        categorized_skills = self._categorize_skills(normalized_skills)
+        skill_confidence = self._calculate_advanced_confidence(normalized_skills, all_methods)
+        
+        # Calculate processing time
+        processing_time = (datetime.now() - start_time).total_seconds()
+        
+        # Generate extraction method statistics
+        extraction_methods = {method: len(skills) for method, skills in method_results.items()}
+        
+        # Generate insights
+        insights = self._generate_skill_insights(normalized_skills, skill_confidence)
+        
+        return {
+            'success': True,
+            'all_skills': normalized_skills,
+            'categorized_skills': categorized_skills,
+            'skill_confidence': skill_confidence,
+            'skill_insights': insights,
+            'extraction_methods': extraction_methods,
+            'method_timings': method_timings or {},
+            'completed_methods': list(method_results),
+            'skipped_methods': [m for m in (requested_methods or []) if m not in method_results],
+            'statistics': {
+                'total_skills': len(normalized_skills),
+                'technical_skills': sum(len(skills) for cat, skills in categorized_skills.items() 
+                                       if cat not in ['soft_skills', 'other']),
+                'soft_skills': len(categorized_skills.get('soft_skills', [])),
+                'emerging_tech_skills': len(categorized_skills.get('emerging_tech', [])),
+                'high_confidence_skills': sum(1 for conf in skill_confidence.values() if conf >= 0.8),
+                'processing_time': processing_time,
+                'custom_ner_used': 'custom_ner' in method_results,
+                'pipeline_profile': profile,
+                'extraction_profile': extraction_profile,
+                'cache_hit': False
+            }
+        }
+    
+    def extract_skills(self, text: str, document_type: str = 'resume',
+                       methods: Optional[List[str]] = None, executor: Optional[str] = None,
+                       extraction_profile: Optional[str] = None, deadline: Optional[float] = None) -> Dict:
+        """
+        Main method to extract skills using multiple approaches
+        
+        Args:
+            text: Document text
+            document_type: 'resume' or 'job_description'
+            methods: Subset of EXTRACTION_METHODS to run (default: all). The spaCy
+                pipeline profile is picked from what these methods need, so e.g.
+                keyword-only extraction never runs the tagger or parser.
+            executor: One of EXECUTOR_MODES (default: ``self.executor_mode``)
+            extraction_profile: Name in EXTRACTION_PROFILES; supplies the methods and
+                deadline when those are not given explicitly
+            deadline: Time budget in seconds. Methods run cheapest first and those that
+                cannot start or finish in time are listed in ``skipped_methods``
+        """
         try:
             start_time = datetime.now()
-            
-            # Preprocess text
-            preprocess_result = self.preprocessor.preprocess(text)
+            started = time.perf_counter()
+            methods, deadline = self._resolve_request(methods, extraction_profile, deadline)
+            executor = executor or self.executor_mode
+            cache_key = self._cache_key(text, methods, extraction_profile)
+            cached = self._cached_result(cache_key)
+            if cached is not None:
+                return cached
+            profile = self._profile_for_methods(methods)
+            
+            # Preprocess text and extract skills using the requested methods
+            preprocess_result, method_results, method_timings = self._execute_methods(
+                methods, text, lambda: self.preprocessor.preprocess(text, profile=profile), executor,
+                deadline=None if deadline is None else started + deadline
+            )
             if not preprocess_result['success']:
                 return {'success': False, 'error': preprocess_result['error']}
             
-            doc = preprocess_result['doc']
-            
-            # Extract skills using different methods
-            keyword_skills = self._extract_by_enhanced_keywords(text)
-            pos_skills = self._extract_by_advanced_pos_patterns(doc)
-            context_skills = self._extract_by_context_patterns(text)
-            ner_skills = self._extract_by_enhanced_ner(preprocess_result['entities'])
-            chunk_skills = self._extract_from_enhanced_chunks(preprocess_result['noun_chunks'])
-            semantic_skills = self._extract_by_semantic_similarity(text)
-            custom_ner_skills = self._extract_by_custom_ner(text)
-            
-            # Combine all methods
-            all_methods = [
-                keyword_skills, 
-                pos_skills, 
-                context_skills, 
-                ner_skills, 
-                chunk_skills, 
-                semantic_skills
-            ]
-            
-            if self.custom_ner:
-                all_methods.append(custom_ner_skills)
-            
-            # Combine and normalize skills
-            all_skills = self._combine_and_deduplicate(all_methods)
-            normalized_skills = self._enhanced_normalize_skills(all_skills)
-            categorized_skills = self._categorize_skills(normalized_skills)
-            skill_confidence = self._calculate_advanced_confidence(normalized_skills, all_methods)
-            
-            # Calculate processing time
-            processing_time = (datetime.now() - start_time).total_seconds()
-            
-            # Generate extraction method statistics
-            extraction_methods = {
-                'keyword_matching': len(keyword_skills),
-                'pos_patterns': len(pos_skills),
-                'context_based': len(context_skills),
-                'ner': len(ner_skills),
-                'noun_chunks': len(chunk_skills),
-                'semantic_matching': len(semantic_skills)
-            }
-            
-            if self.custom_ner:
-                extraction_methods['custom_ner'] = len(custom_ner_skills)
+            result = self._build_extraction_result(method_results, start_time, profile, method_timings,
+                                                   requested_methods=methods,
+                                                   extraction_profile=extraction_profile)
+            self._store_result(cache_key, result)
+            return result
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    def extract_skills_batch(self, texts: List[str], n_process: int = 1, batch_size: int = 32,
+                             document_type: str = 'resume',
+                             methods: Optional[List[str]] = None,
+                             executor: Optional[str] = None,
+                             extraction_profile: Optional[str] = None,
+                             deadline: Optional[float] = None) -> List[Dict]:
+        """
+        Extract skills from many documents at once
+        
+        Documents are streamed through ``nlp.pipe`` (with ``n_process`` worker
+        processes) and the extraction methods then run over the resulting Docs.
+        Documents already in the extraction cache are not parsed again.
+        
+        Args:
+            texts: Document texts
+            n_process: spaCy worker processes; -1 uses every core
+            batch_size: Documents per ``nlp.pipe`` batch
+            document_type: 'resume' or 'job_description'
+            methods: Subset of EXTRACTION_METHODS to run (default: all)
+            executor: One of EXECUTOR_MODES, applied per document
+            extraction_profile: Name in EXTRACTION_PROFILES
+            deadline: Per-document time budget in seconds for the extraction methods
+        
+        Returns:
+            One extraction result per text, in input order. A failed document gets
+            ``{'success': False, 'error': ...}`` without affecting the others.
+        """
+        try:
+            methods, deadline = self._resolve_request(methods, extraction_profile, deadline)
+            profile = self._profile_for_methods(methods)
+            executor = executor or self.executor_mode
             
-            # Generate insights
-            insights = self._generate_skill_insights(normalized_skills, skill_confidence)
+            cache_keys = [self._cache_key(text, methods, extraction_profile) for text in texts]
+            results = [self._cached_result(key) for key in cache_keys]
+            pending = [i for i, result in enumerate(results) if result is None]
             
-            return {
-                'success': True,
-                'all_skills': normalized_skills,
-                'categorized_skills': categorized_skills,
-                'skill_confidence': skill_confidence,
-                'skill_insights': insights,
-                'extraction_methods': extraction_methods,
-                'statistics': {
-                    'total_skills': len(normalized_skills),
-                    'technical_skills': sum(len(skills) for cat, skills in categorized_skills.items() 
-                                           if cat not in ['soft_skills', 'other']),
-                    'soft_skills': len(categorized_skills.get('soft_skills', [])),
-                    'emerging_tech_skills': len(categorized_skills.get('emerging_tech', [])),
-                    'high_confidence_skills': sum(1 for conf in skill_confidence.values() if conf >= 0.8),
-                    'processing_time': processing_time,
-                    'custom_ner_used': bool(self.custom_ner)
-                }
-            }
+            preprocessed = self.preprocessor.preprocess_batch(
+                [texts[i] for i in pending], profile=profile, n_process=n_process, batch_size=batch_size
+            )
+            if 'custom_ner' in methods and self.custom_ner is not None:
+                self._attach_custom_ner_predictions(pending, texts, preprocessed, n_process, batch_size)
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            return [{'success': False, 'error': str(e)} for _ in texts]
+        
+        for i, preprocess_result in zip(pending, preprocessed):
+            if not preprocess_result['success']:
+                results[i] = {'success': False, 'error': preprocess_result['error']}
+                continue
+            try:
+                start_time = datetime.now()
+                _, method_results, method_timings = self._execute_methods(
+                    methods, texts[i], lambda: preprocess_result, executor,
+                    deadline=None if deadline is None else time.perf_counter() + deadline
+                )
+                results[i] = self._build_extraction_result(method_results, start_time, profile, method_timings,
+                                                           requested_methods=methods,
+                                                           extraction_profile=extraction_profile)
+                self._store_result(cache_keys[i], results[i])
+            except Exception as e:
+                results[i] = {'success': False, 'error': str(e)}
+        
+        self.logger.info(f"Batch extraction: {sum(r['success'] for r in results)}/{len(texts)} documents succeeded")
+        return results
+    
+    def _attach_custom_ner_predictions(self, pending: List[int], texts: List[str], preprocessed: List[Dict],
+                                       n_process: int, batch_size: int) -> None:
+        """Tag every pending document with the custom NER model in one stream"""
+        try:
+            predictions = self.custom_ner.predict_many(
+                [texts[i] for i in pending], batch_size=batch_size, n_process=n_process
+            )
+        except Exception as e:
+            # Falls back to per-document prediction inside the method
+            self.logger.error(f"Error in batched custom NER prediction: {e}")
+            return
+        for preprocess_result, doc_predictions in zip(preprocessed, predictions):
+            if preprocess_result['success']:
+                preprocess_result['custom_ner_predictions'] = doc_predictions
+
+# Sentence boundaries used to cut long documents into NER chunks
+_CHUNK_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n\s*')
 
 # Custom NER trainer for skill extraction
 class CustomSkillNERTrainer:
@@ -708,6 +1096,8 @@ class CustomSkillNERTrainer:
         self.nlp = None
         self.ner = None
         self.logger = self._setup_logger()
+        # Changes whenever the model changes; part of the extraction cache key
+        self.fingerprint = uuid.uuid4().hex
     
     def _setup_logger(self):
         logger = logging.getLogger('CustomSkillNERTrainer')
@@ -730,40 +1120,155 @@ class CustomSkillNERTrainer:
         # Add the SKILL label
         self.ner.add_label("SKILL")
     
-    def train(self, training_data: List[Tuple], n_iterations: int = 30) -> Dict:
-        """Train a custom NER model for skill extraction"""
+    def train(self, training_data: List, n_iterations: int = 30, dropout: float = 0.5,
+              batch_start: float = 4.0, batch_stop: float = 32.0, batch_compound: float = 1.001,
+              progress_callback=None) -> Dict:
+        """
+        Train a custom NER model for skill extraction
+        
+        Args:
+            training_data: (text, {"entities": [(start, end, label), ...]}) tuples or
+                ready-made spaCy ``Example`` objects (e.g. from DocBin shards)
+            n_iterations: Number of epochs
+            dropout: Dropout rate passed to ``nlp.update``
+            batch_start, batch_stop, batch_compound: Compounding minibatch schedule; the
+                batch size grows from ``batch_start`` to ``batch_stop`` by ``batch_compound``
+                per batch
+            progress_callback: Called with (epoch, n_iterations, loss) after every epoch
+        """
         if not self.nlp:
             self.create_blank_model()
         
+        # Examples are built once and reused by every epoch
+        examples = self._make_examples(training_data)
+        if not examples:
+            raise ValueError("No training examples")
+        
         # Disable other pipes during training
         other_pipes = [pipe for pipe in self.nlp.pipe_names if pipe != "ner"]
         
-        training_stats = {'losses': [], 'iterations': n_iterations}
+        training_stats = {
+            'losses': [], 'iterations': n_iterations, 'n_examples': len(examples),
+            'dropout': dropout, 'epoch_times': [], 'examples_per_sec': [], 'batches_per_epoch': []
+        }
         
-        with self.nlp.disable_pipes(*other_pipes):
-            optimizer = self.nlp.begin_training()
+        with self.nlp.select_pipes(disable=other_pipes):
+            optimizer = self.nlp.initialize(lambda: examples)
+            sizes = compounding(batch_start, batch_stop, batch_compound)
             
             for iteration in range(n_iterations):
-                random.shuffle(training_data)
+                epoch_start = time.perf_counter()
+                random.shuffle(examples)
                 losses = {}
+                n_batches = 0
                 
-                for text, annotations in training_data:
-                    doc = self.nlp.make_doc(text)
-                    example = Example.from_dict(doc, annotations)
-                    self.nlp.update([example], drop=0.5, losses=losses)
+                for batch in minibatch(examples, size=sizes):
+                    self.nlp.update(batch, drop=dropout, sgd=optimizer, losses=losses)
+                    n_batches += 1
                 
-                training_stats['losses'].append(losses.get('ner', 0))
-                self.logger.info(f"Iteration {iteration+1}/{n_iterations}, Loss: {losses.get('ner', 0)}")
-        
+                elapsed = time.perf_counter() - epoch_start
+                loss = float(losses.get('ner', 0))
+                training_stats['losses'].append(loss)
+                training_stats['epoch_times'].append(elapsed)
+                training_stats['examples_per_sec'].append(len(examples) / elapsed if elapsed > 0 else 0.0)
+                training_stats['batches_per_epoch'].append(n_batches)
+                self.logger.info(f"Iteration {iteration+1}/{n_iterations}, Loss: {loss:.3f}, "
+                                 f"{training_stats['examples_per_sec'][-1]:.0f} examples/sec")
+                if progress_callback:
+                    progress_callback(iteration + 1, n_iterations, loss)
+        
+        training_stats['total_time'] = sum(training_stats['epoch_times'])
+        self.fingerprint = uuid.uuid4().hex
         return training_stats
     
+    def _make_examples(self, training_data: List) -> List[Example]:
+        """Convert (text, annotations) tuples to Examples; Example objects pass through"""
+        examples = []
+        for item in training_data:
+            if isinstance(item, Example):
+                examples.append(item)
+            else:
+                text, annotations = item
+                examples.append(Example.from_dict(self.nlp.make_doc(text), annotations))
+        return examples
+    
+    def load_shard_examples(self, shard_dir: str, limit: Optional[int] = None) -> List[Example]:
+        """
+        Load silver-standard examples written by ``src.weak_supervision``
+        
+        Args:
+            shard_dir: Directory holding ``manifest.json`` and the DocBin shards it lists
+            limit: Stop after this many sentences
+        """
+        if not self.nlp:
+            self.create_blank_model()
+        examples = load_examples(shard_dir, self.nlp, limit=limit)
+        self.logger.info(f"Loaded {len(examples)} examples from shards in {shard_dir}")
+        return examples
+    
+    def train_from_shards(self, shard_dir: str, limit: Optional[int] = None, **train_kwargs) -> Dict:
+        """Train directly on DocBin shards; ``train_kwargs`` are passed to ``train``"""
+        return self.train(self.load_shard_examples(shard_dir, limit=limit), **train_kwargs)
+    
     def predict(self, text: str) -> List[Tuple[str, int, int]]:
         """Predict skills in text using the trained model"""
+        return self.predict_many([text])[0]
+    
+    def predict_many(self, texts: List[str], batch_size: int = 64, n_process: int = 1,
+                     max_chunk_chars: int = 1000) -> List[List[Tuple[str, int, int]]]:
+        """
+        Predict skills in many texts with one ``nlp.pipe`` stream
+        
+        Long texts are cut into sentence-aligned chunks of at most ``max_chunk_chars``
+        so batches stay evenly sized; entity offsets refer to the original text.
+        
+        Args:
+            texts: Documents to tag
+            batch_size: Chunks per ``nlp.pipe`` batch
+            n_process: spaCy worker processes
+            max_chunk_chars: Target chunk length in characters
+        
+        Returns:
+            (entity text, start_char, end_char) lists, one per input text
+        """
         if not self.nlp:
             raise ValueError("Model not trained")
         
-        doc = self.nlp(text)
-        return [(ent.text, ent.start_char, ent.end_char) for ent in doc.ents if ent.label_ == "SKILL"]
+        chunks = (
+            (chunk, (doc_index, offset))
+            for doc_index, text in enumerate(texts)
+            for offset, chunk in self._chunk_text(text, max_chunk_chars)
+        )
+        predictions = [[] for _ in texts]
+        for doc, (doc_index, offset) in self.nlp.pipe(chunks, as_tuples=True, batch_size=batch_size,
+                                                      n_process=n_process):
+            predictions[doc_index].extend(
+                (ent.text, offset + ent.start_char, offset + ent.end_char)
+                for ent in doc.ents if ent.label_ == "SKILL"
+            )
+        return predictions
+    
+    @staticmethod
+    def _chunk_text(text: str, max_chars: int) -> List[Tuple[int, str]]:
+        """(offset, chunk) pairs of whole sentences packed up to ``max_chars``"""
+        if len(text) <= max_chars:
+            return [(0, text)] if text.strip() else []
+        
+        # A chunk is closed at the last sentence boundary before it would overflow;
+        # a single sentence longer than ``max_chars`` becomes a chunk of its own
+        chunks = []
+        start = 0
+        cut = None
+        for boundary in _CHUNK_BOUNDARY.finditer(text):
+            if cut is not None and boundary.start() - start > max_chars:
+                chunks.append((start, text[start:cut[0]]))
+                start = cut[1]
+            cut = (boundary.start(), boundary.end())
+        if cut is not None and len(text) - start > max_chars:
+            chunks.append((start, text[start:cut[0]]))
+            start = cut[1]
+        chunks.append((start, text[start:]))
+        return [(offset, chunk) for offset, chunk in chunks if chunk.strip()]
     
     def save_model(self, path: str):
         """Save the trained model"""
@@ -932,63 +1437,54 @@ class SentenceBERTEmbedder:
     def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
         """Initialize Sentence-BERT model"""
         try:
-            self.model = SentenceTransformer(model_name)
-            self.skill_embeddings = {}
+            self.model = get_shared_encoder(model_name, owner='SentenceBERTEmbedder')
         except Exception as e:
             st.error(f"❌ Failed to load BERT model: {e}")
             st.info("Installing sentence-transformers...")
             import subprocess
             subprocess.run(["pip", "install", "sentence-transformers"])
-            self.model = SentenceTransformer(model_name)
-    
-    def encode_skills(self, skills: List[str]) -> Dict[str, np.ndarray]:
-        """Generate embeddings for skills"""
-        if not skills:
-            return {}
-        
-        embeddings = self.model.encode(skills, show_progress_bar=True)
-        
-        skill_embeddings = {}
-        for skill, embedding in zip(skills, embeddings):
-            skill_embeddings[skill] = embedding
-            self.skill_embeddings[skill] = embedding
-        
-        return skill_embeddings
+            self.model = get_shared_encoder(model_name, owner='SentenceBERTEmbedder')
+        # Kept in the configured compact storage mode (SKILLGAP_EMBEDDING_STORAGE)
+        self.codec = get_storage_codec(encoder=self.model)
+        self.skill_embeddings = CompactVectorStore(self.codec)
+    
+    def encode_skills(self, skills: List[str]) -> CompactVectorStore:
+        """
+        Generate embeddings for skills, stored compactly
+        
+        Only skills not stored yet are encoded. Returns ``self.skill_embeddings``,
+        which then holds every skill in ``skills``.
+        """
+        if skills:
+            self._ensure_encoded(skills, show_progress_bar=True)
+        return self.skill_embeddings
+    
+    def _ensure_encoded(self, skills: List[str], **encode_kwargs) -> None:
+        """Encode the skills that are not in ``skill_embeddings`` yet"""
+        missing = list(dict.fromkeys(skill for skill in skills if skill not in self.skill_embeddings))
+        if missing:
+            self.skill_embeddings.add(missing, self.model.encode(missing, **encode_kwargs))
     
     def compute_similarity(self, skill1: str, skill2: str) -> float:
         """Compute cosine similarity between two skills"""
-        if skill1 not in self.skill_embeddings:
-            emb1 = self.model.encode([skill1])[0]
-            self.skill_embeddings[skill1] = emb1
-        else:
-            emb1 = self.skill_embeddings[skill1]
-        
-        if skill2 not in self.skill_embeddings:
-            emb2 = self.model.encode([skill2])[0]
-            self.skill_embeddings[skill2] = emb2
-        else:
-            emb2 = self.skill_embeddings[skill2]
-        
-        similarity = cosine_similarity([emb1], [emb2])[0][0]
-        return float(similarity)
+        self._ensure_encoded([skill1, skill2])
+        return self.skill_embeddings.similarity(skill1, skill2)
     
     def compute_similarity_matrix(self, skills1: List[str], skills2: List[str]) -> np.ndarray:
         """Compute similarity matrix between two skill sets"""
-        embeddings1 = self.model.encode(skills1)
-        embeddings2 = self.model.encode(skills2)
-        return cosine_similarity(embeddings1, embeddings2)
+        self._ensure_encoded(skills1 + skills2)
+        return self.skill_embeddings.similarity_matrix(skills1, skills2)
     
     def find_similar_skills(self, target_skill: str, skill_list: List[str], 
                            threshold: float = 0.7, top_k: int = 5) -> List[Tuple[str, float]]:
         """Find skills similar to target skill"""
-        similarities = []
-        
-        for skill in skill_list:
-            if skill.lower() != target_skill.lower():
-                sim = self.compute_similarity(target_skill, skill)
-                if sim >= threshold:
-                    similarities.append((skill, sim))
+        candidates = [skill for skill in skill_list if skill.lower() != target_skill.lower()]
+        if not candidates:
+            return []
+        self._ensure_encoded([target_skill] + candidates)
+        scores = self.skill_embeddings.similarity_matrix([target_skill], candidates)[0]
         
+        similarities = [(skill, float(sim)) for skill, sim in zip(candidates, scores) if sim >= threshold]
         similarities.sort(key=lambda x: x[1], reverse=True)
         return similarities[:top_k]
 
@@ -1097,9 +1593,14 @@ class SkillVisualizer:
 
 # Enhanced skill gap analyzer
 class EnhancedSkillGapAnalyzer:
-    def __init__(self):
+    def __init__(self, encoder: Optional[SkillEncoder] = None):
+        """
+        Args:
+            encoder: Any SkillEncoder (see src.encoders) for semantic matching;
+                defaults to the shared Sentence-BERT backend, built on first use
+        """
         self.skill_extractor = AdvancedSkillExtractor()
-        self.embedder = None  # Lazy loading
+        self.encoder = encoder  # Lazy loading
         self.logger = self._setup_logger()
     
     def _setup_logger(self):
@@ -1112,16 +1613,16 @@ class EnhancedSkillGapAnalyzer:
             logger.addHandler(handler)
         return logger
     
-    def _get_embedder(self):
-        """Lazy loading of the sentence transformer model"""
-        if self.embedder is None:
+    def _get_embedder(self) -> Optional[SkillEncoder]:
+        """The injected encoder, or the transformer backend loaded on first use"""
+        if self.encoder is None:
             try:
-                self.embedder = SentenceTransformer('all-MiniLM-L6-v2')
-                self.logger.info("Sentence-BERT model loaded successfully")
+                self.encoder = get_encoder('transformer')
+                self.logger.info(f"Skill encoder loaded: {self.encoder.model_name}")
             except Exception as e:
                 self.logger.error(f"Failed to load Sentence-BERT model: {e}")
-                self.embedder = None
-        return self.embedder
+                self.encoder = None
+        return self.encoder
     
     def analyze_skill_gap(self, resume_text: str, jd_text: str) -> Dict:
         """Analyze the skill gap between resume and job description"""
@@ -1139,129 +1640,223 @@ class EnhancedSkillGapAnalyzer:
             resume_skills = resume_result['all_skills']
             jd_skills = jd_result['all_skills']
             
-            # Calculate skill gap
-            matched_skills = []
-            partial_matches = []
-            missing_skills = []
-            
             # Get embedder for semantic matching
             embedder = self._get_embedder()
             
-            if embedder:
-                # Use semantic matching
-                resume_embeddings = embedder.encode(resume_skills)
-                jd_embeddings = embedder.encode(jd_skills)
+            similarity_matrix = None
+            if embedder and resume_skills and jd_skills:
+                resume_embeddings = embedder.encode_skills(resume_skills)
+                jd_embeddings = embedder.encode_skills(jd_skills)
                 similarity_matrix = cosine_similarity(resume_embeddings, jd_embeddings)
+            
+            return self._build_gap_analysis(resume_result, jd_result, similarity_matrix)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    def analyze_against_many(self, resume_text: str, jd_texts: List[str], top_n: Optional[int] = None) -> Dict:
+        """
+        Analyze one resume against many job descriptions
+        
+        The resume is extracted once and the job descriptions in one batch. The union
+        of unique skills is encoded once, and every resume-vs-JD similarity block comes
+        out of a single matrix product against the stacked JD skill embeddings.
+        
+        Args:
+            resume_text: Resume text
+            jd_texts: Job description texts
+            top_n: Return only the best ``top_n`` job descriptions (all if None)
+        
+        Returns:
+            ``rankings``: one entry per successfully analyzed JD, best overall score
+            first, with its index in ``jd_texts`` and the full per-JD analysis;
+            ``failed``: index and error of every JD that could not be analyzed
+        """
+        try:
+            resume_result = self.skill_extractor.extract_skills(resume_text, 'resume')
+            if not resume_result['success']:
+                return {'success': False, 'error': f"Resume skill extraction failed: {resume_result['error']}"}
+            
+            jd_results = self.skill_extractor.extract_skills_batch(jd_texts, document_type='job_description')
+            resume_skills = resume_result['all_skills']
+            valid = [i for i, result in enumerate(jd_results) if result['success']]
+            
+            # One similarity block per JD, all computed with one matrix product; like
+            # analyze_skill_gap, a JD or resume without skills falls back to exact matching
+            blocks = {i: None for i in valid}
+            embedder = self._get_embedder()
+            if embedder and valid and resume_skills:
+                vocabulary = list(dict.fromkeys(
+                    resume_skills + [skill for i in valid for skill in jd_results[i]['all_skills']]
+                ))
+                position = {skill: idx for idx, skill in enumerate(vocabulary)}
+                embeddings = embedder.encode_skills(vocabulary)
                 
-                for i, jd_skill in enumerate(jd_skills):
-                    # Find the best matching resume skill
-                    best_match_idx = np.argmax(similarity_matrix[:, i])
-                    best_match_score = similarity_matrix[best_match_idx, i]
-                    
-                    if best_match_score >= 0.8:
-                        matched_skills.append({
-                            'jd_skill': jd_skill,
-                            'resume_skill': resume_skills[best_match_idx],
-                            'similarity': float(best_match_score)
-                        })
-                    elif best_match_score >= 0.5:
-                        partial_matches.append({
-                            'jd_skill': jd_skill,
-                            'resume_skill': resume_skills[best_match_idx],
-                            'similarity': float(best_match_score)
-                        })
-                    else:
-                        missing_skills.append({
-                            'jd_skill': jd_skill,
-                            'resume_skill': resume_skills[best_match_idx] if best_match_score > 0.3 else None,
-                            'similarity': float(best_match_score)
-                        })
-            else:
-                # Fallback to exact matching
-                resume_skills_set = set(resume_skills)
-                
-                for jd_skill in jd_skills:
-                    if jd_skill in resume_skills_set:
-                        matched_skills.append({
-                            'jd_skill': jd_skill,
-                            'resume_skill': jd_skill,
-                            'similarity': 1.0
-                        })
-                    else:
-                        # Check for partial matches
-                        partial_match = None
-                        for resume_skill in resume_skills:
-                            if jd_skill.lower() in resume_skill.lower() or resume_skill.lower() in jd_skill.lower():
-                                partial_match = resume_skill
-                                break
-                        
-                        if partial_match:
-                            partial_matches.append({
-                                'jd_skill': jd_skill,
-                                'resume_skill': partial_match,
-                                'similarity': 0.6
-                            })
-                        else:
-                            missing_skills.append({
-                                'jd_skill': jd_skill,
-                                'resume_skill': None,
-                                'similarity': 0.0
-                            })
-            
-            # Calculate overall score
-            total_skills = len(jd_skills)
-            matched_count = len(matched_skills)
-            partial_count = len(partial_matches)
-            
-            overall_score = (matched_count * 1.0 + partial_count * 0.5) / total_skills * 100 if total_skills > 0 else 0
-            
-            # Categorize missing skills by priority
-            high_priority_missing = []
-            medium_priority_missing = []
-            low_priority_missing = []
-            
-            for skill in missing_skills:
-                jd_skill = skill['jd_skill']
-                category = self.skill_extractor.skill_db.get_category_for_skill(jd_skill)
+                jd_rows = [position[skill] for i in valid for skill in jd_results[i]['all_skills']]
+                resume_rows = [position[skill] for skill in resume_skills]
+                stacked = embeddings[resume_rows] @ embeddings[jd_rows].T
                 
-                # Determine priority based on category and similarity
-                if category in ['programming_languages', 'ml_ai', 'cloud_platforms']:
-                    high_priority_missing.append(skill)
-                elif category in ['web_frameworks', 'databases', 'devops_tools']:
-                    medium_priority_missing.append(skill)
-                else:
-                    low_priority_missing.append(skill)
+                offset = 0
+                for i in valid:
+                    width = len(jd_results[i]['all_skills'])
+                    if width:
+                        blocks[i] = stacked[:, offset:offset + width]
+                    offset += width
+            
+            rankings = []
+            failed = []
+            for i, jd_result in enumerate(jd_results):
+                if not jd_result['success']:
+                    failed.append({'jd_index': i, 'error': f"JD skill extraction failed: {jd_result['error']}"})
+                    continue
+                try:
+                    analysis = self._build_gap_analysis(resume_result, jd_result, blocks[i])
+                except Exception as e:
+                    failed.append({'jd_index': i, 'error': str(e)})
+                    continue
+                rankings.append({'jd_index': i, 'overall_score': analysis['overall_score'], 'analysis': analysis})
             
-            # Generate recommendations
-            recommendations = self._generate_recommendations(
-                matched_skills, partial_matches, missing_skills,
-                resume_result['categorized_skills'], jd_result['categorized_skills']
-            )
+            rankings.sort(key=lambda entry: entry['overall_score'], reverse=True)
+            if top_n is not None:
+                rankings = rankings[:top_n]
             
+            self.logger.info(f"Analyzed resume against {len(jd_texts)} job descriptions ({len(failed)} failed)")
             return {
                 'success': True,
                 'resume_skills': resume_result,
-                'jd_skills': jd_result,
-                'matched_skills': matched_skills,
-                'partial_matches': partial_matches,
-                'missing_skills': missing_skills,
-                'high_priority_missing': high_priority_missing,
-                'medium_priority_missing': medium_priority_missing,
-                'low_priority_missing': low_priority_missing,
-                'overall_score': overall_score,
-                'statistics': {
-                    'total_resume_skills': len(resume_skills),
-                    'total_jd_skills': len(jd_skills),
-                    'matched_count': matched_count,
-                    'partial_count': partial_count,
-                    'missing_count': len(missing_skills),
-                    'match_percentage': (matched_count / total_skills * 100) if total_skills > 0 else 0
-                },
-                'recommendations': recommendations
+                'rankings': rankings,
+                'failed': failed
             }
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    def _build_gap_analysis(self, resume_result: Dict, jd_result: Dict,
+                            similarity_matrix: Optional[np.ndarray]) -> Dict:
+        """
+        Classify every JD skill as matched, partial or missing and build the report
+        
+        Args:
+            resume_result: Extraction result for the resume
+            jd_result: Extraction result for the job description
+            similarity_matrix: Cosine similarities, resume skills x JD skills; None
+                falls back to exact and substring matching
+        """
+        resume_skills = resume_result['all_skills']
+        jd_skills = jd_result['all_skills']
+        
+        # Calculate skill gap
+        matched_skills = []
+        partial_matches = []
+        missing_skills = []
+        
+        if similarity_matrix is not None:
+            # Use semantic matching
+            for i, jd_skill in enumerate(jd_skills):
+                # Find the best matching resume skill
+                best_match_idx = np.argmax(similarity_matrix[:, i])
+                best_match_score = similarity_matrix[best_match_idx, i]
+                
+                if best_match_score >= 0.8:
+                    matched_skills.append({
+                        'jd_skill': jd_skill,
+                        'resume_skill': resume_skills[best_match_idx],
+                        'similarity': float(best_match_score)
+                    })
+                elif best_match_score >= 0.5:
+                    partial_matches.append({
+                        'jd_skill': jd_skill,
+                        'resume_skill': resume_skills[best_match_idx],
+                        'similarity': float(best_match_score)
+                    })
+                else:
+                    missing_skills.append({
+                        'jd_skill': jd_skill,
+                        'resume_skill': resume_skills[best_match_idx] if best_match_score > 0.3 else None,
+                        'similarity': float(best_match_score)
+                    })
+        else:
+            # Fallback to exact matching
+            resume_skills_set = set(resume_skills)
+            
+            for jd_skill in jd_skills:
+                if jd_skill in resume_skills_set:
+                    matched_skills.append({
+                        'jd_skill': jd_skill,
+                        'resume_skill': jd_skill,
+                        'similarity': 1.0
+                    })
+                else:
+                    # Check for partial matches
+                    partial_match = None
+                    for resume_skill in resume_skills:
+                        if jd_skill.lower() in resume_skill.lower() or resume_skill.lower() in jd_skill.lower():
+                            partial_match = resume_skill
+                            break
+                    
+                    if partial_match:
+                        partial_matches.append({
+                            'jd_skill': jd_skill,
+                            'resume_skill': partial_match,
+                            'similarity': 0.6
+                        })
+                    else:
+                        missing_skills.append({
+                            'jd_skill': jd_skill,
+                            'resume_skill': None,
+                            'similarity': 0.0
+                        })
+        
+        # Calculate overall score
+        total_skills = len(jd_skills)
+        matched_count = len(matched_skills)
+        partial_count = len(partial_matches)
+        
+        overall_score = (matched_count * 1.0 + partial_count * 0.5) / total_skills * 100 if total_skills > 0 else 0
+        
+        # Categorize missing skills by priority
+        high_priority_missing = []
+        medium_priority_missing = []
+        low_priority_missing = []
+        
+        for skill in missing_skills:
+            jd_skill = skill['jd_skill']
+            category = self.skill_extractor.skill_db.get_category_for_skill(jd_skill)
+            
+            # Determine priority based on category and similarity
+            if category in ['programming_languages', 'ml_ai', 'cloud_platforms']:
+                high_priority_missing.append(skill)
+            elif category in ['web_frameworks', 'databases', 'devops_tools']:
+                medium_priority_missing.append(skill)
+            else:
+                low_priority_missing.append(skill)
+        
+        # Generate recommendations
+        recommendations = self._generate_recommendations(
+            matched_skills, partial_matches, missing_skills,
+            resume_result['categorized_skills'], jd_result['categorized_skills']
+        )
+        
+        return {
+            'success': True,
+            'resume_skills': resume_result,
+            'jd_skills': jd_result,
+            'matched_skills': matched_skills,
+            'partial_matches': partial_matches,
+            'missing_skills': missing_skills,
+            'high_priority_missing': high_priority_missing,
+            'medium_priority_missing': medium_priority_missing,
+            'low_priority_missing': low_priority_missing,
+            'overall_score': overall_score,
+            'statistics': {
+                'total_resume_skills': len(resume_skills),
+                'total_jd_skills': len(jd_skills),
+                'matched_count': matched_count,
+                'partial_count': partial_count,
+                'missing_count': len(missing_skills),
+                'match_percentage': (matched_count / total_skills * 100) if total_skills > 0 else 0
+            },
+            'recommendations': recommendations
+        }
+    
     def _generate_recommendations(self, matched_skills, partial_matches, missing_skills, 
                                  resume_categories, jd_categories) -> List[Dict]:
         """Generate personalized recommendations based on skill gap analysis"""
@@ -1530,10 +2125,34 @@ def main():
             if uploaded_file:
                 text_input = uploaded_file.getvalue().decode("utf-8")
         
+        extraction_profile = st.selectbox(
+            "Extraction profile:",
+            ['custom'] + list(EXTRACTION_PROFILES),
+            help="'fast' answers within about a second; 'thorough' runs every method without a time limit"
+        )
+        selected_methods = st.multiselect(
+            "Extraction methods:",
+            list(EXTRACTION_METHODS),
+            default=list(EXTRACTION_METHODS),
+            disabled=extraction_profile != 'custom',
+            help="Only the spaCy components the selected methods need are run"
+        )
+        executor_mode = st.selectbox(
+            "Execution mode:",
+            list(EXECUTOR_MODES),
+            help="'threads' runs the text-only methods while spaCy parses; "
+                 "'processes' also moves the context regexes to a worker process"
+        )
+        
         if st.button("🔍 Extract Skills", type="primary", use_container_width=True):
             if text_input:
                 with st.spinner("Extracting skills..."):
-                    result = st.session_state.analyzer.skill_extractor.extract_skills(text_input, doc_type)
+                    result = st.session_state.analyzer.skill_extractor.extract_skills(
+                        text_input, doc_type,
+                        methods=selected_methods if extraction_profile == 'custom' else None,
+                        executor=executor_mode,
+                        extraction_profile=None if extraction_profile == 'custom' else extraction_profile
+                    )
                     
                     if result['success']:
                         st.session_state.extraction_results = result
@@ -1584,10 +2203,13 @@ def main():
                         
                         with st.expander("🔧 Extraction Methods Used"):
                             methods_df = pd.DataFrame([
-                                {'Method': method.replace('_', ' ').title(), 'Skills Found': count}
+                                {'Method': method.replace('_', ' ').title(), 'Skills Found': count,
+                                 'Time (ms)': round(result['method_timings'].get(method, 0) * 1000, 1)}
                                 for method, count in result['extraction_methods'].items()
                             ])
                             st.dataframe(methods_df, use_container_width=True)
+                            if result['skipped_methods']:
+                                st.caption("Skipped (time budget): " + ", ".join(result['skipped_methods']))
                     else:
                         st.error(f"❌ Extraction failed: {result.get('error', 'Unknown error')}")
             else:
@@ -1709,6 +2331,8 @@ def main():
                 embeddings = st.session_state.bert_embedder.encode_skills(skills)
                 st.session_state.skill_embeddings = embeddings
                 st.success(f"✅ Generated embeddings for {len(skills)} skills!")
+                st.caption(f"Stored as {embeddings.codec.name}: {embeddings.nbytes / 1024:.1f} KB "
+                           f"for {len(embeddings)} skills")
         
         if st.session_state.skill_embeddings:
             st.subheader("🔍 Skill Similarity Calculator")
@@ -1830,11 +2454,12 @@ def main():
         
         training_source = st.radio(
             "Training data source:",
-            ["Use Annotated Data", "Upload JSON File"],
+            ["Use Annotated Data", "Upload JSON File", "Weak-Supervision Shards"],
             horizontal=True
         )
         
         training_data = None
+        shard_trainer = None
         
         if training_source == "Use Annotated Data":
             if st.session_state.get('training_annotations'):
@@ -1844,6 +2469,23 @@ def main():
                 )
             else:
                 st.warning("⚠️ No annotations found. Use 'Annotate Data' tab first.")
+        elif training_source == "Weak-Supervision Shards":
+            st.caption("Generate shards with `python -m src.weak_supervision CORPUS_DIR OUTPUT_DIR`")
+            shard_dir = st.text_input("Shard directory:", value=get_cache_dir("weak_supervision"))
+            shard_limit = st.number_input("Maximum sentences:", min_value=100, max_value=1000000,
+                                          value=100000, step=1000)
+            if shard_dir and os.path.isdir(shard_dir):
+                try:
+                    shard_trainer = CustomSkillNERTrainer()
+                    training_data = shard_trainer.load_shard_examples(shard_dir, limit=int(shard_limit))
+                    if training_data:
+                        st.success(f"✅ Loaded {len(training_data)} silver-standard sentences")
+                    else:
+                        st.warning("⚠️ The manifest in that directory lists no sentences.")
+                except Exception as e:
+                    st.error(f"❌ Error loading shards: {e}")
+            else:
+                st.warning("⚠️ Shard directory not found.")
         else:
             uploaded_file = st.file_uploader("Upload training data (JSON)", type=['json'])
             if uploaded_file:
@@ -1857,7 +2499,7 @@ def main():
         if training_data:
             st.subheader("2️⃣ Configure Training")
             
-            col1, col2 = st.columns(2)
+            col1, col2, col3 = st.columns(3)
             
             with col1:
                 n_iterations = st.number_input(
@@ -1869,6 +2511,9 @@ def main():
                 )
             
             with col2:
+                dropout = st.slider("Dropout:", min_value=0.0, max_value=0.7, value=0.5, step=0.05)
+            
+            with col3:
                 st.info(f"Training examples: {len(training_data)}")
             
             st.subheader("3️⃣ Train Model")
@@ -1878,15 +2523,23 @@ def main():
                     progress_bar = st.progress(0)
                     
                     try:
-                        trainer = CustomSkillNERTrainer()
-                        trainer.create_blank_model()
-                        training_stats = trainer.train(training_data, n_iterations=n_iterations)
+                        # Shard examples are tied to the vocab of the trainer that loaded them
+                        trainer = shard_trainer or CustomSkillNERTrainer()
+                        if not trainer.nlp:
+                            trainer.create_blank_model()
+                        training_stats = trainer.train(
+                            training_data, n_iterations=n_iterations, dropout=dropout,
+                            progress_callback=lambda epoch, total, _: progress_bar.progress(int(epoch / total * 100))
+                        )
                         
                         st.session_state.trained_ner = trainer
                         st.session_state.training_stats = training_stats
                         
                         progress_bar.progress(100)
-                        st.success("✅ Training complete!")
+                        st.success(
+                            f"✅ Training complete in {training_stats['total_time']:.1f}s "
+                            f"({np.mean(training_stats['examples_per_sec']):.0f} examples/sec)"
+                        )
                         
                         fig = go.Figure()
                         fig.add_trace(go.Scatter(
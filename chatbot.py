@@ -15,6 +15,11 @@ import json
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+from src.compact_storage import get_storage_codec
+from src.embedding_registry import get_shared_encoder
+from src.skill_taxonomy import default_terms
+from src.taxonomy_embeddings import get_taxonomy_embeddings, l2_normalize
+
 # Try to import required libraries
 try:
     import faiss
@@ -28,6 +33,9 @@ except ImportError as e:
 class VectorDatabase:
     """FAISS-based vector database for semantic search"""
     
+    # Share of each dimension's observed range added on both sides of the int8 quantiser bounds
+    INT8_RANGE_HEADROOM = 0.25
+    
     def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
         """
         Initialize the vector database
@@ -37,6 +45,7 @@ class VectorDatabase:
         """
         self.model_name = model_name
         self.embedding_model = None
+        self.codec = None
         self.index = None
         self.documents = []
         self.metadata = []
@@ -52,10 +61,13 @@ class VectorDatabase:
                 st.error(f"❌ Missing dependencies: {MISSING_DEPS}")
                 return False
                 
-            self.embedding_model = SentenceTransformer(self.model_name)
+            # Shared with the rest of the app instead of loaded per database
+            self.embedding_model = get_shared_encoder(self.model_name, owner='chatbot')
             # Get the dimension of embeddings
             test_embedding = self.embedding_model.encode(["test"])
             self.dimension = test_embedding.shape[1]
+            # Storage mode of the index (SKILLGAP_EMBEDDING_STORAGE)
+            self.codec = get_storage_codec(encoder=self.embedding_model)
             return True
         except Exception as e:
             st.error(f"❌ Failed to load model: {e}")
@@ -81,7 +93,7 @@ class VectorDatabase:
         
         try:
             # Generate embeddings for new documents
-            new_embeddings = self.embedding_model.encode(documents)
+            new_embeddings = self._index_vectors(self.embedding_model.encode(documents))
             
             # Add to documents list
             self.documents.extend(documents)
@@ -90,11 +102,11 @@ class VectorDatabase:
             # Create or update FAISS index
             if self.index is None:
                 # Create new index
-                self.index = faiss.IndexFlatL2(self.dimension)
-                self.index.add(new_embeddings.astype('float32'))
+                self.index = self._create_index(new_embeddings)
+                self.index.add(new_embeddings)
             else:
                 # Add to existing index
-                self.index.add(new_embeddings.astype('float32'))
+                self.index.add(new_embeddings)
             
             self.is_built = True
             return True
@@ -119,10 +131,10 @@ class VectorDatabase:
         
         try:
             # Generate query embedding
-            query_embedding = self.embedding_model.encode([query])
+            query_embedding = self._index_vectors(self.embedding_model.encode([query]))
             
             # Search in FAISS index
-            distances, indices = self.index.search(query_embedding.astype('float32'), k)
+            distances, indices = self.index.search(query_embedding, k)
             
             results = []
             for i, (dist, idx) in enumerate(zip(distances[0], indices[0])):
@@ -148,8 +160,73 @@ class VectorDatabase:
             "total_documents": len(self.documents),
             "is_built": self.is_built,
             "model_name": self.model_name,
-            "dimension": self.dimension
+            "dimension": self.dimension,
+            "storage": self.codec.name if self.codec else None,
+            "bytes_per_vector": getattr(self.index, 'code_size', None)
+        }
+    
+    def storage_report(self, k: int = 5) -> Dict:
+        """
+        Recall of the index against exact float32 search, with every document as a query
+        
+        Re-encodes the documents, so it costs as much as building the index again.
+        """
+        if not self.is_built:
+            return {}
+        exact_vectors = np.asarray(self.embedding_model.encode(self.documents), dtype='float32')
+        k = min(k, len(self.documents))
+        exact_index = faiss.IndexFlatL2(exact_vectors.shape[1])
+        exact_index.add(exact_vectors)
+        _, exact_ids = exact_index.search(exact_vectors, k)
+        _, stored_ids = self.index.search(self._index_vectors(exact_vectors), k)
+        overlap = [len(set(a) & set(b)) for a, b in zip(exact_ids.tolist(), stored_ids.tolist())]
+        return {
+            "storage": self.codec.name,
+            "k": k,
+            "recall_at_k": float(np.mean(overlap)) / k if k else 1.0,
+            "bytes_per_vector": getattr(self.index, 'code_size', None),
+            "float32_bytes_per_vector": exact_vectors.shape[1] * 4
         }
+    
+    def _create_index(self, first_vectors: np.ndarray):
+        """FAISS index for the storage mode: flat, fp16/int8 scalar quantiser, or flat over PCA dimensions"""
+        dimension = first_vectors.shape[1]
+        if self.codec.mode == 'float16':
+            return faiss.IndexScalarQuantizer(dimension, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_L2)
+        if self.codec.mode == 'int8':
+            index = faiss.IndexScalarQuantizer(dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_L2)
+            index.train(self._int8_training_bounds(first_vectors))
+            return index
+        return faiss.IndexFlatL2(dimension)
+    
+    def _int8_training_bounds(self, first_vectors: np.ndarray) -> np.ndarray:
+        """
+        Per-dimension min and max rows for the int8 quantiser
+        
+        Unit embeddings use a small slice of [-1, 1] in each dimension, so the
+        bounds come from the skill taxonomy's embeddings and the first documents,
+        widened by INT8_RANGE_HEADROOM so later documents are rarely clipped.
+        """
+        sample = [first_vectors]
+        try:
+            taxonomy = get_taxonomy_embeddings(self.embedding_model, default_terms(), model_name=self.model_name)
+            sample.append(np.asarray(taxonomy.matrix, dtype='float32'))
+        except Exception as e:
+            print(f"Warning: int8 index bounds use the first documents only: {e}")
+        sample = np.vstack(sample)
+        low, high = sample.min(axis=0), sample.max(axis=0)
+        margin = self.INT8_RANGE_HEADROOM * (high - low)
+        return np.vstack([low - margin, high + margin]).astype('float32')
+    
+    def _index_vectors(self, embeddings: np.ndarray) -> np.ndarray:
+        """Embeddings as the index stores them; PCA mode projects onto the taxonomy components"""
+        embeddings = np.asarray(embeddings, dtype='float32')
+        if self.codec is not None and self.codec.mode == 'pca':
+            # Distances between projections equal those between the reconstructed vectors
+            return self.codec.encode(embeddings).data
+        if self.codec is not None and self.codec.mode == 'int8':
+            return l2_normalize(embeddings)
+        return embeddings
 
 class SkillGapChatbot:
     """RAG-based chatbot for skill gap analysis"""
@@ -452,7 +529,7 @@ def render_chatbox():
         # Show database stats
         if chatbot.vector_db.is_built:
             stats = chatbot.vector_db.get_stats()
-            st.info(f"📊 Knowledge Base: {stats['total_documents']} documents indexed")
+            st.info(f"📊 Knowledge Base: {stats['total_documents']} documents indexed ({stats['storage']} storage)")
         
         # Quick actions
         st.markdown("---")
@@ -2,7 +2,6 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
-from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 import plotly.graph_objects as go
 import plotly.express as px
@@ -18,6 +17,13 @@ import io
 import base64
 import logging
 
+from src.batch_encoding import encode_texts
+from src.compact_storage import taxonomy_recall_report
+from src.embedding_cache import get_embedding_cache
+from src.encoders import SkillEncoder
+from src.embedding_registry import get_embedding_registry, get_shared_encoder
+from src.resource_manager import get_resource_manager
+
 # Configure page
 st.set_page_config(
     page_title="AI Skill Gap Analyzer - Milestone 3",
@@ -132,11 +138,14 @@ class SentenceBERTEncoder:
         """
         self.model_name = model_name
         self.logger = self._setup_logger()
-        self.embedding_cache = {}
         
         try:
             self.logger.info(f"Loading model: {model_name}")
-            self.model = SentenceTransformer(model_name)
+            self.model = get_shared_encoder(model_name, owner='SentenceBERTEncoder')
+            # Includes the variant ("...@int8") when the quantised model is enabled
+            self.model_name = getattr(self.model, 'model_name', model_name)
+            # Shared by every encoder of this model in the process, backed by SQLite on disk
+            self.embedding_cache = get_embedding_cache(self.model_name, encoder=self.model)
             self.embedding_dimension = self.model.get_sentence_embedding_dimension()
             self.logger.info(f"Model loaded successfully. Embedding dimension: {self.embedding_dimension}")
         except Exception as e:
@@ -159,70 +168,27 @@ class SentenceBERTEncoder:
         if not skills:
             raise ValueError("Skills list cannot be empty")
         
-        # Check cache
-        if use_cache:
-            cached_embeddings = []
-            uncached_skills = []
-            uncached_indices = []
-            
-            for i, skill in enumerate(skills):
-                if skill in self.embedding_cache:
-                    cached_embeddings.append(self.embedding_cache[skill])
-                else:
-                    uncached_skills.append(skill)
-                    uncached_indices.append(i)
-            
-            # Encode uncached skills
-            if uncached_skills:
-                new_embeddings = self.model.encode(
-                    uncached_skills, 
-                    show_progress_bar=show_progress,
-                    batch_size=32
-                )
-                
-                # Update cache
-                for skill, embedding in zip(uncached_skills, new_embeddings):
-                    self.embedding_cache[skill] = embedding
-                
-                # Combine cached and new
-                all_embeddings = [None] * len(skills)
-                cached_idx = 0
-                uncached_idx = 0
-                
-                for i in range(len(skills)):
-                    if i in uncached_indices:
-                        all_embeddings[i] = new_embeddings[uncached_idx]
-                        uncached_idx += 1
-                    else:
-                        all_embeddings[i] = cached_embeddings[cached_idx]
-                        cached_idx += 1
-                
-                return np.array(all_embeddings)
-            else:
-                return np.array(cached_embeddings)
-        else:
-            # Encode without cache
-            embeddings = self.model.encode(
-                skills, 
-                show_progress_bar=show_progress,
-                batch_size=32
-            )
-            return embeddings
+        if not use_cache:
+            return encode_texts(self.model, skills, show_progress=show_progress)
+        
+        # Each distinct string is looked up once; only cache misses reach the model
+        return self.embedding_cache.encode(self.model, skills, show_progress=show_progress)
     
     def get_embedding_for_skill(self, skill: str) -> np.ndarray:
-        """Get embedding for a single skill"""
-        if skill in self.embedding_cache:
-            return self.embedding_cache[skill]
-        
-        embedding = self.model.encode([skill])[0]
-        self.embedding_cache[skill] = embedding
-        return embedding
+        """Get embedding for a single skill, in the cache's stored form whether or not it was cached"""
+        return self.embedding_cache.encode(self.model, [skill])[0]
     
-    def clear_cache(self):
-        """Clear embedding cache"""
-        self.embedding_cache.clear()
+    def clear_cache(self, disk: bool = False):
+        """Clear embedding cache (and this model's on-disk entries if ``disk``)"""
+        self.embedding_cache.clear(disk=disk)
         self.logger.info("Embedding cache cleared")
     
+    def warm_cache(self, skills: Optional[List[str]] = None) -> int:
+        """Pre-encode the skill taxonomy; returns the number of newly encoded strings"""
+        added = self.embedding_cache.warm_from_taxonomy(self.model, skills)
+        self.logger.info(f"Embedding cache warmed with {added} new skills")
+        return added
+    
     def _setup_logger(self) -> logging.Logger:
         """Setup logging"""
         logger = logging.getLogger('BERTEncoder')
@@ -318,8 +284,9 @@ class SimilarityCalculator:
 class SkillGapAnalyzer:
     """Main skill gap analysis engine"""
 
-    def __init__(self, encoder: SentenceBERTEncoder, calculator: SimilarityCalculator,
+    def __init__(self, encoder: SkillEncoder, calculator: SimilarityCalculator,
                  strong_threshold: float = 0.80, partial_threshold: float = 0.50):
+        # Any SkillEncoder works: SentenceBERTEncoder or a src.encoders backend
         self.encoder = encoder
         self.calculator = calculator
         self.strong_threshold = strong_threshold
@@ -927,8 +894,10 @@ class CompleteSkillGapApp:
     """Complete Milestone 3 Streamlit Application"""
     
     def __init__(self):
-        # Initialize components
-        self.encoder = SentenceBERTEncoder()
+        # Initialize components - the encoder is shared across reruns and sessions
+        manager = get_resource_manager()
+        manager.register('sentence_bert_encoder', SentenceBERTEncoder, kind='encoder')
+        self.encoder = manager.acquire('sentence_bert_encoder', owner='gap_analysys')
         self.calculator = SimilarityCalculator()
         self.visualizer = GapVisualizer()
         self.report_generator = ReportGenerator()
@@ -1541,10 +1510,117 @@ class CompleteSkillGapApp:
         **Cache Size:** {len(self.encoder.embedding_cache)} embeddings
         """)
         
-        if st.button("🗑️ Clear Embedding Cache"):
-            self.encoder.clear_cache()
-            st.success("Cache cleared!")
+        cache_stats = self.encoder.embedding_cache.stats()
+        st.caption(
+            f"Embedding cache: {cache_stats['memory_bytes'] / (1024 * 1024):.1f} / "
+            f"{cache_stats['max_bytes'] / (1024 * 1024):.0f} MB in memory, "
+            f"{cache_stats['disk_entries']} on disk, hit rate {cache_stats['hit_rate']:.0%}"
+        )
         
+        cache_col1, cache_col2, cache_col3 = st.columns(3)
+        with cache_col1:
+            if st.button("🗑️ Clear Embedding Cache"):
+                self.encoder.clear_cache()
+                st.success("Cache cleared!")
+        with cache_col2:
+            if st.button("🗑️ Clear Disk Cache"):
+                self.encoder.clear_cache(disk=True)
+                st.success("Memory and disk cache cleared!")
+        with cache_col3:
+            if st.button("🔥 Warm From Taxonomy"):
+                with st.spinner("Encoding skill taxonomy..."):
+                    added = self.encoder.warm_cache()
+                st.success(f"Encoded {added} new skills")
+
+        # Shared resources
+        st.markdown("---")
+        st.subheader("🧩 Loaded Resources")
+
+        manager = get_resource_manager()
+        if st.button("🔥 Warm Up All Resources"):
+            with st.spinner("Loading resources..."):
+                timings = manager.warmup()
+            st.success(f"Warmed up {len(timings)} resource(s)")
+
+        report = manager.load_report()
+        if report:
+            report_df = pd.DataFrame([
+                {
+                    'Resource': entry['name'],
+                    'Kind': entry['kind'],
+                    'Loaded': entry['loaded'],
+                    'References': entry['ref_count'],
+                    'Load Time (s)': round(entry['load_time'], 2)
+                }
+                for entry in report
+            ])
+            st.dataframe(report_df, use_container_width=True)
+            st.caption(f"Total load time this process: {manager.total_load_time():.2f}s")
+
+        registry = get_embedding_registry()
+        memory_report = registry.memory_report()
+        if memory_report:
+            st.markdown("**Resident Embedding Models**")
+            st.dataframe(pd.DataFrame([
+                {
+                    'Model': row['model_name'],
+                    'Resident': row['resident'],
+                    'Holders': ', '.join(row['holders']),
+                    'Parameters': f"{row['parameters']:,}",
+                    'Memory (MB)': round(row['memory_mb'], 1),
+                    'Encode Calls': row['encode_calls']
+                }
+                for row in memory_report
+            ]), use_container_width=True)
+            st.caption(f"Embedding weights resident: {registry.total_memory_mb():.1f} MB")
+
+        st.caption("Set SKILLGAP_QUANTIZE_EMBEDDINGS=1 to run encoders on the int8 quantised model.")
+        if st.button("⚖️ Check int8 Quantisation"):
+            with st.spinner("Encoding the skill taxonomy with fp32 and int8 models..."):
+                try:
+                    quant = registry.quantization_report(getattr(self.encoder.model, 'base_model_name',
+                                                                 self.encoder.model_name))
+                except Exception as e:
+                    quant = None
+                    st.error(f"Quantisation check failed: {e}")
+            if quant:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Mean Cosine vs fp32", f"{quant['mean_cosine']:.4f}")
+                with col2:
+                    st.metric("Nearest-Neighbour Agreement", f"{quant['neighbour_agreement']:.1%}")
+                with col3:
+                    st.metric("Speed-up", f"{quant['speedup']:.2f}x")
+                st.caption(
+                    f"{quant['n_texts']} taxonomy strings: min cosine {quant['min_cosine']:.4f}, "
+                    f"{quant['int8_texts_per_sec']:.0f} vs {quant['fp32_texts_per_sec']:.0f} texts/s, "
+                    f"weights {quant['int8_memory_mb']:.1f} MB vs {quant['fp32_memory_mb']:.1f} MB"
+                )
+                st.dataframe(pd.DataFrame(quant['worst_texts'], columns=['Largest Drift', 'Cosine']),
+                             use_container_width=True)
+
+        st.caption("Set SKILLGAP_EMBEDDING_STORAGE to float16, int8 or pca to keep cached and indexed "
+                   "embeddings in compact form.")
+        if st.button("🗜️ Check Compact Storage"):
+            with st.spinner("Scoring the skill taxonomy in every storage mode..."):
+                try:
+                    storage_report = taxonomy_recall_report(self.encoder.model)
+                except Exception as e:
+                    storage_report = None
+                    st.error(f"Storage check failed: {e}")
+            if storage_report:
+                st.dataframe(pd.DataFrame([
+                    {
+                        'Storage': row['storage'],
+                        f"Recall@{row['k']}": f"{row['recall_at_k']:.1%}",
+                        'Mean Score Error': f"{row['mean_abs_score_error']:.4f}",
+                        'Bytes / Vector': int(row['bytes_per_vector']),
+                        'Compression': f"{row['compression']:.1f}x",
+                        'Per 100k Vectors (MB)': f"{row['bytes_per_vector'] * 100_000 / (1024 * 1024):.1f}",
+                    }
+                    for row in storage_report
+                ]), use_container_width=True)
+
         # About
         st.markdown("---")
         st.subheader("ℹ️ About Milestone 3")
@@ -0,0 +1,198 @@
+"""
+Batched text encoding tuned for short, heavily repeated skill strings.
+
+``encode_texts`` encodes each distinct string once, sorts the distinct strings
+by length so every batch holds similarly sized inputs (little padding), and
+writes each batch straight into a preallocated output matrix. The batch size
+comes from a one-time calibration per (model, machine): a few candidate sizes
+are timed on a sample of skill-like strings and the fastest is stored under the
+cache directory. Calibration never runs on the request path - only at warmup
+(``ensure_calibrated``, registered with the resource manager for every loaded
+embedding model, and ``python -m src.embedding_cache warm``); until then
+requests use DEFAULT_BATCH_SIZE.
+"""
+
+import json
+import logging
+import os
+import platform
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.cache_paths import file_lock, get_cache_dir
+
+CANDIDATE_BATCH_SIZES = (8, 16, 32, 64, 128)
+DEFAULT_BATCH_SIZE = 32
+
+# Representative mix of one-word, multi-word and sentence-length inputs
+_CALIBRATION_TEXTS = (
+    "Python", "SQL", "AWS", "Docker", "Kubernetes", "React", "Java", "Git",
+    "machine learning", "data analysis", "project management", "REST APIs",
+    "natural language processing", "continuous integration and deployment",
+    "Amazon Web Services", "object-oriented programming", "unit testing",
+    "Experience building data pipelines with Apache Spark and Airflow",
+    "Strong communication skills and experience leading cross-functional teams",
+)
+
+_batch_sizes: Dict[str, int] = {}
+_lock = threading.Lock()
+logger = logging.getLogger(__name__)
+
+
+def dedupe(texts: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+    """Distinct texts in first-seen order and, per input, the index of its distinct text"""
+    positions: Dict[str, int] = {}
+    inverse = np.fromiter((positions.setdefault(text, len(positions)) for text in texts),
+                          dtype=np.int64, count=len(texts))
+    return list(positions), inverse
+
+
+def length_buckets(texts: Sequence[str], batch_size: int) -> List[np.ndarray]:
+    """Index batches of ``texts`` sorted by length (characters stand in for tokens)"""
+    order = np.argsort(np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts)),
+                       kind='stable')
+    return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+
+def encode_texts(encoder, texts: Sequence[str], batch_size: Optional[int] = None,
+                 show_progress: bool = False) -> np.ndarray:
+    """
+    Encode ``texts`` once per distinct string, in length-sorted batches
+
+    Args:
+        encoder: Model with a SentenceTransformer-style ``encode``
+        texts: Strings to encode; duplicates are encoded once
+        batch_size: Override the calibrated batch size
+        show_progress: Log progress per batch
+
+    Returns:
+        float32 matrix with one row per input text, in input order
+    """
+    if not len(texts):
+        return np.zeros((0, 0), dtype=np.float32)
+    unique, inverse = dedupe(texts)
+    batch_size = batch_size or get_batch_size(encoder)
+    buckets = length_buckets(unique, batch_size)
+
+    vectors = None
+    for n, bucket in enumerate(buckets, 1):
+        batch = np.asarray(encoder.encode([unique[i] for i in bucket], batch_size=batch_size))
+        if vectors is None:
+            vectors = np.empty((len(unique), batch.shape[-1]), dtype=np.float32)
+        vectors[bucket] = batch
+        if show_progress:
+            logger.info("Encoded batch %d/%d", n, len(buckets))
+    return vectors if len(unique) == len(texts) else vectors[inverse]
+
+
+def calibrate_batch_size(encoder, candidates: Sequence[int] = CANDIDATE_BATCH_SIZES,
+                         texts: Optional[Sequence[str]] = None, repeats: int = 2) -> Dict:
+    """
+    Time ``encoder`` at each candidate batch size and pick the highest throughput
+
+    Args:
+        encoder: Model with a SentenceTransformer-style ``encode``
+        candidates: Batch sizes to try
+        texts: Calibration sample (default: skill-like strings, 256 of them)
+        repeats: Timed runs per candidate; the fastest run counts
+
+    Returns:
+        {'batch_size': best size, 'throughput': {size: texts per second}}
+    """
+    texts = list(texts) if texts is not None else (list(_CALIBRATION_TEXTS) * 14)[:256]
+    encoder.encode(texts[:min(len(texts), 8)], batch_size=8)  # warm-up
+
+    throughput = {}
+    for size in candidates:
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            encoder.encode(texts, batch_size=size)
+            best = min(best, time.perf_counter() - start)
+        throughput[size] = len(texts) / best if best > 0 else float('inf')
+    return {'batch_size': max(throughput, key=throughput.get), 'throughput': throughput}
+
+
+def get_batch_size(encoder) -> int:
+    """
+    Calibrated batch size for ``encoder`` on this machine, or DEFAULT_BATCH_SIZE
+
+    Only reads the stored calibration; it never measures. SKILLGAP_ENCODE_BATCH_SIZE
+    overrides both.
+    """
+    override = os.environ.get("SKILLGAP_ENCODE_BATCH_SIZE")
+    if override:
+        return int(override)
+
+    key = _calibration_key(encoder)
+    batch_size = _batch_sizes.get(key)
+    if batch_size is None:
+        with _lock:
+            batch_size = _read_json(_calibration_path()).get(key)
+            if batch_size is not None:
+                _batch_sizes[key] = batch_size = int(batch_size)
+    return batch_size or DEFAULT_BATCH_SIZE
+
+
+def ensure_calibrated(encoder, force: bool = False) -> int:
+    """
+    Calibrate ``encoder``'s batch size unless this machine already has a stored value
+
+    Meant for warmup, not for the request path. Returns the batch size in use.
+    """
+    key = _calibration_key(encoder)
+    with _lock:
+        path = _calibration_path()
+        batch_size = None if force else _read_json(path).get(key)
+        if batch_size is None:
+            try:
+                batch_size = calibrate_batch_size(encoder)['batch_size']
+            except Exception as e:
+                print(f"Warning: batch size calibration failed, using {DEFAULT_BATCH_SIZE}: {e}")
+                return DEFAULT_BATCH_SIZE
+            # Re-read under the lock so sizes other processes calibrated meanwhile are kept
+            with file_lock(f"{path}.lock"):
+                stored = _read_json(path)
+                stored[key] = batch_size
+                _write_json(path, stored)
+        _batch_sizes[key] = int(batch_size)
+        return _batch_sizes[key]
+
+
+def register_calibration(encoder, manager=None) -> str:
+    """Register ``ensure_calibrated(encoder)`` as a resource, so ``ResourceManager.warmup`` runs it"""
+    from src.resource_manager import get_resource_manager
+
+    name = f"batch_size:{getattr(encoder, 'model_name', type(encoder).__name__)}"
+    (manager or get_resource_manager()).register(name, lambda: ensure_calibrated(encoder), kind='calibration')
+    return name
+
+
+def _calibration_path() -> str:
+    return os.path.join(get_cache_dir("calibration"), "batch_sizes.json")
+
+
+def _calibration_key(encoder) -> str:
+    model_name = getattr(encoder, 'model_name', type(encoder).__name__)
+    return f"{model_name}|{platform.machine()}|{os.cpu_count()}"
+
+
+def _read_json(path: str) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_json(path: str, payload: Dict) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: could not save batch size calibration: {e}")
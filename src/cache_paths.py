@@ -0,0 +1,39 @@
+import os
+from contextlib import contextmanager
+
+# Root for every on-disk cache (compiled matchers, embeddings, extraction results).
+# Override with the SKILLGAP_CACHE_DIR environment variable, e.g. to share a cache
+# volume between worker containers.
+DEFAULT_CACHE_ROOT = ".skillgap_cache"
+
+
+def get_cache_dir(*parts):
+    """Returns (and creates) a directory under the cache root."""
+    root = os.environ.get("SKILLGAP_CACHE_DIR", DEFAULT_CACHE_ROOT)
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+@contextmanager
+def file_lock(path):
+    """Holds an exclusive inter-process lock on ``path`` (created if missing) for the with-block."""
+    with open(path, "a+b") as handle:
+        if os.name == "nt":
+            import msvcrt
+
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
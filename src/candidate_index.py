@@ -0,0 +1,467 @@
+"""
+Persistent candidate index for retrieving the best resumes for a job description.
+
+Each indexed resume is stored as its set of canonical skills. Skills are
+embedded once into a shared vocabulary matrix (unit-length float32 rows) and
+candidates reference vocabulary rows through a CSR membership layout, so a
+pool of tens of thousands of resumes costs one matrix product per query:
+
+1. the JD skills are embedded and compared with every vocabulary skill;
+2. ``np.maximum.reduceat`` over the membership rows gives each candidate's best
+   similarity per JD skill, which is scored with the same strong/partial rule
+   as ``SkillGapAnalyzer``;
+3. only the shortlist is re-scored exactly with a full ``SkillGapAnalyzer``.
+
+Vocabulary vectors are kept in the configured compact storage mode (see
+``src.compact_storage``) and scored in that form; membership rows are int32,
+so a candidate costs four bytes per skill plus its share of the vocabulary.
+
+The index lives under the cache directory and survives restarts. Each
+``save`` appends one immutable segment holding only the candidates, removals
+and skill vectors changed since the last save, then atomically replaces
+``manifest.json``, the list of live segments; readers therefore always see a
+complete set of files. Saves take an inter-process lock and first apply the
+segments other processes wrote meanwhile, so concurrent writers never drop
+each other's candidates. Once there are more than ``MAX_SEGMENTS`` segments,
+the next save compacts them into one, dropping the vectors of skills no
+remaining candidate uses.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.cache_paths import file_lock, get_cache_dir
+from src.compact_storage import CompactVectors, get_storage_codec
+from src.taxonomy_embeddings import l2_normalize
+
+INDEX_VERSION = 1
+MANIFEST = 'manifest.json'
+MAX_SEGMENTS = 32
+
+
+def _encode(encoder, texts: List[str]) -> np.ndarray:
+    """Embed ``texts`` with either a skill encoder or a SentenceTransformer-style model"""
+    if hasattr(encoder, 'encode_skills'):
+        vectors = encoder.encode_skills(texts, show_progress=False)
+    else:
+        vectors = encoder.encode(texts)
+    return l2_normalize(np.asarray(vectors).reshape(len(texts), -1))
+
+
+class CandidateIndex:
+    """Skill-set index over processed resumes, persisted as segments of ``.npy`` and JSON files"""
+
+    def __init__(self, encoder, name: str = 'default', model_name: Optional[str] = None,
+                 directory: Optional[str] = None, strong_threshold: float = 0.80,
+                 partial_threshold: float = 0.50, storage: Optional[str] = None):
+        """
+        Args:
+            encoder: Skill encoder (``encode_skills``) or model with ``encode``
+            name: Index name; each name is a separate directory under the cache root
+            model_name: Embedding model identifier stored with the vectors
+            directory: Explicit storage directory (overrides ``name``)
+            strong_threshold: Similarity counted as a full match when ranking
+            partial_threshold: Similarity counted as a half match when ranking
+            storage: Vector storage mode (default: SKILLGAP_EMBEDDING_STORAGE)
+        """
+        self.encoder = encoder
+        self.model_name = model_name or getattr(encoder, 'model_name', type(encoder).__name__)
+        self.directory = directory or get_cache_dir("candidate_index", name)
+        self.strong_threshold = strong_threshold
+        self.partial_threshold = partial_threshold
+        self.codec = get_storage_codec(storage, encoder=encoder)
+
+        self._lock = threading.RLock()
+        self._vocabulary: List[str] = []
+        self._vocab_ids: Dict[str, int] = {}
+        self._vectors = self.codec.empty(0)
+        self._candidates: Dict[str, Dict] = {}
+        self._compiled = None
+
+        # Persistence state: applied segments, skills with vectors on disk and
+        # changes not saved yet
+        self._segments: List[str] = []
+        self._disk_skills: set = set()
+        self._dirty: set = set()
+        self._removed: set = set()
+        self._needs_compaction = False
+
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._candidates)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self._candidates
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._vocabulary)
+
+    # --- Building ---
+    def add(self, candidate_id: str, skills: Iterable[str], metadata: Optional[Dict] = None) -> None:
+        """Add or replace one candidate"""
+        self.add_many([(candidate_id, skills, metadata)])
+
+    def add_many(self, candidates: Iterable[Tuple[str, Iterable[str], Optional[Dict]]]) -> int:
+        """
+        Add or replace several candidates, embedding all new skills in one batch
+
+        Args:
+            candidates: (candidate id, skill names, metadata) tuples
+
+        Returns:
+            Number of candidates written
+        """
+        candidates = [(cid, self._clean_skills(skills), metadata or {})
+                      for cid, skills, metadata in candidates]
+        with self._lock:
+            new_skills = list(dict.fromkeys(
+                skill for _, skills, _ in candidates for skill in skills if skill not in self._vocab_ids
+            ))
+            if new_skills:
+                self._extend_vocabulary(new_skills, _encode(self.encoder, new_skills))
+
+            for cid, skills, metadata in candidates:
+                self._set_candidate(cid, skills, metadata)
+                self._dirty.add(cid)
+                self._removed.discard(cid)
+            self._compiled = None
+        return len(candidates)
+
+    def remove(self, candidate_id: str) -> bool:
+        with self._lock:
+            removed = self._candidates.pop(candidate_id, None) is not None
+            if removed:
+                self._dirty.discard(candidate_id)
+                self._removed.add(candidate_id)
+                self._compiled = None
+            return removed
+
+    def get_skills(self, candidate_id: str) -> List[str]:
+        return list(self._candidates[candidate_id]['skills'])
+
+    # --- Querying ---
+    def search(self, jd_skills: Sequence[str], top_k: int = 10, shortlist_size: Optional[int] = None,
+               analyzer=None) -> List[Dict]:
+        """
+        Return the ``top_k`` candidates for a job description's skills
+
+        Args:
+            jd_skills: Skills required by the job description
+            top_k: Number of candidates to return
+            shortlist_size: Candidates passed to exact scoring (default ``3 * top_k``)
+            analyzer: Optional ``SkillGapAnalyzer``; when given, the shortlist is
+                re-scored with ``analyzer.analyze`` and ranked by its overall score
+
+        Returns:
+            Dicts with ``candidate_id``, ``metadata``, ``skills``, ``approx_score``
+            (fraction of JD skills matched, partial matches counting half),
+            ``score`` and, when an analyzer is used, its ``analysis`` result
+        """
+        jd_skills = self._clean_skills(jd_skills)
+        with self._lock:
+            if not jd_skills or not self._candidates:
+                return []
+            ids, indptr, indices = self._compile()
+
+            # Vocabulary x JD similarities, then the best vocabulary row per candidate
+            best = np.zeros((len(ids), len(jd_skills)), dtype=np.float32)
+            nonempty = np.flatnonzero(np.diff(indptr) > 0)
+            if len(nonempty):
+                similarity = self.codec.similarity(self._jd_vectors(jd_skills), self._vectors).T
+                best[nonempty] = np.maximum.reduceat(similarity[indices], indptr[nonempty], axis=0)
+
+            strong = (best >= self.strong_threshold).sum(axis=1)
+            partial = ((best >= self.partial_threshold) & (best < self.strong_threshold)).sum(axis=1)
+            approx = (strong + 0.5 * partial) / len(jd_skills)
+            # Mean best similarity breaks ties between equal match counts
+            ranking_key = approx + 1e-3 * best.mean(axis=1)
+
+            shortlist_size = min(len(ids), max(top_k, shortlist_size or 3 * top_k))
+            shortlist = np.argpartition(-ranking_key, shortlist_size - 1)[:shortlist_size]
+            shortlist = shortlist[np.argsort(-ranking_key[shortlist], kind='stable')]
+            entries = [(ids[i], float(approx[i]), self._candidates[ids[i]]) for i in shortlist]
+
+        results = []
+        for cid, approx_score, entry in entries:
+            result = {
+                'candidate_id': cid,
+                'metadata': entry['metadata'],
+                'skills': entry['skills'],
+                'approx_score': approx_score,
+                'score': approx_score,
+            }
+            if analyzer is not None:
+                try:
+                    analysis = analyzer.analyze(entry['skills'], jd_skills)
+                except ValueError:
+                    continue
+                result['analysis'] = analysis
+                result['score'] = float(analysis.overall_score)
+            results.append(result)
+
+        results.sort(key=lambda r: (r['score'], r['approx_score']), reverse=True)
+        return results[:top_k]
+
+    def memory_report(self) -> Dict:
+        """Bytes held by the vocabulary vectors and membership rows, in total and per candidate"""
+        with self._lock:
+            ids, indptr, indices = self._compile()
+            dimension = self.codec.input_dimension(self._vectors) if len(self._vectors) else 0
+            vector_bytes = self._vectors.nbytes
+            membership_bytes = indptr.nbytes + indices.nbytes
+        total = vector_bytes + membership_bytes
+        return {
+            'storage': self.codec.name,
+            'candidates': len(ids),
+            'vocabulary': len(self._vocabulary),
+            'vector_bytes': vector_bytes,
+            'float32_vector_bytes': len(self._vocabulary) * dimension * 4,
+            'membership_bytes': membership_bytes,
+            'bytes_per_candidate': total / len(ids) if ids else 0.0,
+        }
+
+    # --- Persistence ---
+    def save(self) -> None:
+        """
+        Persist the changes since the last save as one new segment
+
+        Under the directory's lock, segments written meanwhile by other processes
+        are applied first (this index's own changes win for the same candidate),
+        then the new segment is written and ``manifest.json`` is replaced
+        atomically. Too many segments are compacted into one.
+        """
+        with self._lock, file_lock(os.path.join(self.directory, 'index.lock')):
+            manifest = self._read_manifest()
+            if manifest is not None:
+                for segment in manifest['segments']:
+                    if segment not in self._segments:
+                        self._apply_segment(segment)
+                if manifest.get('model') != self.model_name or manifest.get('storage') != self.codec.name:
+                    self._needs_compaction = True
+            live = list(manifest['segments']) if manifest is not None else []
+            if not (self._dirty or self._removed or self._needs_compaction):
+                self._segments = live
+                return
+
+            if self._needs_compaction or len(live) >= MAX_SEGMENTS:
+                self._prune_vocabulary()
+                self._disk_skills = set()
+                segment = self._write_segment(list(self._candidates), removed=[])
+                stale, live = live, [segment]
+            else:
+                segment = self._write_segment([cid for cid in self._candidates if cid in self._dirty],
+                                              removed=sorted(self._removed))
+                stale, live = [], live + [segment]
+
+            self._atomic_save_json(MANIFEST, {
+                'version': INDEX_VERSION,
+                'model': self.model_name,
+                'storage': self.codec.name,
+                'segments': live,
+            })
+            self._segments = live
+            self._dirty, self._removed = set(), set()
+            self._needs_compaction = False
+            for name in stale:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def load(self) -> bool:
+        """Load a saved index from ``self.directory``; returns False if none is usable"""
+        for _ in range(3):
+            manifest = self._read_manifest()
+            if manifest is None:
+                return False
+            with self._lock:
+                self._reset()
+                try:
+                    for segment in manifest['segments']:
+                        self._apply_segment(segment)
+                except (FileNotFoundError, ValueError, OSError, KeyError):
+                    # A concurrent compaction removed a segment; the new manifest lists its replacement
+                    continue
+                self._needs_compaction = (manifest.get('model') != self.model_name
+                                          or manifest.get('storage') != self.codec.name)
+                return True
+        self._reset()
+        return False
+
+    def clear(self) -> None:
+        """Drop every candidate; the next ``save`` removes them on disk too"""
+        with self._lock:
+            removed = set(self._candidates) | self._removed
+            self._reset()
+            self._removed = removed
+
+    # --- Internals ---
+    @staticmethod
+    def _clean_skills(skills: Iterable[str]) -> List[str]:
+        names = (skill['name'] if isinstance(skill, dict) else skill for skill in skills)
+        return list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+
+    def _set_candidate(self, cid: str, skills: List[str], metadata: Dict) -> None:
+        self._candidates[cid] = {
+            'skills': skills,
+            'skill_ids': [self._vocab_ids[skill] for skill in skills],
+            'metadata': metadata,
+        }
+
+    def _extend_vocabulary(self, skills: List[str], vectors: np.ndarray) -> None:
+        self._extend_compact(skills, self.codec.encode(vectors))
+
+    def _extend_compact(self, skills: List[str], compact: CompactVectors) -> None:
+        start = len(self._vocabulary)
+        self._vocabulary.extend(skills)
+        self._vocab_ids.update({skill: start + i for i, skill in enumerate(skills)})
+        self._vectors = compact if not start else CompactVectors.concatenate([self._vectors, compact])
+
+    def _prune_vocabulary(self) -> None:
+        """Drop vocabulary rows that no candidate references any more"""
+        referenced = {skill for entry in self._candidates.values() for skill in entry['skills']}
+        keep = [i for i, skill in enumerate(self._vocabulary) if skill in referenced]
+        if len(keep) == len(self._vocabulary):
+            return
+        self._vocabulary = [self._vocabulary[i] for i in keep]
+        self._vocab_ids = {skill: i for i, skill in enumerate(self._vocabulary)}
+        self._vectors = self._vectors.take(keep) if keep else self.codec.empty(0)
+        for entry in self._candidates.values():
+            entry['skill_ids'] = [self._vocab_ids[skill] for skill in entry['skills']]
+        self._compiled = None
+
+    def _reset(self) -> None:
+        self._vocabulary, self._vocab_ids = [], {}
+        self._vectors = self.codec.empty(0)
+        self._candidates = {}
+        self._compiled = None
+        self._segments, self._disk_skills = [], set()
+        self._dirty, self._removed = set(), set()
+        self._needs_compaction = False
+
+    def _read_manifest(self) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self.directory, MANIFEST), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        return manifest if manifest.get('version') == INDEX_VERSION else None
+
+    def _write_segment(self, candidate_ids: List[str], removed: List[str]) -> str:
+        """
+        Write an immutable segment directory and return its name
+
+        Membership rows index the segment's own ``skills`` list, so segments
+        written by different processes never disagree on row numbers. Only skills
+        without a vector on disk yet carry one (they come first in ``skills``).
+        """
+        name = f"segment-{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}"
+        path = os.path.join(self.directory, name)
+        tmp_path = f"{path}.tmp"
+        os.makedirs(tmp_path)
+
+        referenced = list(dict.fromkeys(skill for cid in candidate_ids for skill in self._candidates[cid]['skills']))
+        new_skills = [skill for skill in referenced if skill not in self._disk_skills]
+        skills = new_skills + [skill for skill in referenced if skill in self._disk_skills]
+        local_ids = {skill: i for i, skill in enumerate(skills)}
+        lengths = [len(self._candidates[cid]['skills']) for cid in candidate_ids]
+        indptr = np.zeros(len(candidate_ids) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = np.fromiter((local_ids[skill] for cid in candidate_ids for skill in self._candidates[cid]['skills']),
+                              dtype=np.int32, count=int(indptr[-1]))
+
+        vectors = self._vectors.take([self._vocab_ids[skill] for skill in new_skills])
+        np.save(os.path.join(tmp_path, 'vectors.npy'), vectors.data)
+        if vectors.scales is not None:
+            np.save(os.path.join(tmp_path, 'vector_scales.npy'), vectors.scales)
+        np.save(os.path.join(tmp_path, 'membership_indptr.npy'), indptr)
+        np.save(os.path.join(tmp_path, 'membership_indices.npy'), indices)
+        with open(os.path.join(tmp_path, 'segment.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'model': self.model_name,
+                'storage': self.codec.name,
+                'skills': skills,
+                'vector_count': len(new_skills),
+                'candidates': [{'id': cid, 'metadata': self._candidates[cid]['metadata']} for cid in candidate_ids],
+                'removed': removed,
+            }, f)
+        os.replace(tmp_path, path)
+        self._disk_skills.update(new_skills)
+        return name
+
+    def _apply_segment(self, name: str) -> None:
+        """Merge a segment from disk; unsaved changes in memory take precedence"""
+        path = os.path.join(self.directory, name)
+        with open(os.path.join(path, 'segment.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        indptr = np.load(os.path.join(path, 'membership_indptr.npy'))
+        indices = np.load(os.path.join(path, 'membership_indices.npy'))
+        if len(indptr) != len(meta['candidates']) + 1:
+            raise ValueError(f"Corrupt candidate index segment {name}")
+
+        skills, count = meta['skills'], meta['vector_count']
+        missing = [i for i, skill in enumerate(skills) if skill not in self._vocab_ids]
+        if missing:
+            if meta.get('model') == self.model_name and meta.get('storage') == self.codec.name:
+                vectors = CompactVectors(np.load(os.path.join(path, 'vectors.npy')))
+                if self.codec.mode == 'int8':
+                    vectors.scales = np.load(os.path.join(path, 'vector_scales.npy'))
+                stored = [i for i in missing if i < count]
+                if stored:
+                    self._extend_compact([skills[i] for i in stored], vectors.take(stored))
+            else:
+                # Vectors from another model or storage mode are useless; the skill
+                # names are enough to rebuild them, and the next save compacts
+                self._needs_compaction = True
+            unstored = [skills[i] for i in missing if skills[i] not in self._vocab_ids]
+            if unstored:
+                self._extend_vocabulary(unstored, _encode(self.encoder, unstored))
+        self._disk_skills.update(skills[:count])
+
+        for cid in meta['removed']:
+            if cid not in self._dirty:
+                self._candidates.pop(cid, None)
+        for row, candidate in enumerate(meta['candidates']):
+            cid = candidate['id']
+            if cid in self._dirty or cid in self._removed:
+                continue
+            self._set_candidate(cid, [skills[i] for i in indices[indptr[row]:indptr[row + 1]]],
+                                candidate.get('metadata', {}))
+        self._segments.append(name)
+        self._compiled = None
+
+    def _jd_vectors(self, jd_skills: List[str]) -> np.ndarray:
+        """JD skill vectors, reusing vocabulary rows and embedding only unseen skills"""
+        known = [self._vocab_ids.get(skill) for skill in jd_skills]
+        unseen = [skill for skill, idx in zip(jd_skills, known) if idx is None]
+        rows = [idx for idx in known if idx is not None]
+        encoded = iter(_encode(self.encoder, unseen)) if unseen else iter(())
+        decoded = iter(self.codec.decode(self._vectors.take(rows))) if rows else iter(())
+        return np.stack([next(decoded) if idx is not None else next(encoded) for idx in known])
+
+    def _compile(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """CSR layout of candidate -> vocabulary rows: (ids, indptr, indices)"""
+        if self._compiled is None:
+            ids = list(self._candidates)
+            lengths = [len(self._candidates[cid]['skill_ids']) for cid in ids]
+            indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=indptr[1:])
+            indices = np.fromiter(
+                (i for cid in ids for i in self._candidates[cid]['skill_ids']),
+                dtype=np.int32, count=int(indptr[-1])
+            )
+            self._compiled = (ids, indptr, indices)
+        return self._compiled
+
+    def _atomic_save_json(self, filename: str, payload: Dict) -> None:
+        path = os.path.join(self.directory, filename)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
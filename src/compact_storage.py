@@ -0,0 +1,420 @@
+"""
+Compact storage modes for cached and indexed embeddings.
+
+Embeddings are computed in float32, but they can be held in a smaller form
+wherever they are stored: the embedding cache, the candidate index, the
+Milestone 2 skill embeddings and the chatbot's FAISS index. Four modes exist:
+
+- ``float32``: unchanged (4 bytes per dimension);
+- ``float16``: half precision (2 bytes per dimension);
+- ``int8``: scalar quantisation with one float32 scale per vector (1 byte per
+  dimension + 4 bytes);
+- ``pca``: projection onto the top principal components of the skill
+  taxonomy's embeddings (e.g. 384 -> 128 dimensions, float32).
+
+Scores are computed on the compact rows directly: block by block for float16
+and int8, and in the reduced space for PCA, where the dot product with a
+query equals its dot product with the reconstructed vector. No full float32
+copy of the stored matrix is ever built. ``recall_report`` measures what a
+mode costs in nearest-neighbour recall and score error.
+
+The mode is chosen with SKILLGAP_EMBEDDING_STORAGE (float32, float16, int8 or
+pca) and SKILLGAP_PCA_COMPONENTS (default 128).
+
+Usage:
+    python -m src.compact_storage [--model all-MiniLM-L6-v2] [--k 10]
+"""
+
+import argparse
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.cache_paths import get_cache_dir
+from src.skill_taxonomy import default_terms
+from src.taxonomy_embeddings import l2_normalize
+
+STORAGE_MODES = ('float32', 'float16', 'int8', 'pca')
+DEFAULT_PCA_COMPONENTS = 128
+_BLOCK_ROWS = 65536
+
+
+class CompactVectors:
+    """Rows in compact form: ``data`` plus, for int8, one scale per row"""
+
+    def __init__(self, data: np.ndarray, scales: Optional[np.ndarray] = None):
+        self.data = data
+        self.scales = scales
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def take(self, rows) -> 'CompactVectors':
+        return CompactVectors(self.data[rows], None if self.scales is None else self.scales[rows])
+
+    @staticmethod
+    def concatenate(parts: Sequence['CompactVectors']) -> 'CompactVectors':
+        parts = [part for part in parts if len(part)] or list(parts[:1])
+        data = np.concatenate([part.data for part in parts])
+        scales = None if parts[0].scales is None else np.concatenate([part.scales for part in parts])
+        return CompactVectors(data, scales)
+
+
+class VectorCodec:
+    """float32 storage; the base class for the compact modes"""
+
+    mode = 'float32'
+    dtype = np.float32
+
+    @property
+    def name(self) -> str:
+        """Identifies the stored form; part of every cache namespace and index file"""
+        return self.mode
+
+    def encode(self, vectors: np.ndarray) -> CompactVectors:
+        return CompactVectors(np.ascontiguousarray(vectors, dtype=self.dtype))
+
+    def decode(self, compact: CompactVectors) -> np.ndarray:
+        return compact.data.astype(np.float32)
+
+    def empty(self, dimension: int) -> CompactVectors:
+        return self.encode(np.zeros((0, dimension), dtype=np.float32))
+
+    def similarity(self, queries: np.ndarray, compact: CompactVectors) -> np.ndarray:
+        """
+        Dot products of unit-length ``queries`` with every stored row
+
+        Returns:
+            (n_queries, n_rows) float32 scores - cosine similarities for
+            unit-length stored vectors, up to the storage error
+        """
+        queries = self._prepare_queries(l2_normalize(np.asarray(queries).reshape(-1, self.input_dimension(compact))))
+        scores = np.empty((len(queries), len(compact)), dtype=np.float32)
+        for start in range(0, len(compact), _BLOCK_ROWS):
+            end = min(start + _BLOCK_ROWS, len(compact))
+            scores[:, start:end] = self._block_scores(queries, compact, start, end)
+        return scores
+
+    def input_dimension(self, compact: CompactVectors) -> int:
+        return compact.data.shape[1]
+
+    def row_bytes(self, compact: CompactVectors, row: int) -> bytes:
+        """One stored row as bytes, for the SQLite cache tier"""
+        scale = b'' if compact.scales is None else compact.scales[row:row + 1].tobytes()
+        return scale + compact.data[row].tobytes()
+
+    def from_row_bytes(self, blob: bytes) -> CompactVectors:
+        return CompactVectors(np.frombuffer(blob, dtype=self.dtype)[None, :])
+
+    def _prepare_queries(self, queries: np.ndarray) -> np.ndarray:
+        return queries
+
+    def _block_scores(self, queries: np.ndarray, compact: CompactVectors, start: int, end: int) -> np.ndarray:
+        return queries @ compact.data[start:end].astype(np.float32, copy=False).T
+
+
+class Float16Codec(VectorCodec):
+    mode = 'float16'
+    dtype = np.float16
+
+
+class Int8Codec(VectorCodec):
+    """Symmetric int8 quantisation with a per-vector scale (max |value| / 127)"""
+
+    mode = 'int8'
+    dtype = np.int8
+
+    def encode(self, vectors: np.ndarray) -> CompactVectors:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        scales = np.abs(vectors).max(axis=1) / 127.0 if vectors.size else np.zeros(len(vectors), np.float32)
+        scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+        data = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return CompactVectors(data, scales)
+
+    def decode(self, compact: CompactVectors) -> np.ndarray:
+        return compact.data.astype(np.float32) * compact.scales[:, None]
+
+    def from_row_bytes(self, blob: bytes) -> CompactVectors:
+        scales = np.frombuffer(blob[:4], dtype=np.float32)
+        return CompactVectors(np.frombuffer(blob[4:], dtype=np.int8)[None, :], scales)
+
+    def _block_scores(self, queries: np.ndarray, compact: CompactVectors, start: int, end: int) -> np.ndarray:
+        block = compact.data[start:end].astype(np.float32)
+        return (queries @ block.T) * compact.scales[start:end]
+
+
+class PCACodec(VectorCodec):
+    """Projection onto principal components fitted on the taxonomy embeddings"""
+
+    mode = 'pca'
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray, key: str = ''):
+        """
+        Args:
+            mean: (d,) mean of the fitting vectors
+            components: (k, d) orthonormal principal axes
+            key: Identifies the fit (model and taxonomy) in ``name``
+        """
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)
+        self.key = key
+
+    @property
+    def name(self) -> str:
+        return f"pca{len(self.components)}-{self.key}" if self.key else f"pca{len(self.components)}"
+
+    @classmethod
+    def fit(cls, vectors: np.ndarray, n_components: int = DEFAULT_PCA_COMPONENTS, key: str = '') -> 'PCACodec':
+        vectors = np.asarray(vectors, dtype=np.float32)
+        n_components = min(n_components, vectors.shape[0], vectors.shape[1])
+        mean = vectors.mean(axis=0)
+        _, _, vt = np.linalg.svd(vectors - mean, full_matrices=False)
+        return cls(mean, vt[:n_components], key=key)
+
+    def explained_variance_ratio(self, vectors: np.ndarray) -> float:
+        centred = np.asarray(vectors, dtype=np.float32) - self.mean
+        total = float((centred ** 2).sum())
+        return float(((centred @ self.components.T) ** 2).sum()) / total if total else 1.0
+
+    def encode(self, vectors: np.ndarray) -> CompactVectors:
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.components.shape[1])
+        return CompactVectors(np.ascontiguousarray((vectors - self.mean) @ self.components.T))
+
+    def decode(self, compact: CompactVectors) -> np.ndarray:
+        return compact.data @ self.components + self.mean
+
+    def input_dimension(self, compact: CompactVectors) -> int:
+        return self.components.shape[1]
+
+    def _prepare_queries(self, queries: np.ndarray) -> np.ndarray:
+        # q . (r C + m) = (q C^T) . r + q . m - scored against the reconstruction
+        return np.hstack([queries @ self.components.T, (queries @ self.mean)[:, None]])
+
+    def _block_scores(self, queries: np.ndarray, compact: CompactVectors, start: int, end: int) -> np.ndarray:
+        return queries[:, :-1] @ compact.data[start:end].T + queries[:, -1:]
+
+    def save(self, path: str) -> None:
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, mean=self.mean, components=self.components)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, key: str = '') -> Optional['PCACodec']:
+        try:
+            with np.load(path) as archive:
+                return cls(archive['mean'], archive['components'], key=key)
+        except (FileNotFoundError, ValueError, KeyError, OSError):
+            return None
+
+
+class CompactVectorStore:
+    """Dict-like ``key -> vector`` map that keeps its rows in a codec's compact form"""
+
+    def __init__(self, codec: Optional[VectorCodec] = None):
+        self.codec = codec or VectorCodec()
+        self._rows: Dict[str, int] = {}
+        self._parts: List[CompactVectors] = []
+        self._compact: Optional[CompactVectors] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.codec.decode(self.compact().take([self._rows[key]]))[0]
+
+    def __setitem__(self, key: str, vector: np.ndarray) -> None:
+        self.add([key], np.asarray(vector)[None, :])
+
+    def keys(self):
+        return self._rows.keys()
+
+    def items(self):
+        return ((key, self[key]) for key in self._rows)
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Store ``vectors`` (unit-normalised) under ``keys``; an existing key's row is overwritten in place"""
+        if not len(keys):
+            return
+        encoded = self.codec.encode(l2_normalize(np.asarray(vectors).reshape(len(keys), -1)))
+        # The last vector given for a key wins
+        positions = {key: i for i, key in enumerate(keys)}
+        existing = [(self._rows[key], i) for key, i in positions.items() if key in self._rows]
+        new = [(key, i) for key, i in positions.items() if key not in self._rows]
+
+        if existing:
+            compact = self.compact()
+            rows, sources = (list(column) for column in zip(*existing))
+            compact.data[rows] = encoded.data[sources]
+            if compact.scales is not None:
+                compact.scales[rows] = encoded.scales[sources]
+        if new:
+            start = len(self.compact()) if self._parts else 0
+            self._parts.append(encoded.take([i for _, i in new]))
+            self._compact = None
+            for offset, (key, _) in enumerate(new):
+                self._rows[key] = start + offset
+
+    def compact(self) -> CompactVectors:
+        if self._compact is None:
+            if not self._parts:
+                return CompactVectors(np.zeros((0, 0), dtype=self.codec.dtype))
+            self._compact = CompactVectors.concatenate(self._parts)
+            self._parts = [self._compact]
+        return self._compact
+
+    def take(self, keys: Sequence[str]) -> CompactVectors:
+        """Compact rows of ``keys``, in order"""
+        return self.compact().take([self._rows[key] for key in keys])
+
+    def similarity_matrix(self, keys_a: Sequence[str], keys_b: Sequence[str]) -> np.ndarray:
+        """Cosine similarities of stored vectors, scored against the compact rows of ``keys_b``"""
+        return self.codec.similarity(self.codec.decode(self.take(keys_a)), self.take(keys_b))
+
+    def similarity(self, key_a: str, key_b: str) -> float:
+        return float(self.similarity_matrix([key_a], [key_b])[0, 0])
+
+    @property
+    def nbytes(self) -> int:
+        return self.compact().nbytes
+
+
+def recall_report(codec: VectorCodec, vectors: np.ndarray, queries: Optional[np.ndarray] = None,
+                  k: int = 10) -> Dict:
+    """
+    Nearest-neighbour recall and score error of ``codec`` against float32
+
+    Args:
+        codec: Storage mode to evaluate
+        vectors: float32 vectors to store (e.g. the taxonomy embeddings)
+        queries: Query vectors (default: ``vectors`` themselves, excluding self-matches)
+        k: Neighbours compared per query
+
+    Returns:
+        recall@k, mean and max absolute score error, and bytes per stored vector
+    """
+    vectors = l2_normalize(vectors)
+    self_queries = queries is None
+    queries = vectors if self_queries else l2_normalize(queries)
+    k = min(k, len(vectors) - (1 if self_queries else 0))
+
+    compact = codec.encode(vectors)
+    exact = queries @ vectors.T
+    approx = codec.similarity(queries, compact)
+    error = np.abs(exact - approx)
+    if self_queries:
+        np.fill_diagonal(exact, -np.inf)
+        np.fill_diagonal(approx, -np.inf)
+
+    exact_top = np.argpartition(-exact, k - 1, axis=1)[:, :k]
+    approx_top = np.argpartition(-approx, k - 1, axis=1)[:, :k]
+    overlap = [len(set(a) & set(b)) for a, b in zip(exact_top, approx_top)]
+
+    float32_bytes = vectors.shape[1] * 4
+    stored_bytes = compact.nbytes / len(compact)
+    report = {
+        'storage': codec.name,
+        'n_vectors': len(vectors),
+        'k': k,
+        'recall_at_k': float(np.mean(overlap)) / k if k else 1.0,
+        'mean_abs_score_error': float(error.mean()),
+        'max_abs_score_error': float(error.max()),
+        'bytes_per_vector': stored_bytes,
+        'float32_bytes_per_vector': float32_bytes,
+        'compression': float32_bytes / stored_bytes if stored_bytes else 0.0,
+    }
+    if isinstance(codec, PCACodec):
+        report['explained_variance'] = codec.explained_variance_ratio(vectors)
+    return report
+
+
+_codecs: Dict[tuple, VectorCodec] = {}
+_codecs_lock = threading.Lock()
+
+
+def storage_mode() -> str:
+    """Configured storage mode (SKILLGAP_EMBEDDING_STORAGE, default float32)"""
+    mode = os.environ.get("SKILLGAP_EMBEDDING_STORAGE", "float32")
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"Unknown embedding storage mode: {mode}")
+    return mode
+
+
+def get_storage_codec(mode: Optional[str] = None, encoder=None,
+                      n_components: Optional[int] = None) -> VectorCodec:
+    """
+    Return the process-wide codec for ``mode`` (default: SKILLGAP_EMBEDDING_STORAGE)
+
+    Args:
+        mode: One of STORAGE_MODES
+        encoder: Embedding model; required for ``pca``, whose components are fitted
+            on this model's taxonomy embeddings and cached on disk
+        n_components: PCA dimensions (default: SKILLGAP_PCA_COMPONENTS or 128)
+    """
+    mode = mode or storage_mode()
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"Unknown embedding storage mode: {mode}")
+    if mode != 'pca':
+        return {'float32': VectorCodec, 'float16': Float16Codec, 'int8': Int8Codec}[mode]()
+    if encoder is None:
+        raise ValueError("PCA storage needs the encoder whose taxonomy embeddings it is fitted on")
+
+    n_components = n_components or int(os.environ.get("SKILLGAP_PCA_COMPONENTS", DEFAULT_PCA_COMPONENTS))
+    model_name = getattr(encoder, 'model_name', type(encoder).__name__)
+    with _codecs_lock:
+        cached = _codecs.get((model_name, n_components))
+        if cached is not None:
+            return cached
+
+        from src.taxonomy_embeddings import get_taxonomy_embeddings
+
+        taxonomy = get_taxonomy_embeddings(encoder, default_terms(), model_name=model_name)
+        key = taxonomy.key[:8]
+        path = os.path.join(get_cache_dir("pca"), f"{taxonomy.key}-{n_components}.npz")
+        codec = PCACodec.load(path, key=key)
+        if codec is None:
+            codec = PCACodec.fit(np.asarray(taxonomy.matrix), n_components, key=key)
+            try:
+                codec.save(path)
+            except OSError as e:
+                print(f"Warning: could not save PCA components: {e}")
+        _codecs[(model_name, n_components)] = codec
+        return codec
+
+
+def taxonomy_recall_report(encoder, modes: Iterable[str] = STORAGE_MODES, k: int = 10) -> List[Dict]:
+    """``recall_report`` of every storage mode on ``encoder``'s taxonomy embeddings"""
+    from src.taxonomy_embeddings import get_taxonomy_embeddings
+
+    vectors = np.asarray(get_taxonomy_embeddings(encoder, default_terms()).matrix)
+    return [recall_report(get_storage_codec(mode, encoder=encoder), vectors, k=k) for mode in modes]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Report recall and size of each embedding storage mode")
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    from src.embedding_registry import get_shared_encoder
+
+    encoder = get_shared_encoder(args.model, owner='compact_storage')
+    for row in taxonomy_recall_report(encoder, k=args.k):
+        print(f"{row['storage']:<16} recall@{row['k']}={row['recall_at_k']:.3f}  "
+              f"score error={row['mean_abs_score_error']:.4f}  "
+              f"{row['bytes_per_vector']:.0f} B/vector ({row['compression']:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Single-pass engine for "experience with X" style context patterns.
+
+The individual patterns are rewritten into one case-insensitive alternation
+with a named group per pattern, so the text is scanned once and each match
+reports which pattern fired. The open-ended ``([\\w\\s...]+)`` capture of each
+pattern is replaced by a bounded window of tokens read inside a lookahead: it
+can never run to the end of a paragraph, and it does not consume text, so a
+trigger inside one window ("... and experienced with Go") is still found.
+"""
+
+import re
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+# The capture every skill pattern ends with, as written in the pattern lists
+SKILL_CAPTURE = r'([\w\s\+\#\.\-]+)'
+
+# Separators that split a capture into independent skill mentions
+_SEGMENT_SPLIT = re.compile(r'\s*(?:[,;&]|\band\b|\bor\b|\bas well as\b)\s*', re.IGNORECASE)
+_TOKEN = r'[\w\+\#\.\-/]+'
+_STRIP_CHARS = '.-'
+
+
+def _uncapture(pattern: str) -> str:
+    """Turn every capturing group in ``pattern`` into a non-capturing one"""
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if char == '(' and not pattern.startswith('?', i + 1):
+            out.append('(?:')
+        else:
+            out.append(char)
+        i += 1
+    return ''.join(out)
+
+
+class ContextPatternEngine:
+    """Compiled alternation of skill context patterns with bounded captures"""
+
+    def __init__(self, patterns: Sequence[str], max_tokens: int = 8):
+        """
+        Args:
+            patterns: Regexes containing exactly one ``SKILL_CAPTURE`` group
+            max_tokens: Longest capture considered, in whitespace-separated tokens
+        """
+        self.patterns = list(patterns)
+        self.max_tokens = max_tokens
+
+        window = rf'{_TOKEN}(?:(?:\s*[,;&]\s*|[ \t]+){_TOKEN}){{0,{max_tokens - 1}}}'
+        alternatives = []
+        for i, pattern in enumerate(self.patterns):
+            if SKILL_CAPTURE not in pattern:
+                raise ValueError(f"Context pattern has no skill capture: {pattern}")
+            head, tail = pattern.split(SKILL_CAPTURE, 1)
+            alternatives.append(
+                rf'(?P<p{i}>\b{_uncapture(head)}(?=(?P<c{i}>{window}){_uncapture(tail)}))'
+            )
+        self.regex = re.compile('|'.join(alternatives), re.IGNORECASE)
+
+    def iter_captures(self, text: str) -> Iterator[Tuple[int, str, int]]:
+        """Yield (pattern index, captured text, capture start) for every trigger in ``text``"""
+        for match in self.regex.finditer(text):
+            index = int(match.lastgroup[1:])
+            group = f'c{index}'
+            yield index, match.group(group), match.start(group)
+
+    def extract(self, text: str, lookup: Callable[[str], Optional[str]]) -> List[Tuple[str, int]]:
+        """
+        Resolve every capture to known skills
+
+        Each capture is split on commas, "and", "or", "&" ..., and for each segment
+        the longest token prefix that ``lookup`` recognises is reported, so
+        "experience with Python and Docker" yields both skills.
+
+        Args:
+            text: Text to scan
+            lookup: Returns the canonical skill for a candidate string, or None
+
+        Returns:
+            (skill, pattern index) pairs in text order
+        """
+        found = []
+        for index, capture, _ in self.iter_captures(text):
+            for segment in _SEGMENT_SPLIT.split(capture):
+                tokens = segment.split()
+                for size in range(len(tokens), 0, -1):
+                    candidate = ' '.join(tokens[:size])
+                    skill = lookup(candidate) or lookup(candidate.rstrip(_STRIP_CHARS))
+                    if skill:
+                        found.append((skill, index))
+                        break
+        return found
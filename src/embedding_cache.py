@@ -0,0 +1,351 @@
+"""
+Shared two-tier cache of text embeddings.
+
+Entries are keyed on (model name, normalised text). The memory tier is an LRU
+bounded by the bytes its vectors occupy; behind it sits a SQLite database in
+WAL mode under the cache directory, so every process on the machine - and
+every Streamlit rerun - reuses vectors that were computed once. Skill strings
+such as "Python" or "SQL" are then encoded once per model, not once per call.
+Both tiers hold vectors in the configured compact storage mode (see
+``src.compact_storage``); each mode has its own rows on disk.
+
+Usage:
+    python -m src.embedding_cache warm [--model all-MiniLM-L6-v2]
+    python -m src.embedding_cache stats [--model all-MiniLM-L6-v2]
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.batch_encoding import dedupe, encode_texts, ensure_calibrated
+from src.cache_paths import get_cache_dir
+from src.compact_storage import CompactVectors, VectorCodec, get_storage_codec, storage_mode
+from src.skill_taxonomy import default_terms
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_SQL_BATCH = 500
+
+
+def normalize_text(text: str, case_sensitive: bool = False) -> str:
+    """Cache key form of ``text``: whitespace collapsed and, by default, casefolded"""
+    text = " ".join(text.split())
+    return text if case_sensitive else text.casefold()
+
+
+class EmbeddingCache:
+    """Byte-bounded LRU of embeddings for one model, backed by a shared SQLite file"""
+
+    def __init__(self, model_name: str, max_bytes: int = DEFAULT_MAX_BYTES, disk: bool = True,
+                 db_path: Optional[str] = None, case_sensitive: bool = False,
+                 codec: Optional[VectorCodec] = None):
+        """
+        Args:
+            model_name: Model the vectors belong to; part of every key
+            max_bytes: Memory budget for cached vectors before LRU eviction
+            disk: Also read and write the SQLite tier
+            db_path: SQLite file (default ``embeddings.sqlite`` under the cache root)
+            case_sensitive: Keep case in keys; the default suits uncased models
+                such as all-MiniLM-L6-v2
+            codec: Storage mode of the cached vectors (default float32)
+        """
+        self.model_name = model_name
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.db_path = db_path or os.path.join(get_cache_dir("embeddings"), "embeddings.sqlite")
+        self.case_sensitive = case_sensitive
+        self.codec = codec or VectorCodec()
+        # Rows on disk are namespaced per storage mode so modes never mix
+        self.namespace = model_name if self.codec.name == 'float32' else f"{model_name}#{self.codec.name}"
+
+        self._entries: "OrderedDict[str, CompactVectors]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # --- Dict-style access ---
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, text: str) -> bool:
+        return self.get(text) is not None
+
+    def __getitem__(self, text: str) -> np.ndarray:
+        vector = self.get(text)
+        if vector is None:
+            raise KeyError(text)
+        return vector
+
+    def __setitem__(self, text: str, vector: np.ndarray) -> None:
+        self.put(text, vector)
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        return self.get_many([text])[0]
+
+    def put(self, text: str, vector: np.ndarray) -> None:
+        self.put_many([text], [vector])
+
+    # --- Batch access ---
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up several texts at once; memory misses cost one SQLite query per 500 keys
+
+        Returns:
+            One vector (or None) per input text, in input order
+        """
+        keys = [self._key(text) for text in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(keys)
+        missing: Dict[str, List[int]] = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    results[i] = self.codec.decode(entry)[0]
+                    self.hits += 1
+                else:
+                    missing.setdefault(key, []).append(i)
+
+        if missing and self.disk:
+            found = self._read_disk(list(missing))
+            with self._lock:
+                for key, entry in found.items():
+                    self._store(key, entry)
+                    vector = self.codec.decode(entry)[0]
+                    for i in missing.pop(key):
+                        results[i] = vector
+                        self.disk_hits += 1
+
+        with self._lock:
+            self.misses += sum(len(indices) for indices in missing.values())
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors: Iterable[np.ndarray]) -> np.ndarray:
+        """
+        Store vectors for ``texts`` in memory and, in one transaction, on disk
+
+        Returns:
+            The vectors as stored (decoded from the compact form), one row per text
+        """
+        keys = [self._key(text) for text in texts]
+        rows = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(keys, vectors)}
+        if not rows:
+            return np.zeros((0, 0), dtype=np.float32)
+        compact = self.codec.encode(np.stack(list(rows.values())))
+        items = {key: compact.take([i]) for i, key in enumerate(rows)}
+        with self._lock:
+            for key, vector in items.items():
+                self._store(key, vector)
+        if self.disk:
+            self._write_disk(items)
+        positions = {key: i for i, key in enumerate(rows)}
+        return self.codec.decode(compact)[[positions[key] for key in keys]]
+
+    def encode(self, encoder, texts: Sequence[str], show_progress: bool = False) -> np.ndarray:
+        """
+        Embeddings for ``texts`` in input order, encoding only strings not cached yet
+
+        Args:
+            encoder: Model with a SentenceTransformer-style ``encode``
+            texts: Strings to embed; each distinct string is looked up once
+            show_progress: Report encoding progress
+
+        Returns:
+            float32 matrix with one row per input text
+        """
+        unique, inverse = dedupe(texts)
+        vectors = self.get_many(unique)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            missing_texts = [unique[i] for i in missing]
+            new_vectors = encode_texts(encoder, missing_texts, show_progress=show_progress)
+            # Return the stored form so a string scores the same on its first and later lookups
+            new_vectors = self.put_many(missing_texts, new_vectors)
+            for i, vector in zip(missing, new_vectors):
+                vectors[i] = vector
+        embeddings = np.stack(vectors).astype(np.float32, copy=False)
+        return embeddings if len(unique) == len(texts) else embeddings[inverse]
+
+    def clear(self, disk: bool = False) -> None:
+        """Drop the in-memory entries (and this model's rows on disk if ``disk``)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.disk_hits = self.misses = 0
+        if disk and self.disk:
+            self._execute("DELETE FROM embeddings WHERE model = ?", (self.namespace,))
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'model': self.model_name,
+            'storage': self.codec.name,
+            'entries': len(self._entries),
+            'memory_bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            'disk_enabled': self.disk,
+            'disk_entries': self.disk_entries() if self.disk else 0,
+        }
+
+    def disk_entries(self) -> int:
+        rows = self._execute("SELECT COUNT(*) FROM embeddings WHERE model = ?", (self.namespace,))
+        return rows[0][0] if rows else 0
+
+    def warm_from_taxonomy(self, encoder, skills: Optional[Sequence[str]] = None,
+                           batch_size: Optional[int] = None) -> int:
+        """
+        Encode every taxonomy skill that is not cached yet
+
+        Args:
+            encoder: Model with a SentenceTransformer-style ``encode``
+            skills: Strings to warm (default: names, abbreviations and variations
+                from the skill database)
+            batch_size: Encoding batch size (default: the calibrated size)
+
+        Returns:
+            Number of newly encoded strings
+        """
+        if skills is None:
+            skills = default_terms()
+        unique = list({self._key(skill): skill for skill in skills}.values())
+        missing = [skill for skill, vector in zip(unique, self.get_many(unique)) if vector is None]
+        for start in range(0, len(missing), 1024):
+            chunk = missing[start:start + 1024]
+            self.put_many(chunk, encode_texts(encoder, chunk, batch_size=batch_size))
+        return len(missing)
+
+    # --- Internals ---
+    def _key(self, text: str) -> str:
+        return normalize_text(text, self.case_sensitive)
+
+    def _store(self, key: str, entry: CompactVectors) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes + len(key)
+        self._entries[key] = entry
+        self._bytes += entry.nbytes + len(key)
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            old_key, old_entry = self._entries.popitem(last=False)
+            self._bytes -= old_entry.nbytes + len(old_key)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            # WAL lets readers in other processes proceed while one process writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, text TEXT NOT NULL, dim INTEGER NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, text)) WITHOUT ROWID"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _execute(self, sql: str, params: Sequence = ()) -> List:
+        try:
+            with self._db_lock:
+                conn = self._connection()
+                with conn:
+                    return conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            print(f"Warning: embedding cache database error: {e}")
+            return []
+
+    def _read_disk(self, keys: List[str]) -> Dict[str, CompactVectors]:
+        found = {}
+        for start in range(0, len(keys), _SQL_BATCH):
+            chunk = keys[start:start + _SQL_BATCH]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._execute(
+                f"SELECT text, dim, vector FROM embeddings WHERE model = ? AND text IN ({placeholders})",
+                [self.namespace, *chunk]
+            )
+            for text, dim, blob in rows:
+                try:
+                    entry = self.codec.from_row_bytes(blob)
+                except ValueError:
+                    continue
+                if entry.data.size == dim:
+                    found[text] = entry
+        return found
+
+    def _write_disk(self, items: Dict[str, CompactVectors]) -> None:
+        rows = [(self.namespace, key, int(entry.data.size), self.codec.row_bytes(entry, 0))
+                for key, entry in items.items()]
+        try:
+            with self._db_lock:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (model, text, dim, vector) VALUES (?, ?, ?, ?)", rows
+                    )
+        except sqlite3.Error as e:
+            print(f"Warning: could not write embedding cache entries: {e}")
+
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name: str, encoder=None) -> EmbeddingCache:
+    """
+    Return the process-wide embedding cache for ``model_name``
+
+    SKILLGAP_EMBEDDING_CACHE_MB sets the memory budget (default 64),
+    SKILLGAP_EMBEDDING_CACHE_DISK=0 turns the SQLite tier off and
+    SKILLGAP_EMBEDDING_STORAGE picks the storage mode. ``encoder`` (the model
+    behind ``model_name``) is needed only to fit the ``pca`` mode.
+    """
+    with _caches_lock:
+        cache = _caches.get(model_name)
+        if cache is None:
+            max_mb = float(os.environ.get("SKILLGAP_EMBEDDING_CACHE_MB", DEFAULT_MAX_BYTES / (1024 * 1024)))
+            disk = os.environ.get("SKILLGAP_EMBEDDING_CACHE_DISK", "1") == "1"
+            cache = EmbeddingCache(model_name, max_bytes=int(max_mb * 1024 * 1024), disk=disk,
+                                   codec=get_storage_codec(encoder=encoder))
+            _caches[model_name] = cache
+        return cache
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage the shared embedding cache")
+    parser.add_argument('command', choices=['warm', 'stats', 'clear'])
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--batch-size', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    encoder = None
+    if args.command == 'warm' or storage_mode() == 'pca':
+        from src.embedding_registry import get_shared_encoder
+
+        encoder = get_shared_encoder(args.model, owner='embedding_cache')
+    cache = get_embedding_cache(args.model, encoder=encoder)
+    if args.command == 'warm':
+        batch_size = args.batch_size or ensure_calibrated(encoder)
+        print(f"Encode batch size for {args.model}: {batch_size}")
+        added = cache.warm_from_taxonomy(encoder, batch_size=args.batch_size)
+        print(f"Encoded {added} new taxonomy strings for {args.model}")
+    elif args.command == 'clear':
+        cache.clear(disk=True)
+        print(f"Cleared cached embeddings for {args.model}")
+    for name, value in cache.stats().items():
+        print(f"{name}: {value}")
+
+
+if __name__ == '__main__':
+    main()
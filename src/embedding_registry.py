@@ -0,0 +1,271 @@
+"""
+Shared embedding-model registry.
+
+Every Sentence-BERT consumer (askill_ext extractor and analyzer, the BERT
+embedder, gap_analysys.SentenceBERTEncoder and the chatbot vector database)
+asks this registry for its model instead of constructing a SentenceTransformer,
+so each model name is resident at most once per process.
+
+Setting SKILLGAP_QUANTIZE_EMBEDDINGS=1 (or passing ``quantized=True``) loads
+the int8 variant instead: PyTorch dynamic quantisation of every ``nn.Linear``
+in the transformer, which is markedly faster on CPU-only hosts. The variant is
+part of the encoder's ``model_name`` ("all-MiniLM-L6-v2@int8"), so caches keyed
+on it never mix fp32 and int8 vectors. ``quantization_report`` measures the
+cosine drift against fp32 on the skill taxonomy and the throughput of both.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.batch_encoding import register_calibration
+from src.resource_manager import ResourceManager, get_resource_manager
+from src.skill_taxonomy import default_terms
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+QUANTIZED_VARIANT = 'int8'
+
+
+def quantization_enabled() -> bool:
+    """Whether encoders default to the int8 variant (SKILLGAP_QUANTIZE_EMBEDDINGS=1)"""
+    return os.environ.get("SKILLGAP_QUANTIZE_EMBEDDINGS", "0") == "1"
+
+
+def shared_model_name(model_name: str = DEFAULT_MODEL_NAME, quantized: Optional[bool] = None) -> str:
+    """``model_name`` of the encoder ``get_shared_encoder`` would return, without loading it"""
+    if quantized is None:
+        quantized = quantization_enabled()
+    return f"{model_name}@{QUANTIZED_VARIANT}" if quantized else model_name
+
+
+class SharedEncoder:
+    """Thread-safe handle around a single loaded SentenceTransformer"""
+
+    def __init__(self, model_name: str, model, variant: str = 'fp32'):
+        self.base_model_name = model_name
+        self.variant = variant
+        self.model_name = model_name if variant == 'fp32' else f"{model_name}@{variant}"
+        self.model = model
+        self.encode_calls = 0
+        self.encoded_texts = 0
+        self._lock = threading.Lock()
+
+    def encode(self, sentences, **kwargs):
+        """Same signature as ``SentenceTransformer.encode``, serialised per model"""
+        with self._lock:
+            self.encode_calls += 1
+            self.encoded_texts += 1 if isinstance(sentences, str) else len(sentences)
+            return self.model.encode(sentences, **kwargs)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    @property
+    def max_seq_length(self) -> int:
+        return self.model.max_seq_length
+
+    @property
+    def tokenizer(self):
+        return self.model.tokenizer
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the model's weights, including packed int8 weights"""
+        total = 0
+        for value in self.model.state_dict().values():
+            # Quantised linear layers store a (weight, bias) tuple of packed params
+            tensors = value if isinstance(value, tuple) else (value,)
+            total += sum(t.numel() * t.element_size() for t in tensors if hasattr(t, 'element_size'))
+        return total
+
+    def parameter_count(self) -> int:
+        return sum(p.numel() for p in self.model.parameters())
+
+
+class EmbeddingModelRegistry:
+    """Hands out one SharedEncoder per model name, backed by the resource manager"""
+
+    RESOURCE_PREFIX = 'embedding_model:'
+
+    def __init__(self, manager: Optional[ResourceManager] = None):
+        self.manager = manager or get_resource_manager()
+
+    def get(self, model_name: str = DEFAULT_MODEL_NAME, owner: str = 'anonymous',
+            quantized: Optional[bool] = None) -> SharedEncoder:
+        """
+        Return the shared encoder for ``model_name``, loading it on first use
+
+        Loading also registers the model's batch-size calibration with the
+        resource manager, so ``warmup`` measures it instead of the first request.
+
+        Args:
+            quantized: Load the int8 variant (default: SKILLGAP_QUANTIZE_EMBEDDINGS)
+        """
+        if quantized is None:
+            quantized = quantization_enabled()
+        encoder = self.manager.get_or_create(
+            self._resource_name(model_name, quantized),
+            lambda: self._load(model_name, quantized),
+            kind='embedding_model',
+            owner=owner
+        )
+        register_calibration(encoder, self.manager)
+        return encoder
+
+    def release(self, model_name: str, owner: str = 'anonymous', unload_when_unused: bool = False,
+                quantized: Optional[bool] = None) -> int:
+        if quantized is None:
+            quantized = quantization_enabled()
+        return self.manager.release(self._resource_name(model_name, quantized), owner=owner,
+                                    unload_when_unused=unload_when_unused)
+
+    def resident_models(self) -> List[str]:
+        """Names of embedding models currently loaded in this process"""
+        return [entry['name'][len(self.RESOURCE_PREFIX):] for entry in self._entries() if entry['loaded']]
+
+    def memory_report(self) -> List[Dict]:
+        """
+        Describe every registered embedding model
+
+        Returns:
+            One dict per model with residency, holders, load time and weight size
+        """
+        report = []
+        for entry in self._entries():
+            model_name = entry['name'][len(self.RESOURCE_PREFIX):]
+            row = {
+                'model_name': model_name,
+                'resident': entry['loaded'],
+                'holders': entry['holders'],
+                'ref_count': entry['ref_count'],
+                'load_time': entry['load_time'],
+                'parameters': 0,
+                'memory_mb': 0.0,
+                'encode_calls': 0
+            }
+            if entry['loaded']:
+                encoder = self.manager.get(entry['name'])
+                row['parameters'] = encoder.parameter_count()
+                row['memory_mb'] = encoder.memory_bytes() / (1024 * 1024)
+                row['encode_calls'] = encoder.encode_calls
+            report.append(row)
+        return report
+
+    def total_memory_mb(self) -> float:
+        return sum(row['memory_mb'] for row in self.memory_report())
+
+    def _entries(self) -> List[Dict]:
+        return [entry for entry in self.manager.load_report()
+                if entry['name'].startswith(self.RESOURCE_PREFIX)]
+
+    def quantization_report(self, model_name: str = DEFAULT_MODEL_NAME,
+                            texts: Optional[Sequence[str]] = None, batch_size: int = 64) -> Dict:
+        """
+        Compare the int8 variant of ``model_name`` with fp32
+
+        Args:
+            model_name: Model to check
+            texts: Strings to encode (default: the skill taxonomy terms)
+            batch_size: Encoding batch size for both variants
+
+        Returns:
+            Cosine drift between the two embeddings of each text (mean, min, 5th
+            percentile and the worst texts), how often both variants agree on each
+            text's nearest neighbour, and throughput and weight size of both
+        """
+        if texts is None:
+            texts = default_terms()
+        texts = list(texts)
+        owner = 'quantization_report'
+        fp32 = self.get(model_name, owner=owner, quantized=False)
+        int8 = self.get(model_name, owner=owner, quantized=True)
+        try:
+            fp32_vectors, fp32_rate = self._timed_encode(fp32, texts, batch_size)
+            int8_vectors, int8_rate = self._timed_encode(int8, texts, batch_size)
+            fp32_memory, int8_memory = fp32.memory_bytes(), int8.memory_bytes()
+        finally:
+            self.release(model_name, owner=owner, unload_when_unused=True, quantized=False)
+            self.release(model_name, owner=owner, unload_when_unused=True, quantized=True)
+
+        cosine = (fp32_vectors * int8_vectors).sum(axis=1)
+        worst = np.argsort(cosine)[:5]
+        return {
+            'model_name': model_name,
+            'n_texts': len(texts),
+            'mean_cosine': float(cosine.mean()),
+            'min_cosine': float(cosine.min()),
+            'p5_cosine': float(np.percentile(cosine, 5)),
+            'worst_texts': [(texts[i], float(cosine[i])) for i in worst],
+            'neighbour_agreement': self._neighbour_agreement(fp32_vectors, int8_vectors),
+            'fp32_texts_per_sec': fp32_rate,
+            'int8_texts_per_sec': int8_rate,
+            'speedup': int8_rate / fp32_rate if fp32_rate else 0.0,
+            'fp32_memory_mb': fp32_memory / (1024 * 1024),
+            'int8_memory_mb': int8_memory / (1024 * 1024),
+        }
+
+    @staticmethod
+    def _timed_encode(encoder: SharedEncoder, texts: List[str], batch_size: int):
+        """Unit-length embeddings of ``texts`` and the throughput in texts per second"""
+        encoder.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+        start = time.perf_counter()
+        vectors = np.asarray(encoder.encode(texts, batch_size=batch_size), dtype=np.float32)
+        elapsed = time.perf_counter() - start
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms, (len(texts) / elapsed if elapsed > 0 else float('inf'))
+
+    @staticmethod
+    def _neighbour_agreement(a: np.ndarray, b: np.ndarray, chunk: int = 1024) -> float:
+        """Share of rows whose nearest other row is the same under both embeddings"""
+        if len(a) < 2:
+            return 1.0
+        agree = 0
+        for start in range(0, len(a), chunk):
+            rows = np.arange(start, min(start + chunk, len(a)))
+            sim_a, sim_b = a[rows] @ a.T, b[rows] @ b.T
+            sim_a[np.arange(len(rows)), rows] = -np.inf
+            sim_b[np.arange(len(rows)), rows] = -np.inf
+            agree += int((sim_a.argmax(axis=1) == sim_b.argmax(axis=1)).sum())
+        return agree / len(a)
+
+    def _resource_name(self, model_name: str, quantized: bool = False) -> str:
+        suffix = f"@{QUANTIZED_VARIANT}" if quantized else ""
+        return f"{self.RESOURCE_PREFIX}{model_name}{suffix}"
+
+    @staticmethod
+    def _load(model_name: str, quantized: bool = False) -> SharedEncoder:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(model_name, device='cpu' if quantized else None)
+        if not quantized:
+            return SharedEncoder(model_name, model)
+
+        import torch
+        try:
+            from torch.ao.quantization import quantize_dynamic
+        except ImportError:
+            from torch.quantization import quantize_dynamic
+        model = quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return SharedEncoder(model_name, model, variant=QUANTIZED_VARIANT)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_embedding_registry() -> EmbeddingModelRegistry:
+    """Return the process-wide embedding model registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = EmbeddingModelRegistry()
+    return _registry
+
+
+def get_shared_encoder(model_name: str = DEFAULT_MODEL_NAME, owner: str = 'anonymous',
+                       quantized: Optional[bool] = None) -> SharedEncoder:
+    """Shortcut for ``get_embedding_registry().get(model_name, owner, quantized)``"""
+    return get_embedding_registry().get(model_name, owner=owner, quantized=quantized)
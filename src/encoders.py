@@ -0,0 +1,282 @@
+"""
+Interchangeable skill encoders.
+
+Every analyzer only needs ``encode_skills(skills, use_cache, show_progress)``
+returning one row per skill, plus ``model_name`` and ``embedding_dimension``
+(the ``SkillEncoder`` protocol, which ``gap_analysys.SentenceBERTEncoder`` also
+satisfies). Three backends implement it:
+
+- ``transformer``: the shared Sentence-BERT model behind the embedding cache;
+- ``hashing``: signed feature hashing of character n-grams, numpy only, no
+  fitting and no model download - for bulk screening and offline tests;
+- ``tfidf``: character n-gram TF-IDF fitted once to the skill taxonomy.
+
+Backends also expose a SentenceTransformer-style ``encode``, so they plug into
+the taxonomy matrix, embedding cache and candidate index unchanged, and count
+their own throughput. ``benchmark_encoder`` measures any of them.
+
+Usage:
+    python -m src.encoders [--backends transformer hashing tfidf]
+"""
+
+import argparse
+import hashlib
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from src.batch_encoding import dedupe, encode_texts
+from src.embedding_cache import get_embedding_cache
+from src.embedding_registry import DEFAULT_MODEL_NAME, get_shared_encoder
+from src.skill_taxonomy import default_terms
+from src.taxonomy_embeddings import l2_normalize
+
+BACKENDS = ('transformer', 'hashing', 'tfidf')
+
+
+class SkillEncoder(Protocol):
+    """What an analyzer needs from an encoder"""
+
+    model_name: str
+    embedding_dimension: int
+
+    def encode_skills(self, skills: List[str], use_cache: bool = True,
+                      show_progress: bool = False) -> np.ndarray:
+        ...
+
+
+class BaseSkillEncoder(ABC):
+    """Deduplicating, unit-length ``encode_skills`` with throughput counters"""
+
+    model_name = 'base'
+    embedding_dimension = 0
+
+    def __init__(self):
+        self.encoded_texts = 0
+        self.encode_seconds = 0.0
+        self._stats_lock = threading.Lock()
+
+    def encode_skills(self, skills: List[str], use_cache: bool = True,
+                      show_progress: bool = False) -> np.ndarray:
+        """
+        Encode skills into unit-length float32 rows, one per input
+
+        Args:
+            skills: Skill strings; duplicates are encoded once
+            use_cache: Reuse cached vectors where the backend keeps a cache
+            show_progress: Report progress where the backend supports it
+        """
+        if not skills:
+            raise ValueError("Skills list cannot be empty")
+        start = time.perf_counter()
+        unique, inverse = dedupe(skills)
+        vectors = l2_normalize(self._encode(unique, use_cache=use_cache, show_progress=show_progress))
+        with self._stats_lock:
+            self.encoded_texts += len(skills)
+            self.encode_seconds += time.perf_counter() - start
+        return vectors if len(unique) == len(skills) else vectors[inverse]
+
+    def encode(self, sentences, batch_size: Optional[int] = None, **kwargs) -> np.ndarray:
+        """SentenceTransformer-style entry point (``batch_size`` and other options are ignored)"""
+        single = isinstance(sentences, str)
+        sentences = [sentences] if single else list(sentences)
+        if not sentences:
+            # Like SentenceTransformer.encode([]): an empty batch, not an error
+            return np.zeros((0, self.embedding_dimension), dtype=np.float32)
+        vectors = self.encode_skills(sentences, use_cache=False)
+        return vectors[0] if single else vectors
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.embedding_dimension
+
+    def throughput(self) -> float:
+        """Texts encoded per second so far in this process"""
+        return self.encoded_texts / self.encode_seconds if self.encode_seconds else 0.0
+
+    def stats(self) -> Dict:
+        return {
+            'model_name': self.model_name,
+            'dimension': self.embedding_dimension,
+            'encoded_texts': self.encoded_texts,
+            'encode_seconds': self.encode_seconds,
+            'texts_per_sec': self.throughput(),
+        }
+
+    @abstractmethod
+    def _encode(self, texts: List[str], use_cache: bool, show_progress: bool) -> np.ndarray:
+        """Raw (not yet normalised) vectors for unique ``texts``, one row each"""
+
+
+class TransformerEncoder(BaseSkillEncoder):
+    """Sentence-BERT from the shared registry, behind the shared embedding cache"""
+
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, quantized: Optional[bool] = None):
+        super().__init__()
+        self.model = get_shared_encoder(model_name, owner='TransformerEncoder', quantized=quantized)
+        self.model_name = self.model.model_name
+        self.embedding_dimension = self.model.get_sentence_embedding_dimension()
+        self.embedding_cache = get_embedding_cache(self.model_name, encoder=self.model)
+
+    def _encode(self, texts: List[str], use_cache: bool, show_progress: bool) -> np.ndarray:
+        if use_cache:
+            return self.embedding_cache.encode(self.model, texts, show_progress=show_progress)
+        return encode_texts(self.model, texts, show_progress=show_progress)
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int] = (2, 4)) -> List[str]:
+    """Character n-grams of each word padded with spaces, like scikit-learn's ``char_wb``"""
+    low, high = ngram_range
+    grams = []
+    for word in text.split():
+        padded = f" {word} "
+        for n in range(low, high + 1):
+            grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+class HashingEncoder(BaseSkillEncoder):
+    """Signed feature hashing of character n-grams; needs nothing but numpy"""
+
+    def __init__(self, n_features: int = 2048, ngram_range: Tuple[int, int] = (2, 4),
+                 lowercase: bool = True):
+        """
+        Args:
+            n_features: Output dimension (hash buckets)
+            ngram_range: Smallest and largest n-gram length
+            lowercase: Casefold before extracting n-grams
+        """
+        super().__init__()
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.lowercase = lowercase
+        self.model_name = f"hashing-{n_features}-char{ngram_range[0]}{ngram_range[1]}"
+        self.embedding_dimension = n_features
+
+    def _encode(self, texts: List[str], use_cache: bool, show_progress: bool) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            if self.lowercase:
+                text = text.casefold()
+            for gram in char_ngrams(text, self.ngram_range):
+                # crc32 is stable across processes, unlike hash()
+                digest = zlib.crc32(gram.encode('utf-8'))
+                vectors[row, digest % self.n_features] += -1.0 if digest & 0x80000000 else 1.0
+        return vectors
+
+
+class TfidfEncoder(BaseSkillEncoder):
+    """Character n-gram TF-IDF fitted to the skill taxonomy"""
+
+    def __init__(self, vocabulary: Optional[Sequence[str]] = None, ngram_range: Tuple[int, int] = (2, 4)):
+        """
+        Args:
+            vocabulary: Texts to fit on (default: the skill taxonomy terms); n-grams
+                never seen in them do not contribute
+            ngram_range: Smallest and largest n-gram length
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        super().__init__()
+        if vocabulary is None:
+            vocabulary = default_terms()
+        vocabulary = list(vocabulary)
+        self.vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=ngram_range, dtype=np.float32)
+        self.vectorizer.fit(vocabulary)
+        digest = hashlib.sha1("\n".join(vocabulary).encode('utf-8')).hexdigest()[:12]
+        self.model_name = f"tfidf-char{ngram_range[0]}{ngram_range[1]}-{digest}"
+        self.embedding_dimension = len(self.vectorizer.vocabulary_)
+
+    def _encode(self, texts: List[str], use_cache: bool, show_progress: bool) -> np.ndarray:
+        return self.vectorizer.transform(texts).toarray()
+
+
+_ENCODER_CLASSES = {
+    'transformer': TransformerEncoder,
+    'hashing': HashingEncoder,
+    'tfidf': TfidfEncoder,
+}
+_encoders: Dict[Tuple, BaseSkillEncoder] = {}
+_encoders_lock = threading.Lock()
+
+
+def get_encoder(backend: str = 'transformer', **kwargs) -> BaseSkillEncoder:
+    """
+    Return the process-wide encoder for ``backend`` (one of BACKENDS)
+
+    Keyword arguments go to the backend's constructor; each distinct set of
+    arguments gets its own instance.
+    """
+    if backend not in _ENCODER_CLASSES:
+        raise ValueError(f"Unknown encoder backend: {backend}")
+    key = (backend, tuple(sorted(kwargs.items())))
+    with _encoders_lock:
+        encoder = _encoders.get(key)
+        if encoder is None:
+            encoder = _ENCODER_CLASSES[backend](**kwargs)
+            _encoders[key] = encoder
+        return encoder
+
+
+def benchmark_encoder(encoder: SkillEncoder, texts: Optional[Sequence[str]] = None,
+                      repeats: int = 3) -> Dict:
+    """
+    Measure an encoder's uncached throughput
+
+    Args:
+        encoder: Any ``SkillEncoder``
+        texts: Strings to encode (default: the skill taxonomy terms)
+        repeats: Timed runs; the fastest counts
+
+    Returns:
+        Model name, dimension, number of texts, best time and texts per second
+    """
+    if texts is None:
+        texts = default_terms()
+    texts = list(texts)
+    encoder.encode_skills(texts[:8], use_cache=False)  # warm-up
+
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        encoder.encode_skills(texts, use_cache=False)
+        best = min(best, time.perf_counter() - start)
+    return {
+        'model_name': encoder.model_name,
+        'dimension': encoder.embedding_dimension,
+        'n_texts': len(texts),
+        'seconds': best,
+        'texts_per_sec': len(texts) / best if best > 0 else float('inf'),
+    }
+
+
+def benchmark_backends(backends: Sequence[str] = BACKENDS, texts: Optional[Sequence[str]] = None) -> List[Dict]:
+    """``benchmark_encoder`` for each backend; a backend that cannot load reports its error"""
+    report = []
+    for backend in backends:
+        try:
+            row = benchmark_encoder(get_encoder(backend), texts)
+        except Exception as e:
+            row = {'model_name': backend, 'error': str(e)}
+        report.append({'backend': backend, **row})
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the skill encoder backends")
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    args = parser.parse_args(argv)
+
+    for row in benchmark_backends(args.backends):
+        if 'error' in row:
+            print(f"{row['backend']:<12} unavailable: {row['error']}")
+        else:
+            print(f"{row['backend']:<12} {row['texts_per_sec']:>10.0f} texts/s  "
+                  f"dim={row['dimension']:<6} {row['model_name']}")
+
+
+if __name__ == '__main__':
+    main()
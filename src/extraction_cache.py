@@ -0,0 +1,163 @@
+"""
+Content-addressed cache for skill extraction results.
+
+Results are keyed on a hash of the document text together with everything
+that can change the output: the skill-database version, the enabled methods
+and the model names/settings. A bounded in-memory LRU sits in front of an
+optional on-disk tier (one JSON file per entry under the cache directory), so
+re-running the same resume against many postings, or re-opening it after a
+restart, skips extraction entirely.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from src.cache_paths import get_cache_dir
+
+CACHE_VERSION = 1
+
+
+class ExtractionCache:
+    """Bounded LRU of extraction results with an optional JSON-on-disk tier"""
+
+    def __init__(self, max_entries: int = 512, disk: bool = False):
+        """
+        Args:
+            max_entries: Results kept in memory before the least recently used is evicted
+            disk: Also persist results under the cache directory
+        """
+        self.max_entries = max_entries
+        self.disk = disk
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(text: str, taxonomy_version: str, methods: Iterable[str],
+                 config: Optional[Dict] = None) -> str:
+        """
+        Cache key for one extraction call
+
+        Args:
+            text: Document text
+            taxonomy_version: Version hash of the skill database
+            methods: Enabled extraction methods
+            config: Model names and any setting that affects the output
+        """
+        payload = json.dumps({
+            'v': CACHE_VERSION,
+            'taxonomy': taxonomy_version,
+            'methods': sorted(methods),
+            'config': config or {},
+        }, sort_keys=True, default=str)
+        digest = hashlib.sha256()
+        digest.update(payload.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a copy of the cached result, or None"""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(result)
+
+        result = self._read_disk(key) if self.disk else None
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, result)
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: Dict) -> None:
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._store(key, result)
+        if self.disk:
+            self._write_disk(key, result)
+
+    def clear(self, disk: bool = False) -> None:
+        """Drop the in-memory entries (and the on-disk ones if ``disk``)"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+        if disk:
+            directory = get_cache_dir("extractions")
+            for name in os.listdir(directory):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(directory, name))
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            'disk_enabled': self.disk,
+        }
+
+    def _store(self, key: str, result: Dict) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(get_cache_dir("extractions"), f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, result: Dict) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            # Results that are not JSON-serialisable simply stay memory-only
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            print(f"Warning: could not write extraction cache entry: {e}")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """
+    Return the process-wide extraction cache
+
+    The disk tier is enabled by setting SKILLGAP_EXTRACTION_CACHE_DISK=1.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                disk = os.environ.get("SKILLGAP_EXTRACTION_CACHE_DISK", "0") == "1"
+                _cache = ExtractionCache(disk=disk)
+    return _cache
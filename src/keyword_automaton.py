@@ -0,0 +1,147 @@
+"""
+Aho-Corasick multi-keyword matcher.
+
+Scans a text once, in time linear in its length, and reports every keyword
+occurrence with character offsets. Matching is case-insensitive and, by default,
+only accepts matches on token boundaries, so "R" or "Go" do not fire inside
+"React" or "Google".
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class KeywordAutomaton:
+    """Compiled automaton mapping keywords to one or more values (e.g. canonical skills)"""
+
+    def __init__(self, keywords: Iterable[Tuple[str, str]] = (), word_boundaries: bool = True):
+        """
+        Args:
+            keywords: (keyword, value) pairs; a keyword may map to several values
+            word_boundaries: Only accept matches not flanked by letters, digits or '_'
+        """
+        self.word_boundaries = word_boundaries
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, int]]] = [[]]
+        self._keyword_values: List[List[str]] = []
+        self._keyword_index: Dict[str, int] = {}
+        self._built = False
+
+        for keyword, value in keywords:
+            self.add(keyword, value)
+        self.build()
+
+    def __len__(self) -> int:
+        return len(self._keyword_values)
+
+    def add(self, keyword: str, value: str) -> None:
+        """Add a keyword; call ``build()`` before matching again"""
+        key = keyword.lower()
+        if not key:
+            return
+
+        idx = self._keyword_index.get(key)
+        if idx is not None:
+            if value not in self._keyword_values[idx]:
+                self._keyword_values[idx].append(value)
+            return
+
+        idx = len(self._keyword_values)
+        self._keyword_index[key] = idx
+        self._keyword_values.append([value])
+
+        state = 0
+        for char in key:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append((len(key), idx))
+        self._built = False
+
+    def build(self) -> None:
+        """Compute failure links (breadth-first over the keyword trie)"""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                # Inherit the outputs of the longest proper suffix that is a keyword
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, keyword index) for every, possibly overlapping, occurrence"""
+        if not self._built:
+            self.build()
+
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Some characters expand when lowercased; keep offsets aligned with the input
+            lowered = ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+        goto, fail, output = self._goto, self._fail, self._output
+        n = len(text)
+        state = 0
+        for pos, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, idx in output[state]:
+                start, end = pos + 1 - length, pos + 1
+                if self.word_boundaries:
+                    if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                        continue
+                    if end < n and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+                        continue
+                yield start, end, idx
+
+    def find_all(self, text: str, overlapping: bool = False) -> List[Tuple[str, int, int]]:
+        """
+        Find keyword occurrences in ``text``
+
+        Args:
+            text: Text to scan
+            overlapping: Report every occurrence; otherwise keep the leftmost-longest
+                non-overlapping matches, so "Spring Boot" is not also reported as "Spring"
+
+        Returns:
+            (value, start, end) tuples ordered by start offset
+        """
+        matches = sorted(self.iter_matches(text), key=lambda m: (m[0], -(m[1] - m[0])))
+        if not overlapping:
+            selected = []
+            last_end = -1
+            for start, end, idx in matches:
+                if start >= last_end:
+                    selected.append((start, end, idx))
+                    last_end = end
+            matches = selected
+
+        return [(value, start, end)
+                for start, end, idx in matches
+                for value in self._keyword_values[idx]]
+
+    def find_values(self, text: str, overlapping: bool = False) -> List[str]:
+        """Unique values found in ``text``, in order of first occurrence"""
+        seen = {}
+        for value, _, _ in self.find_all(text, overlapping=overlapping):
+            seen.setdefault(value, None)
+        return list(seen)
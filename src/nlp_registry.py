@@ -0,0 +1,127 @@
+"""
+Lazy, process-wide spaCy pipeline registry.
+
+Nothing here imports spaCy until a pipeline is first requested, so modules that
+only need the file readers or text cleaners never pay for a model load. Each
+model name is loaded once per process and shared by every caller.
+"""
+
+import threading
+from typing import Iterable, List, Optional
+
+from src.resource_manager import ResourceManager, get_resource_manager
+
+DEFAULT_SPACY_MODEL = 'en_core_web_sm'
+
+# Named pipeline profiles, cheapest first: the components each one keeps enabled.
+# Anything else in the loaded pipeline is disabled for that call. The rule-based
+# sentencizer is cheap and kept in every profile so ``doc.sents`` always works.
+_TAGGER = ('tok2vec', 'tagger', 'attribute_ruler', 'lemmatizer')
+PIPELINE_PROFILES = {
+    'tokenizer': ('sentencizer',),
+    'tagger': _TAGGER + ('sentencizer',),
+    'ner': ('tok2vec', 'ner', 'sentencizer'),
+    'tagger_ner': _TAGGER + ('ner', 'sentencizer'),
+    'parser': _TAGGER + ('parser', 'sentencizer'),
+    'full': None,
+}
+
+
+def select_profile(required_components: Iterable[str]) -> str:
+    """
+    Return the cheapest profile that enables every required component
+
+    Args:
+        required_components: Component names such as 'tagger', 'parser' or 'ner'
+    """
+    required = set(required_components)
+    for name, components in PIPELINE_PROFILES.items():
+        if components is None or required.issubset(components):
+            return name
+    return 'full'
+
+
+def profile_disables(nlp, profile: str) -> List[str]:
+    """Names of the pipeline components to disable when running ``profile``"""
+    if profile not in PIPELINE_PROFILES:
+        raise ValueError(f"Unknown pipeline profile: {profile}")
+    enabled = PIPELINE_PROFILES[profile]
+    if enabled is None:
+        return []
+    return [name for name in nlp.pipe_names if name not in enabled]
+
+
+class NLPRegistry:
+    """Hands out shared spaCy ``Language`` objects keyed by model name"""
+
+    RESOURCE_PREFIX = 'spacy:'
+
+    def __init__(self, manager: Optional[ResourceManager] = None):
+        self.manager = manager or get_resource_manager()
+        self._pipe_lock = threading.Lock()
+
+    def get(self, model_name: str = DEFAULT_SPACY_MODEL, owner: str = 'anonymous',
+            add_sentencizer: bool = False):
+        """
+        Return the shared pipeline for ``model_name``
+
+        Args:
+            model_name: Installed spaCy package name or path
+            owner: Name recorded as a holder in the resource manager
+            add_sentencizer: Make sure a rule-based sentencizer is in the pipeline
+
+        Raises:
+            OSError: If the model is not installed
+        """
+        nlp = self.manager.get_or_create(
+            self._resource_name(model_name),
+            lambda: self._load(model_name),
+            kind='spacy_model',
+            owner=owner
+        )
+        if add_sentencizer and 'sentencizer' not in nlp.pipe_names:
+            with self._pipe_lock:
+                if 'sentencizer' not in nlp.pipe_names:
+                    nlp.add_pipe('sentencizer')
+        return nlp
+
+    def is_loaded(self, model_name: str = DEFAULT_SPACY_MODEL) -> bool:
+        return self.manager.is_loaded(self._resource_name(model_name))
+
+    def loaded_models(self) -> List[str]:
+        return [entry['name'][len(self.RESOURCE_PREFIX):] for entry in self.manager.load_report()
+                if entry['name'].startswith(self.RESOURCE_PREFIX) and entry['loaded']]
+
+    def _resource_name(self, model_name: str) -> str:
+        return f"{self.RESOURCE_PREFIX}{model_name}"
+
+    @staticmethod
+    def _load(model_name: str):
+        import spacy
+        try:
+            return spacy.load(model_name)
+        except OSError as e:
+            raise OSError(
+                f"The spaCy model '{model_name}' is not found. "
+                f"Please run: python -m spacy download {model_name}"
+            ) from e
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_nlp_registry() -> NLPRegistry:
+    """Return the process-wide spaCy registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = NLPRegistry()
+    return _registry
+
+
+def get_nlp(model_name: str = DEFAULT_SPACY_MODEL, owner: str = 'anonymous',
+            add_sentencizer: bool = False):
+    """Shortcut for ``get_nlp_registry().get(...)``"""
+    return get_nlp_registry().get(model_name, owner=owner, add_sentencizer=add_sentencizer)
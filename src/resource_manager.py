@@ -0,0 +1,228 @@
+"""
+Process-wide resource manager for models, encoders, matchers and skill databases.
+
+Streamlit reruns the whole app script on every widget interaction, but imported
+modules stay in ``sys.modules`` for the life of the process. Anything held by the
+manager below is therefore loaded once per process and shared by app.py,
+askill_ext.py, gap_analysys.py and chatbot.py instead of once per click.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+
+@dataclass
+class ResourceRecord:
+    """Bookkeeping for a single managed resource"""
+    name: str
+    loader: Callable[[], Any]
+    kind: str = 'resource'
+    resource: Any = None
+    loaded: bool = False
+    holders: Set[str] = field(default_factory=set)
+    load_count: int = 0
+    load_time: float = 0.0
+    loaded_at: Optional[datetime] = None
+    error: Optional[str] = None
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def ref_count(self) -> int:
+        return len(self.holders)
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'loaded': self.loaded,
+            'ref_count': self.ref_count,
+            'holders': sorted(self.holders),
+            'load_count': self.load_count,
+            'load_time': self.load_time,
+            'loaded_at': self.loaded_at.isoformat() if self.loaded_at else None,
+            'error': self.error
+        }
+
+
+class ResourceManager:
+    """Loads named resources lazily, once per process, and tracks who holds them"""
+
+    def __init__(self):
+        self._records: Dict[str, ResourceRecord] = {}
+        self._lock = threading.RLock()
+        self.logger = self._setup_logger()
+
+    def register(self, name: str, loader: Callable[[], Any], kind: str = 'resource',
+                 replace: bool = False) -> None:
+        """
+        Register a loader for a named resource
+
+        Registering an existing name is a no-op unless ``replace`` is set, so
+        modules can register unconditionally at the top of every rerun.
+
+        Args:
+            name: Unique resource name
+            loader: Zero-argument callable that builds the resource
+            kind: Free-form label used in reports (model, encoder, matcher, ...)
+            replace: Drop any loaded instance and use the new loader
+        """
+        with self._lock:
+            if name in self._records and not replace:
+                return
+            self._records[name] = ResourceRecord(name=name, loader=loader, kind=kind)
+
+    def is_registered(self, name: str) -> bool:
+        return name in self._records
+
+    def is_loaded(self, name: str) -> bool:
+        record = self._records.get(name)
+        return bool(record and record.loaded)
+
+    def get(self, name: str) -> Any:
+        """Return the resource, loading it on first use, without taking a reference"""
+        return self._load(self._get_record(name))
+
+    def acquire(self, name: str, owner: str = 'anonymous') -> Any:
+        """
+        Return the resource and record ``owner`` as a holder
+
+        Acquiring again with the same owner does not add a second reference, so a
+        Streamlit script that re-acquires on every rerun still counts once.
+        """
+        record = self._get_record(name)
+        resource = self._load(record)
+        with self._lock:
+            record.holders.add(owner)
+        return resource
+
+    def get_or_create(self, name: str, loader: Callable[[], Any], kind: str = 'resource',
+                      owner: str = 'anonymous') -> Any:
+        """Register ``loader`` if ``name`` is unknown, then acquire it for ``owner``"""
+        self.register(name, loader, kind=kind)
+        return self.acquire(name, owner=owner)
+
+    def release(self, name: str, owner: str = 'anonymous', unload_when_unused: bool = False) -> int:
+        """
+        Drop ``owner``'s reference to a resource
+
+        Returns:
+            Remaining reference count
+        """
+        record = self._get_record(name)
+        with self._lock:
+            record.holders.discard(owner)
+            remaining = record.ref_count
+        if unload_when_unused and remaining == 0:
+            self.unload(name)
+        return remaining
+
+    def unload(self, name: str, force: bool = False) -> bool:
+        """Drop a loaded resource so the next access reloads it"""
+        record = self._get_record(name)
+        with record.lock:
+            if record.ref_count and not force:
+                self.logger.warning(f"Not unloading '{name}': still held by {sorted(record.holders)}")
+                return False
+            record.resource = None
+            record.loaded = False
+            record.holders.clear()
+        self.logger.info(f"Unloaded resource '{name}'")
+        return True
+
+    def warmup(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Load resources ahead of the first request
+
+        Args:
+            names: Resources to load; defaults to every registered resource,
+                including those registered by loaders during the warmup
+
+        Returns:
+            Mapping of resource name to load time in seconds (0.0 if already loaded)
+        """
+        warm_all = names is None
+        pending = list(self._records) if warm_all else list(names)
+
+        timings = {}
+        while pending:
+            for name in pending:
+                record = self._get_record(name)
+                was_loaded = record.loaded
+                try:
+                    self._load(record)
+                    timings[name] = 0.0 if was_loaded else record.load_time
+                except Exception as e:
+                    self.logger.error(f"Warmup failed for '{name}': {e}")
+                    timings[name] = float('nan')
+            pending = [name for name in list(self._records) if name not in timings] if warm_all else []
+        return timings
+
+    def load_report(self) -> List[Dict]:
+        """Return one entry per registered resource with load timings and holders"""
+        with self._lock:
+            return [record.to_dict() for record in self._records.values()]
+
+    def total_load_time(self) -> float:
+        return sum(record.load_time for record in self._records.values())
+
+    def _get_record(self, name: str) -> ResourceRecord:
+        record = self._records.get(name)
+        if record is None:
+            raise KeyError(f"Unknown resource: {name}")
+        return record
+
+    def _load(self, record: ResourceRecord) -> Any:
+        if record.loaded:
+            return record.resource
+
+        # Per-resource lock: two sessions asking for the same model wait for one
+        # load, while unrelated resources can load in parallel
+        with record.lock:
+            if record.loaded:
+                return record.resource
+
+            self.logger.info(f"Loading {record.kind} '{record.name}'")
+            start = time.perf_counter()
+            try:
+                resource = record.loader()
+            except Exception as e:
+                record.error = str(e)
+                self.logger.error(f"Failed to load '{record.name}': {e}")
+                raise
+
+            record.resource = resource
+            record.load_time = time.perf_counter() - start
+            record.load_count += 1
+            record.loaded_at = datetime.now()
+            record.error = None
+            record.loaded = True
+            self.logger.info(f"Loaded '{record.name}' in {record.load_time:.2f}s")
+            return resource
+
+    def _setup_logger(self) -> logging.Logger:
+        logger = logging.getLogger('ResourceManager')
+        if not logger.handlers:
+            logger.setLevel(logging.INFO)
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+        return logger
+
+
+_resource_manager = None
+_resource_manager_lock = threading.Lock()
+
+
+def get_resource_manager() -> ResourceManager:
+    """Return the process-wide resource manager"""
+    global _resource_manager
+    if _resource_manager is None:
+        with _resource_manager_lock:
+            if _resource_manager is None:
+                _resource_manager = ResourceManager()
+    return _resource_manager
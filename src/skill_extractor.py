@@ -1,24 +1,30 @@
-import spacy
-from spacy.matcher import PhraseMatcher
-
-# 1. Load the pre-trained spaCy model
-try:
-    # Use the downloaded model
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Error: The spaCy model 'en_core_web_sm' is not found.")
-    print("Please run: python -m spacy download en_core_web_sm")
-    exit(1)
+import hashlib
+import json
+import os
+import threading
+
+from src.cache_paths import get_cache_dir
+from src.nlp_registry import get_nlp, profile_disables
+
+# 1. The pre-trained spaCy model is loaded lazily, on the first document processed,
+# through the shared registry - importing this module costs nothing.
+def get_model():
+    """Returns the shared 'en_core_web_sm' pipeline, loading it on first use."""
+    return get_nlp("en_core_web_sm", owner="skill_extractor")
 
 # 2. Function to load the skill dictionary from the text file
+def read_skill_list(file_path):
+    """Reads skills from a file, one per line, skipping blank lines."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
 def load_skills(file_path):
     """Reads skills from a file, one per line, and converts them to spaCy Doc objects."""
+    nlp = get_model()
     skills = []
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            # Read and clean each skill (remove extra spaces/newlines)
-            raw_skills = [line.strip() for line in f if line.strip()]
-        
+        raw_skills = read_skill_list(file_path)
+
         # Convert each skill string into a spaCy Doc object (a 'pattern')
         # This is required by PhraseMatcher
         skills = [nlp.make_doc(skill) for skill in raw_skills]
@@ -26,54 +32,201 @@ def load_skills(file_path):
         print(f"Error: Skill list file not found at {file_path}")
     return skills
 
-# 3. Main function to extract skills from text
+# 3. Compiled matcher, built once per skills file and reused for every document
+class SkillMatcher:
+    """
+    A PhraseMatcher over a fixed skill list.
+
+    Matching is done on the LOWER attribute, so "python", "Python" and "PYTHON"
+    all hit the single "Python" pattern and are reported under the spelling used
+    in the skills file. The tokenised patterns are cached on disk as a DocBin and
+    reused until the skills file changes.
+    """
+
+    CACHE_VERSION = 1
+
+    def __init__(self, nlp, skills, attr="LOWER", patterns=None):
+        from spacy.matcher import PhraseMatcher
+
+        self.nlp = nlp
+        self.attr = attr
+        self.skills = list(skills)
+        if patterns is None:
+            patterns = list(nlp.tokenizer.pipe(self.skills))
+        self.patterns = patterns
+
+        self.matcher = PhraseMatcher(nlp.vocab, attr=attr)
+        if patterns:
+            self.matcher.add("SKILL", patterns)
+
+        # Lowercased token sequence -> spelling from the skills file (first one wins)
+        self.canonical = {}
+        for skill, pattern in zip(self.skills, patterns):
+            self.canonical.setdefault(self._key(pattern), skill)
+
+    def __len__(self):
+        return len(self.skills)
+
+    @staticmethod
+    def _key(tokens):
+        return " ".join(token.lower_ for token in tokens)
+
+    def find_matches(self, doc):
+        """Returns (canonical skill, start_char, end_char) for every match in the doc."""
+        found = []
+        for _, start, end in self.matcher(doc):
+            span = doc[start:end]
+            skill = self.canonical.get(self._key(span), span.text)
+            found.append((skill, span.start_char, span.end_char))
+        return found
+
+    def match(self, doc):
+        """Returns the sorted unique list of canonical skills found in the doc."""
+        return sorted({skill for skill, _, _ in self.find_matches(doc)})
+
+    # --- Disk cache ---
+    def save(self, cache_path, source_info):
+        """Writes the tokenised patterns and the source file fingerprint to disk."""
+        from spacy.tokens import DocBin
+
+        doc_bin = DocBin(attrs=[], store_user_data=False)
+        for pattern in self.patterns:
+            doc_bin.add(pattern)
+        doc_bin.to_disk(cache_path + ".spacy")
+
+        meta = dict(source_info)
+        meta.update({
+            'cache_version': self.CACHE_VERSION,
+            'attr': self.attr,
+            'model': self._model_id(self.nlp),
+            'skills': self.skills,
+        })
+        with open(cache_path + ".json", 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, nlp, cache_path, source_info, attr="LOWER"):
+        """Rebuilds a matcher from disk, or returns None if the cache is stale."""
+        from spacy.tokens import DocBin
+
+        try:
+            with open(cache_path + ".json", 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if (meta.get('cache_version') != cls.CACHE_VERSION or meta.get('attr') != attr
+                or meta.get('model') != cls._model_id(nlp)
+                or meta.get('sha256') != source_info['sha256']):
+            return None
+
+        try:
+            doc_bin = DocBin().from_disk(cache_path + ".spacy")
+        except (FileNotFoundError, ValueError):
+            return None
+        patterns = list(doc_bin.get_docs(nlp.vocab))
+        if len(patterns) != len(meta['skills']):
+            return None
+        return cls(nlp, meta['skills'], attr=attr, patterns=patterns)
+
+    @staticmethod
+    def _model_id(nlp):
+        return f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+
+
+_matcher_cache = {}
+_matcher_lock = threading.Lock()
+
+def _fingerprint(file_path):
+    """mtime/size for the cheap staleness check, sha256 for the authoritative one."""
+    stat = os.stat(file_path)
+    with open(file_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {'mtime': stat.st_mtime, 'size': stat.st_size, 'sha256': digest}
+
+def get_skill_matcher(skills_file_path, nlp=None, attr="LOWER"):
+    """
+    Returns the compiled SkillMatcher for a skills file.
+
+    The matcher is kept in memory for the life of the process and rebuilt only
+    when the file's mtime/size changes and its content hash differs. Returns None
+    if the skills file does not exist.
+    """
+    if nlp is None:
+        nlp = get_model()
+    abs_path = os.path.abspath(skills_file_path)
+
+    try:
+        stat = os.stat(abs_path)
+    except FileNotFoundError:
+        print(f"Error: Skill list file not found at {skills_file_path}")
+        return None
+
+    key = (abs_path, id(nlp), attr)
+    with _matcher_lock:
+        cached = _matcher_cache.get(key)
+        if cached and cached[0] == (stat.st_mtime, stat.st_size):
+            return cached[1]
+
+        source_info = _fingerprint(abs_path)
+        if cached and cached[2] == source_info['sha256']:
+            # Touched but unchanged - keep the compiled matcher
+            _matcher_cache[key] = ((stat.st_mtime, stat.st_size), cached[1], cached[2])
+            return cached[1]
+
+        cache_name = hashlib.sha1(f"{abs_path}|{attr}".encode('utf-8')).hexdigest()[:16]
+        cache_path = os.path.join(get_cache_dir("skill_matchers"), cache_name)
+
+        matcher = SkillMatcher.load(nlp, cache_path, source_info, attr=attr)
+        if matcher is None:
+            matcher = SkillMatcher(nlp, read_skill_list(abs_path), attr=attr)
+            try:
+                matcher.save(cache_path, source_info)
+            except OSError as e:
+                print(f"Warning: could not write skill matcher cache: {e}")
+
+        _matcher_cache[key] = ((stat.st_mtime, stat.st_size), matcher, source_info['sha256'])
+        return matcher
+
+# 4. Main function to extract skills from text
 def extract_skills(clean_text, skills_file_path):
     """Extracts skills from text using spaCy's PhraseMatcher."""
-    
-    # Load the skills and create the matcher
-    skill_patterns = load_skills(skills_file_path)
-    if not skill_patterns:
+    nlp = get_model()
+
+    # Reuse the compiled matcher for this skills file
+    matcher = get_skill_matcher(skills_file_path, nlp)
+    if matcher is None or not len(matcher):
         return []
 
-    # Initialize the PhraseMatcher
-    matcher = PhraseMatcher(nlp.vocab)
-    
-    # Add the skill patterns to the matcher. 'SKILL' is the label for the matches.
-    matcher.add("SKILL", skill_patterns)
-    
-    # Process the clean resume text
-    doc = nlp(clean_text)
-    
-    # Find matches (skill tokens) in the text
-    matches = matcher(doc)
-    
-    # Extract the text of the matched skills
-    found_skills = set()
-    for match_id, start, end in matches:
-        span = doc[start:end]  # The span of the match
-        found_skills.add(span.text)
-        
-    # Return the unique list of skills found
-    return sorted(list(found_skills))
+    # Process the clean resume text - PhraseMatcher only needs tokens, so the
+    # tagger, parser and NER are skipped
+    doc = nlp(clean_text, disable=profile_disables(nlp, 'tokenizer'))
+
+    # Find matches (skill tokens) in the text and return the unique list of skills found
+    return matcher.match(doc)
 
 # --- Example of how to use this function (will be imported by pipeline.py later) ---
 if __name__ == '__main__':
-    # Since you run this script from the parent folder (skillgapAI), 
+    # Since you run this script from the parent folder (skillgapAI),
     # the files are in the current working directory, not the parent (../).
     SKILLS_FILE = "skills_list.txt"
-    CLEANED_FILE = "cleaned_sri_resume.txt" 
+    CLEANED_FILE = "cleaned_sri_resume.txt"
     # ...
-    
+
     try:
         with open(CLEANED_FILE, 'r', encoding='utf-8') as f:
             text = f.read()
     except FileNotFoundError:
         print(f"Error: Cleaned resume file not found at {CLEANED_FILE}. Please run pipeline.py first.")
         exit(1)
-        
+
     print(f"Attempting to extract skills from {CLEANED_FILE}...")
-    skills = extract_skills(text, SKILLS_FILE)
-    
+    try:
+        skills = extract_skills(text, SKILLS_FILE)
+    except OSError as e:
+        print(f"Error: {e}")
+        exit(1)
+
     print("\n--- EXTRACTED SKILLS (Rule-Based) ---")
     print(skills)
-    print(f"\nTotal unique skills found: {len(skills)}")
\ No newline at end of file
+    print(f"\nTotal unique skills found: {len(skills)}")
@@ -0,0 +1,195 @@
+"""
+Static skill taxonomy behind ComprehensiveSkillDatabase.
+
+The category lists, abbreviations, variations, context patterns and skill
+relationships live here, free of the app's UI and NLP imports, so encoders,
+caches and offline tools can read the taxonomy without importing askill_ext.
+ComprehensiveSkillDatabase starts from copies of these tables.
+"""
+
+from typing import Dict, List
+
+SKILL_CATEGORIES: Dict[str, List[str]] = {
+    'programming_languages': [
+        'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'C', 'Rust',
+        'Go', 'Kotlin', 'Swift', 'Dart', 'Ruby', 'PHP', 'Scala', 'R', 'MATLAB',
+        'Perl', 'Haskell', 'Elixir', 'Clojure', 'Julia', 'Lua', 'Objective-C',
+        'F#', 'VB.NET', 'Solidity', 'Bash', 'PowerShell', 'SQL', 'HTML', 'CSS'
+    ],
+    'web_frameworks': [
+        'React', 'Angular', 'Vue.js', 'Node.js', 'Express.js', 'Django', 'Flask',
+        'FastAPI', 'Spring Boot', 'Spring', 'ASP.NET', '.NET Core', 'Ruby on Rails',
+        'Laravel', 'Next.js', 'Nuxt.js', 'Svelte', 'SolidJS', 'Qwik', 'Gatsby',
+        'Ember.js', 'Backbone.js', 'jQuery', 'Bootstrap', 'Tailwind CSS', 'Material-UI'
+    ],
+    'mobile_development': [
+        'React Native', 'Flutter', 'Android Development', 'iOS Development',
+        'SwiftUI', 'Kotlin Multiplatform', 'Xamarin', 'Ionic', 'Cordova',
+        'Unity', 'Unreal Engine', 'Mobile UI/UX', 'App Development'
+    ],
+    'databases': [
+        'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Cassandra', 'Oracle',
+        'SQL Server', 'SQLite', 'MariaDB', 'DynamoDB', 'Elasticsearch',
+        'Firebase', 'Neo4j', 'Snowflake', 'BigQuery', 'CosmosDB', 'ClickHouse',
+        'InfluxDB', 'CouchDB', 'Supabase', 'PlanetScale', 'FaunaDB'
+    ],
+    'ml_ai': [
+        'Machine Learning', 'Deep Learning', 'Neural Networks', 'Natural Language Processing',
+        'NLP', 'Computer Vision', 'Reinforcement Learning', 'Transfer Learning',
+        'Feature Engineering', 'MLOps', 'Generative AI', 'Large Language Models',
+        'LLM', 'CNN', 'RNN', 'LSTM', 'Transformer', 'BERT', 'GPT', 'Diffusion Models',
+        'Prompt Engineering', 'AI Ethics', 'Explainable AI', 'Data Science', 'Analytics'
+    ],
+    'ml_frameworks': [
+        'TensorFlow', 'PyTorch', 'Keras', 'Scikit-learn', 'XGBoost', 'LightGBM',
+        'CatBoost', 'Pandas', 'NumPy', 'SciPy', 'Matplotlib', 'Seaborn',
+        'Plotly', 'NLTK', 'spaCy', 'Hugging Face', 'OpenCV', 'LangChain', 'LlamaIndex',
+        'MLflow', 'Kubeflow', 'Airflow', 'DVC', 'Weights & Biases'
+    ],
+    'cloud_platforms': [
+        'AWS', 'Amazon Web Services', 'Azure', 'Microsoft Azure',
+        'Google Cloud Platform', 'GCP', 'Heroku', 'DigitalOcean',
+        'IBM Cloud', 'Oracle Cloud', 'Alibaba Cloud', 'Vercel', 'Netlify'
+    ],
+    'cloud_services': [
+        'AWS Lambda', 'AWS S3', 'AWS EC2', 'Azure Functions', 'Google Cloud Functions',
+        'Kubernetes', 'Docker', 'Terraform', 'Ansible', 'Jenkins', 'GitHub Actions',
+        'GitLab CI', 'CircleCI', 'Prometheus', 'Grafana', 'Datadog', 'New Relic',
+        'CloudFormation', 'Azure DevOps', 'Google Cloud Build', 'Serverless'
+    ],
+    'devops_tools': [
+        'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI', 'GitHub Actions',
+        'CircleCI', 'Ansible', 'Terraform', 'Prometheus', 'Grafana',
+        'ELK Stack', 'Datadog', 'New Relic', 'Splunk', 'PagerDuty',
+        'Bash', 'Shell Scripting', 'CI/CD', 'Infrastructure as Code'
+    ],
+    'version_control': [
+        'Git', 'GitHub', 'GitLab', 'Bitbucket', 'SVN', 'Mercurial',
+        'Source Control', 'Version Management', 'Code Repository'
+    ],
+    'testing': [
+        'Jest', 'Mocha', 'Pytest', 'JUnit', 'Selenium', 'Cypress',
+        'Playwright', 'Postman', 'JMeter', 'LoadRunner', 'Cucumber',
+        'Test-Driven Development', 'Behavior-Driven Development', 'Unit Testing',
+        'Integration Testing', 'E2E Testing', 'Performance Testing'
+    ],
+    'soft_skills': [
+        'Leadership', 'Team Management', 'Communication', 'Problem Solving',
+        'Critical Thinking', 'Analytical Skills', 'Project Management',
+        'Collaboration', 'Teamwork', 'Adaptability', 'Creativity',
+        'Time Management', 'Emotional Intelligence', 'Conflict Resolution',
+        'Strategic Thinking', 'Public Speaking', 'Mentoring', 'Negotiation',
+        'Decision Making', 'Attention to Detail', 'Organization', 'Planning'
+    ],
+    'emerging_tech': [
+        'Blockchain', 'Web3', 'Smart Contracts', 'IoT', 'Edge Computing',
+        'Quantum Computing', 'AR/VR', 'Metaverse', 'Digital Twins',
+        'Robotic Process Automation', 'RPA', '5G', 'Serverless Computing',
+        'Microservices', 'GraphQL', 'WebAssembly', 'Low-Code/No-Code'
+    ],
+    'data_engineering': [
+        'Data Warehousing', 'ETL', 'Data Pipeline', 'Apache Spark', 'Apache Hadoop',
+        'Apache Kafka', 'Apache Flink', 'Data Lake', 'Data Modeling', 'Data Governance',
+        'Streaming Analytics', 'Real-time Processing', 'Batch Processing'
+    ],
+    'cybersecurity': [
+        'Network Security', 'Application Security', 'Cryptography', 'Penetration Testing',
+        'Security Auditing', 'Compliance', 'Risk Assessment', 'Incident Response',
+        'Security Operations', 'Threat Intelligence', 'Identity Management'
+    ],
+    'ui_ux': [
+        'User Interface Design', 'User Experience Design', 'UI/UX', 'Prototyping',
+        'Wireframing', 'Figma', 'Sketch', 'Adobe XD', 'InVision', 'Design Systems',
+        'Responsive Design', 'Accessibility', 'Usability Testing'
+    ],
+    'business_intelligence': [
+        'Tableau', 'Power BI', 'Looker', 'Qlik', 'Domo', 'Data Visualization',
+        'Business Analytics', 'Reporting', 'Dashboarding', 'KPIs', 'Metrics'
+    ]
+}
+
+ABBREVIATIONS: Dict[str, str] = {
+    'ML': 'Machine Learning', 'DL': 'Deep Learning', 'AI': 'Artificial Intelligence',
+    'NLP': 'Natural Language Processing', 'CV': 'Computer Vision', 'NN': 'Neural Networks',
+    'CNN': 'Convolutional Neural Networks', 'RNN': 'Recurrent Neural Networks',
+    'LLM': 'Large Language Models', 'GPT': 'Generative Pre-trained Transformer',
+    'K8s': 'Kubernetes', 'CI/CD': 'Continuous Integration/Continuous Deployment',
+    'API': 'Application Programming Interface', 'REST': 'Representational State Transfer',
+    'SQL': 'Structured Query Language', 'NoSQL': 'Not Only SQL',
+    'OOP': 'Object-Oriented Programming', 'FP': 'Functional Programming',
+    'TDD': 'Test-Driven Development', 'BDD': 'Behavior-Driven Development',
+    'AWS': 'Amazon Web Services', 'GCP': 'Google Cloud Platform',
+    'RPA': 'Robotic Process Automation', 'IoT': 'Internet of Things',
+    'AR': 'Augmented Reality', 'VR': 'Virtual Reality', 'UX': 'User Experience',
+    'UI': 'User Interface', 'SaaS': 'Software as a Service', 'PaaS': 'Platform as a Service',
+    'IaaS': 'Infrastructure as a Service', 'CRM': 'Customer Relationship Management',
+    'ERP': 'Enterprise Resource Planning', 'BI': 'Business Intelligence'
+}
+
+SKILL_PATTERNS: List[str] = [
+    r'experienced? (?:in|with) ([\w\s\+\#\.\-]+)',
+    r'proficient (?:in|with|at) ([\w\s\+\#\.\-]+)',
+    r'expertise (?:in|with) ([\w\s\+\#\.\-]+)',
+    r'knowledge (?:of|in) ([\w\s\+\#\.\-]+)',
+    r'skilled (?:in|at|with) ([\w\s\+\#\.\-]+)',
+    r'familiar (?:with|in) ([\w\s\+\#\.\-]+)',
+    r'strong (?:background|experience) (?:in|with) ([\w\s\+\#\.\-]+)',
+    r'hands.on experience (?:in|with) ([\w\s\+\#\.\-]+)',
+    r'(\d+)\+?\s*years? of (?:experience )?(?:in|with) ([\w\s\+\#\.\-]+)',
+    r'working knowledge of ([\w\s\+\#\.\-]+)',
+    r'proven ability (?:in|with) ([\w\s\+\#\.\-]+)',
+    r'developed (?:using|with) ([\w\s\+\#\.\-]+)',
+    r'built (?:using|with) ([\w\s\+\#\.\-]+)',
+    r'implemented (?:using|with) ([\w\s\+\#\.\-]+)',
+    r'created (?:using|with) ([\w\s\+\#\.\-]+)',
+    r'designed (?:using|with) ([\w\s\+\#\.\-]+)',
+    r'architected (?:using|with) ([\w\s\+\#\.\-]+)',
+    r'worked (?:with|on) ([\w\s\+\#\.\-]+)',
+    r'used ([\w\s\+\#\.\-]+) to',
+    r'certified (?:in|for) ([\w\s\+\#\.\-]+)',
+    r'specialized (?:in|with) ([\w\s\+\#\.\-]+)',
+    r'focused (?:on|in) ([\w\s\+\#\.\-]+)'
+]
+
+SKILL_RELATIONSHIPS: Dict[str, List[str]] = {
+    'Python': ['Django', 'Flask', 'FastAPI', 'Pandas', 'NumPy', 'scikit-learn', 'PyTorch'],
+    'JavaScript': ['React', 'Vue.js', 'Angular', 'Node.js', 'TypeScript', 'Express.js'],
+    'Machine Learning': ['Deep Learning', 'TensorFlow', 'PyTorch', 'scikit-learn'],
+    'AWS': ['AWS Lambda', 'AWS S3', 'AWS EC2', 'DynamoDB', 'CloudFormation'],
+    'Docker': ['Kubernetes', 'Containerization', 'Microservices'],
+    'React': ['React Native', 'Redux', 'Next.js', 'Webpack'],
+    'Data Science': ['Python', 'R', 'Pandas', 'NumPy', 'Machine Learning'],
+    'DevOps': ['CI/CD', 'Docker', 'Kubernetes', 'Jenkins', 'Terraform'],
+    'Frontend': ['HTML', 'CSS', 'JavaScript', 'React', 'Vue.js', 'Angular'],
+    'Backend': ['Node.js', 'Python', 'Java', 'Databases', 'APIs']
+}
+
+SKILL_VARIATIONS: Dict[str, List[str]] = {
+    'Python': ['Python 3', 'Python 2', 'Py'],
+    'JavaScript': ['JS', 'JavaScript ES6', 'ES6', 'JavaScript ES2015'],
+    'TypeScript': ['TS'],
+    'React': ['React.js', 'ReactJS'],
+    'Node.js': ['Node', 'NodeJS'],
+    'Machine Learning': ['ML'],
+    'Deep Learning': ['DL'],
+    'Natural Language Processing': ['NLP'],
+    'Computer Vision': ['CV'],
+    'User Interface': ['UI'],
+    'User Experience': ['UX'],
+    'Amazon Web Services': ['AWS'],
+    'Google Cloud Platform': ['GCP'],
+    'Microsoft Azure': ['Azure'],
+    'Structured Query Language': ['SQL'],
+    'Not Only SQL': ['NoSQL'],
+    'Continuous Integration': ['CI'],
+    'Continuous Deployment': ['CD'],
+    'Application Programming Interface': ['API'],
+    'Representational State Transfer': ['REST']
+}
+
+def default_terms() -> List[str]:
+    """Skill names, abbreviations and variations, deduplicated in taxonomy order"""
+    terms = [skill for skills in SKILL_CATEGORIES.values() for skill in skills]
+    terms.extend(ABBREVIATIONS)
+    terms.extend(variation for variations in SKILL_VARIATIONS.values() for variation in variations)
+    return list(dict.fromkeys(term for term in terms if term.strip()))
@@ -0,0 +1,144 @@
+"""
+Precomputed embeddings for a fixed skill taxonomy.
+
+The skill list only changes when the database does, so its embeddings are
+computed once per (model, skill list), L2-normalised, written to the cache
+directory as a float32 ``.npy`` file and memory-mapped on later loads. Cosine
+similarity against the taxonomy is then a single matrix-vector product.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.cache_paths import get_cache_dir
+
+CACHE_VERSION = 1
+
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """Row-normalise ``vectors`` to unit length (zero rows are left as zeros)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class TaxonomyEmbeddings:
+    """Read-only, unit-length embedding matrix aligned with a skill list"""
+
+    def __init__(self, skills: Sequence[str], matrix: np.ndarray, key: str):
+        self.skills = list(skills)
+        self.matrix = matrix
+        self.key = key
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def similarities(self, embedding: np.ndarray) -> np.ndarray:
+        """Cosine similarity of one embedding (or a batch of them) to every skill"""
+        embedding = l2_normalize(embedding)
+        return embedding @ self.matrix.T
+
+    def above_threshold(self, embedding: np.ndarray, threshold: float) -> List[str]:
+        """Skills whose cosine similarity to ``embedding`` is at least ``threshold``"""
+        scores = self.similarities(np.asarray(embedding).reshape(-1))
+        return [self.skills[i] for i in np.flatnonzero(scores >= threshold)]
+
+    def max_similarities(self, embeddings: np.ndarray) -> np.ndarray:
+        """Best cosine similarity of each skill over a batch of embeddings (max-pooling)"""
+        embeddings = np.asarray(embeddings).reshape(-1, self.matrix.shape[1])
+        if not len(embeddings):
+            return np.zeros(len(self.skills), dtype=np.float32)
+        return self.similarities(embeddings).max(axis=0)
+
+    def top_matches(self, embeddings: np.ndarray, threshold: float,
+                    top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Skills whose max-pooled similarity reaches ``threshold``, best first
+
+        Args:
+            embeddings: One or more query embeddings, e.g. one per text window
+            threshold: Minimum cosine similarity
+            top_k: Keep at most this many skills (all of them if None)
+        """
+        scores = self.max_similarities(embeddings)
+        hits = np.flatnonzero(scores >= threshold)
+        hits = hits[np.argsort(-scores[hits], kind='stable')]
+        if top_k is not None:
+            hits = hits[:top_k]
+        return [(self.skills[i], float(scores[i])) for i in hits]
+
+
+_loaded: Dict[str, TaxonomyEmbeddings] = {}
+_lock = threading.Lock()
+
+
+def taxonomy_key(model_name: str, skills: Sequence[str]) -> str:
+    """Cache key that changes whenever the model or the skill list changes"""
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_VERSION}|{model_name}|".encode('utf-8'))
+    digest.update("\n".join(skills).encode('utf-8'))
+    return digest.hexdigest()[:24]
+
+
+def get_taxonomy_embeddings(encoder, skills: Sequence[str], model_name: Optional[str] = None,
+                            batch_size: int = 64) -> TaxonomyEmbeddings:
+    """
+    Return the embedding matrix for ``skills``, computing it only if no valid copy exists
+
+    Args:
+        encoder: Object with a SentenceTransformer-style ``encode`` method
+        skills: Ordered skill names; row ``i`` of the matrix belongs to ``skills[i]``
+        model_name: Identifies the model in the cache key (defaults to ``encoder.model_name``)
+        batch_size: Encoding batch size used when the matrix has to be built
+    """
+    skills = list(skills)
+    model_name = model_name or getattr(encoder, 'model_name', type(encoder).__name__)
+    key = taxonomy_key(model_name, skills)
+
+    with _lock:
+        cached = _loaded.get(key)
+        if cached is not None:
+            return cached
+
+        path = os.path.join(get_cache_dir("taxonomy_embeddings"), f"{key}.npy")
+        matrix = _load_matrix(path, len(skills))
+        if matrix is None:
+            matrix = l2_normalize(encoder.encode(skills, batch_size=batch_size))
+            try:
+                _save_matrix(path, matrix, model_name, skills)
+                matrix = np.load(path, mmap_mode='r')
+            except OSError as e:
+                print(f"Warning: could not write taxonomy embedding cache: {e}")
+
+        taxonomy = TaxonomyEmbeddings(skills, matrix, key)
+        _loaded[key] = taxonomy
+        return taxonomy
+
+
+def _load_matrix(path: str, expected_rows: int) -> Optional[np.ndarray]:
+    try:
+        matrix = np.load(path, mmap_mode='r')
+    except (FileNotFoundError, ValueError, OSError):
+        return None
+    if matrix.dtype != np.float32 or matrix.ndim != 2 or matrix.shape[0] != expected_rows:
+        return None
+    return matrix
+
+
+def _save_matrix(path: str, matrix: np.ndarray, model_name: str, skills: List[str]) -> None:
+    # Write to a temporary file first so a concurrent reader never maps a partial matrix
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, np.ascontiguousarray(matrix, dtype=np.float32))
+    os.replace(tmp_path, path)
+
+    meta_path = path[:-len('.npy')] + '.json'
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump({'cache_version': CACHE_VERSION, 'model': model_name,
+                   'dimension': int(matrix.shape[1]), 'skills': skills}, f)
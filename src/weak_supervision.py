@@ -0,0 +1,263 @@
+"""
+Weak-supervision annotation generator for the custom skill NER model.
+
+Streams a local corpus of resumes or job descriptions (``.txt``/``.md`` files)
+through a PhraseMatcher compiled from the skill database and writes every
+sentence with at least one match - plus an optional share of sentences with
+none, as negatives - to sharded spaCy ``DocBin`` files with silver-standard
+``SKILL`` entities. Files are split across worker processes, each writing its
+own shards, so large corpora are annotated in minutes.
+
+Usage:
+    python -m src.weak_supervision CORPUS_DIR OUTPUT_DIR [--processes 4] [--shard-size 5000]
+
+Short or ambiguous terms (C, R, Go, AI, UI...) are matched case-sensitively,
+since their lowercase forms are ordinary words; every other term ignores case.
+
+``CustomSkillNERTrainer.train_from_shards`` reads the shards listed in the
+output's ``manifest.json``.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from src.skill_extractor import SkillMatcher
+from src.skill_taxonomy import default_terms
+
+CORPUS_EXTENSIONS = ('.txt', '.md')
+LABEL = 'SKILL'
+MANIFEST = 'manifest.json'
+
+# Terms up to this length, or listed below, only match with their exact case
+CASE_SENSITIVE_MAX_LEN = 3
+AMBIGUOUS_TERMS = frozenset({
+    'go', 'rust', 'swift', 'dart', 'julia', 'ruby', 'spark', 'flask', 'express', 'chef',
+    'puppet', 'ansible', 'excel', 'word', 'access', 'shell', 'unity', 'ember', 'meteor',
+})
+
+# Per-process state, set up once by the pool initializer
+_worker = {}
+
+
+def find_corpus_files(paths: Iterable[str]) -> List[str]:
+    """Corpus files under ``paths`` (files or directories), sorted for reproducible shards"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in names
+                             if name.lower().endswith(CORPUS_EXTENSIONS))
+        elif os.path.isfile(path):
+            files.append(path)
+    return sorted(files)
+
+
+def is_case_sensitive(term: str) -> bool:
+    """Whether ``term`` must match with its exact case to count as a skill"""
+    term = term.strip()
+    return len(term) <= CASE_SENSITIVE_MAX_LEN or term.casefold() in AMBIGUOUS_TERMS
+
+
+def build_matchers(nlp, terms: Iterable[str]) -> List[SkillMatcher]:
+    """A case-insensitive matcher for ordinary terms and an ORTH matcher for ambiguous ones"""
+    terms = list(terms)
+    return [
+        SkillMatcher(nlp, [term for term in terms if not is_case_sensitive(term)]),
+        SkillMatcher(nlp, [term for term in terms if is_case_sensitive(term)], attr="ORTH"),
+    ]
+
+
+def _init_worker(terms: List[str], output_dir: str, shard_size: int, negative_ratio: float,
+                 min_chars: int, seed: int) -> None:
+    import spacy
+
+    nlp = spacy.blank('en')
+    nlp.add_pipe('sentencizer')
+    _worker.update({
+        'nlp': nlp,
+        'matchers': build_matchers(nlp, terms),
+        'output_dir': output_dir,
+        'shard_size': shard_size,
+        'negative_ratio': negative_ratio,
+        'min_chars': min_chars,
+        'seed': seed,
+    })
+
+
+def annotate_text(text: str, nlp, matchers: List[SkillMatcher], negative_ratio: float = 0.0,
+                  min_chars: int = 20, rng: Optional[random.Random] = None) -> Iterator:
+    """
+    Yield one sentence-level Doc with ``SKILL`` entities per usable sentence of ``text``
+
+    Lines are treated as hard boundaries - resume bullets rarely end with a full
+    stop - and are then split into sentences. Sentences without a match are kept
+    with probability ``negative_ratio``.
+    """
+    from spacy.tokens import Span
+    from spacy.util import filter_spans
+
+    rng = rng or random.Random(0)
+    lines = (line.strip() for line in text.splitlines())
+    sents = (sent for doc in nlp.pipe(line for line in lines if line) for sent in doc.sents)
+    for sent in sents:
+        if len(sent.text.strip()) < min_chars:
+            continue
+        sent_doc = sent.as_doc()
+        spans = [Span(sent_doc, start, end, label=LABEL)
+                 for matcher in matchers for _, start, end in matcher.matcher(sent_doc)]
+        if not spans and rng.random() >= negative_ratio:
+            continue
+        sent_doc.ents = filter_spans(spans)
+        yield sent_doc
+
+
+def _annotate_files(task) -> Dict:
+    """Worker: annotate a slice of the corpus and write its shards"""
+    from spacy.tokens import DocBin
+
+    worker_id, files = task
+    nlp, matchers = _worker['nlp'], _worker['matchers']
+    rng = random.Random(_worker['seed'] + worker_id)
+    stats = {'files': 0, 'sentences': 0, 'entities': 0, 'shards': [], 'errors': []}
+
+    doc_bin = DocBin(attrs=['ENT_IOB', 'ENT_TYPE'], store_user_data=False)
+
+    def flush():
+        if len(doc_bin):
+            path = os.path.join(_worker['output_dir'], f"shard-{worker_id:03d}-{len(stats['shards']):04d}.spacy")
+            doc_bin.to_disk(path)
+            stats['shards'].append(os.path.basename(path))
+
+    for path in files:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                text = f.read()
+        except OSError as e:
+            stats['errors'].append(f"{path}: {e}")
+            continue
+        stats['files'] += 1
+        for sent_doc in annotate_text(text, nlp, matchers, _worker['negative_ratio'],
+                                      _worker['min_chars'], rng):
+            doc_bin.add(sent_doc)
+            stats['sentences'] += 1
+            stats['entities'] += len(sent_doc.ents)
+            if len(doc_bin) >= _worker['shard_size']:
+                flush()
+                doc_bin = DocBin(attrs=['ENT_IOB', 'ENT_TYPE'], store_user_data=False)
+    flush()
+    return stats
+
+
+def generate_annotations(corpus_paths: Iterable[str], output_dir: str, terms: Optional[List[str]] = None,
+                         processes: int = 1, shard_size: int = 5000, negative_ratio: float = 0.1,
+                         min_chars: int = 20, seed: int = 0) -> Dict:
+    """
+    Annotate a corpus with silver ``SKILL`` spans and write ``DocBin`` shards
+
+    Args:
+        corpus_paths: Files or directories of ``.txt``/``.md`` documents
+        output_dir: Directory for the shards and ``manifest.json``
+        terms: Skill surface forms to match (default: the skill database)
+        processes: Worker processes; each writes its own shards
+        shard_size: Sentences per shard
+        negative_ratio: Share of sentences without any skill kept as negatives
+        min_chars: Shorter sentences are skipped
+        seed: Seed for the negative sampling
+
+    Returns:
+        The manifest: totals, shard file names and any unreadable files
+    """
+    files = find_corpus_files(corpus_paths)
+    terms = terms or default_terms()
+    os.makedirs(output_dir, exist_ok=True)
+
+    processes = max(1, min(processes, len(files) or 1))
+    tasks = [(i, files[i::processes]) for i in range(processes)]
+    init_args = (terms, output_dir, shard_size, negative_ratio, min_chars, seed)
+
+    if processes == 1:
+        _init_worker(*init_args)
+        results = [_annotate_files(tasks[0])]
+    else:
+        with Pool(processes, initializer=_init_worker, initargs=init_args) as pool:
+            results = pool.map(_annotate_files, tasks)
+
+    manifest = {
+        'label': LABEL,
+        'terms': len(terms),
+        'terms_sha256': hashlib.sha256("\n".join(terms).encode('utf-8')).hexdigest(),
+        'files': sum(r['files'] for r in results),
+        'sentences': sum(r['sentences'] for r in results),
+        'entities': sum(r['entities'] for r in results),
+        'shards': sorted(shard for r in results for shard in r['shards']),
+        'errors': [error for r in results for error in r['errors']],
+    }
+    with open(os.path.join(output_dir, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_manifest(shard_dir: str) -> Dict:
+    """The ``manifest.json`` written by ``generate_annotations`` into ``shard_dir``"""
+    path = os.path.join(shard_dir, MANIFEST)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"No {MANIFEST} in {shard_dir}; generate the shards with src.weak_supervision")
+
+
+def iter_shard_docs(shard_dir: str, vocab) -> Iterator:
+    """Yield the annotated Docs of the shards listed in ``shard_dir``'s manifest"""
+    from spacy.tokens import DocBin
+
+    # Only the manifest's shards: files left over from earlier runs are ignored
+    for name in read_manifest(shard_dir)['shards']:
+        yield from DocBin().from_disk(os.path.join(shard_dir, name)).get_docs(vocab)
+
+
+def load_examples(shard_dir: str, nlp, limit: Optional[int] = None) -> List:
+    """Training ``Example`` objects for ``nlp`` built from the shards in ``shard_dir``"""
+    from spacy.training import Example
+
+    examples = []
+    for doc in iter_shard_docs(shard_dir, nlp.vocab):
+        examples.append(Example(nlp.make_doc(doc.text), doc))
+        if limit is not None and len(examples) >= limit:
+            break
+    return examples
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate silver-standard SKILL annotations as DocBin shards")
+    parser.add_argument('corpus', nargs='+', help="Corpus files or directories (.txt/.md)")
+    parser.add_argument('output_dir', help="Directory for the .spacy shards")
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--shard-size', type=int, default=5000)
+    parser.add_argument('--negative-ratio', type=float, default=0.1)
+    parser.add_argument('--min-chars', type=int, default=20)
+    parser.add_argument('--terms', help="Optional file with one skill term per line")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    terms = None
+    if args.terms:
+        with open(args.terms, 'r', encoding='utf-8') as f:
+            terms = [line.strip() for line in f if line.strip()]
+
+    manifest = generate_annotations(args.corpus, args.output_dir, terms=terms, processes=args.processes,
+                                    shard_size=args.shard_size, negative_ratio=args.negative_ratio,
+                                    min_chars=args.min_chars, seed=args.seed)
+    print(f"Annotated {manifest['sentences']} sentences ({manifest['entities']} skills) "
+          f"from {manifest['files']} files into {len(manifest['shards'])} shards in {args.output_dir}")
+    for error in manifest['errors']:
+        print(f"Warning: {error}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import sys
+import types
+import zlib
+
+import numpy as np
+
+
+class _NoOp:
+    """Stands in for streamlit: every call does nothing"""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class _FlatL2:
+    def __init__(self, d):
+        self.d = d
+        self.code_size = 4 * d
+        self.xb = np.zeros((0, d), dtype='float32')
+
+    def train(self, x):
+        pass
+
+    def add(self, x):
+        self.xb = np.vstack([self.xb, self._store(np.asarray(x, dtype='float32'))])
+
+    def _store(self, x):
+        return x
+
+    def search(self, q, k):
+        dist = ((q[:, None, :] - self.xb[None, :, :]) ** 2).sum(axis=-1)
+        ids = np.argsort(dist, axis=1, kind='stable')[:, :k]
+        return np.take_along_axis(dist, ids, axis=1), ids
+
+
+class _ScalarQuantizer(_FlatL2):
+    QT_8bit, QT_8bit_uniform, QT_fp16 = 0, 1, 2
+
+    def __init__(self, d, qtype, metric):
+        super().__init__(d)
+        self.qtype = qtype
+        self.code_size = 2 * d if qtype == self.QT_fp16 else d
+        self.vmin = self.vmax = None
+
+    def train(self, x):
+        # faiss: one range per dimension (QT_8bit) or one for all values (uniform)
+        axis = None if self.qtype == self.QT_8bit_uniform else 0
+        self.vmin, self.vmax = x.min(axis=axis), x.max(axis=axis)
+
+    def _store(self, x):
+        if self.qtype == self.QT_fp16:
+            return x.astype('float16').astype('float32')
+        step = (self.vmax - self.vmin) / 255
+        codes = np.clip(np.rint((x - self.vmin) / step), 0, 255)
+        return (codes * step + self.vmin).astype('float32')
+
+
+def _fake_faiss():
+    faiss = types.ModuleType('faiss')
+    faiss.IndexFlatL2 = _FlatL2
+    faiss.IndexScalarQuantizer = _ScalarQuantizer
+    faiss.ScalarQuantizer = _ScalarQuantizer
+    faiss.METRIC_L2 = 1
+    return faiss
+
+
+class _FakeEncoder:
+    """MiniLM-shaped embeddings: 384-d unit vectors around a shared direction, in topic clusters"""
+
+    model_name = 'fake'
+    _common, _topics = np.random.default_rng(0).normal(size=384), np.random.default_rng(1).normal(size=(8, 384))
+
+    def encode(self, texts, **kwargs):
+        vectors = np.stack([
+            self._common + self._topics[zlib.crc32(text.encode()) % 8]
+            + 0.8 * np.random.default_rng(zlib.crc32(text.encode())).normal(size=384)
+            for text in texts
+        ])
+        return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype('float32')
+
+
+def _vector_database(monkeypatch, tmp_path, storage):
+    monkeypatch.setitem(sys.modules, 'faiss', sys.modules.get('faiss') or _fake_faiss())
+    monkeypatch.setitem(sys.modules, 'streamlit', sys.modules.get('streamlit') or _NoOp())
+    monkeypatch.setenv('SKILLGAP_EMBEDDING_STORAGE', storage)
+    monkeypatch.setenv('SKILLGAP_CACHE_DIR', str(tmp_path))
+    import chatbot
+
+    monkeypatch.setattr(chatbot, 'faiss', sys.modules['faiss'], raising=False)
+    monkeypatch.setattr(chatbot, 'DEPENDENCIES_AVAILABLE', True)
+    monkeypatch.setattr(chatbot, 'get_shared_encoder', lambda *args, **kwargs: _FakeEncoder())
+    return chatbot.VectorDatabase()
+
+
+def test_int8_index_is_not_clipped_to_the_first_batch(monkeypatch, tmp_path):
+    db = _vector_database(monkeypatch, tmp_path, 'int8')
+    assert db.add_documents(["Python developer"])
+    documents = [f"document {i} about skill {i * 7}" for i in range(300)]
+    assert db.add_documents(documents)
+
+    stats = db.get_stats()
+    assert stats['storage'] == 'int8' and stats['bytes_per_vector'] == db.dimension
+    # Each later document is still its own nearest neighbour
+    for i in (0, 17, 299):
+        assert db.search(documents[i], k=1, threshold=-1)[0]['index'] == i + 1
+
+    # Bounds fitted to the data keep 384-d unit vectors close to float32 ranking
+    report = db.storage_report(k=5)
+    assert report['recall_at_k'] >= 0.97
+    assert report['float32_bytes_per_vector'] == 4 * report['bytes_per_vector']
+
+
+def test_float16_index_reports_recall(monkeypatch, tmp_path):
+    db = _vector_database(monkeypatch, tmp_path, 'float16')
+    assert db.add_documents([f"resume line {i}" for i in range(300)])
+    assert db.storage_report(k=5)['recall_at_k'] >= 0.99
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from src.encoders import HashingEncoder, TfidfEncoder, get_encoder
+from src.skill_taxonomy import default_terms
+
+SKILLS = ['Python', 'Machine Learning', 'python', 'Docker', 'Python']
+
+
+@pytest.fixture(params=['hashing', 'tfidf'])
+def encoder(request):
+    return HashingEncoder() if request.param == 'hashing' else TfidfEncoder()
+
+
+def test_rows_are_unit_length_and_aligned_with_input(encoder):
+    vectors = encoder.encode_skills(SKILLS)
+
+    assert vectors.shape == (len(SKILLS), encoder.embedding_dimension)
+    assert vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+    # Duplicates get the same row; lowercasing makes 'python' match 'Python'
+    assert np.array_equal(vectors[0], vectors[4])
+    assert vectors[0] @ vectors[2] > 0.99
+    assert vectors[0] @ vectors[3] < 0.5
+
+
+def test_encoding_is_deterministic(encoder):
+    fresh = HashingEncoder() if isinstance(encoder, HashingEncoder) else TfidfEncoder()
+
+    assert fresh.model_name == encoder.model_name
+    assert np.array_equal(encoder.encode(SKILLS), fresh.encode(SKILLS))
+
+
+def test_encode_accepts_empty_and_single_inputs(encoder):
+    empty = encoder.encode([])
+    assert empty.shape == (0, encoder.embedding_dimension) and empty.dtype == np.float32
+    assert encoder.encode('Docker').shape == (encoder.embedding_dimension,)
+    with pytest.raises(ValueError):
+        encoder.encode_skills([])
+
+
+def test_tfidf_round_trip_over_the_taxonomy():
+    encoder = get_encoder('tfidf')
+    assert get_encoder('tfidf') is encoder
+
+    terms = default_terms()[:200]
+    vectors = encoder.encode(terms)
+    # Every taxonomy term is its own nearest neighbour
+    assert np.array_equal((vectors @ vectors.T).argmax(axis=1), np.arange(len(terms)))
+    assert encoder.stats()['encoded_texts'] >= len(terms)
@@ -0,0 +1,56 @@
+import sys
+
+
+class _NoOp:
+    """Stands in for streamlit: every call does nothing"""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def _extraction(text, document_type='resume', **kwargs):
+    skills = text.split()
+    return {
+        'success': True,
+        'all_skills': skills,
+        'skill_confidence': {skill: 0.9 for skill in skills},
+        'categorized_skills': {'other': skills} if skills else {},
+        'extraction_methods': {},
+        'statistics': {},
+    }
+
+
+def _analyzer(monkeypatch, tmp_path):
+    monkeypatch.setitem(sys.modules, 'streamlit', sys.modules.get('streamlit') or _NoOp())
+    monkeypatch.setenv('SKILLGAP_CACHE_DIR', str(tmp_path))
+    import askill_ext
+    from src.encoders import get_encoder
+
+    analyzer = askill_ext.EnhancedSkillGapAnalyzer(encoder=get_encoder('hashing'))
+    # Extraction needs a spaCy model; these tests only cover the matching step
+    monkeypatch.setattr(analyzer.skill_extractor, 'extract_skills', _extraction)
+    monkeypatch.setattr(analyzer.skill_extractor, 'extract_skills_batch',
+                        lambda texts, document_type='job_description', **kwargs: [_extraction(t) for t in texts])
+    return analyzer
+
+
+def test_resume_without_skills_is_ranked_against_every_jd(monkeypatch, tmp_path):
+    analyzer = _analyzer(monkeypatch, tmp_path)
+    result = analyzer.analyze_against_many('', ['Python Docker', 'Java', ''])
+
+    assert result['success'] and not result['failed']
+    assert sorted(entry['jd_index'] for entry in result['rankings']) == [0, 1, 2]
+    single = analyzer.analyze_skill_gap('', 'Python Docker')
+    many = next(entry['analysis'] for entry in result['rankings'] if entry['jd_index'] == 0)
+    assert many['missing_skills'] == single['missing_skills']
+
+
+def test_many_jds_match_single_analysis(monkeypatch, tmp_path):
+    analyzer = _analyzer(monkeypatch, tmp_path)
+    jds = ['Python Docker Kubernetes', 'Java Spring']
+    result = analyzer.analyze_against_many('Python Docker', jds)
+
+    assert [entry['jd_index'] for entry in result['rankings']] == [0, 1]
+    for entry in result['rankings']:
+        single = analyzer.analyze_skill_gap('Python Docker', jds[entry['jd_index']])
+        assert entry['overall_score'] == single['overall_score']
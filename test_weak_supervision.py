@@ -0,0 +1,45 @@
+import os
+import tempfile
+
+import spacy
+
+from src.weak_supervision import annotate_text, build_matchers, generate_annotations, iter_shard_docs
+
+TERMS = ["Python", "C", "Go", "AI", "machine learning"]
+
+
+def _entities(text):
+    nlp = spacy.blank('en')
+    nlp.add_pipe('sentencizer')
+    docs = annotate_text(text, nlp, build_matchers(nlp, TERMS), min_chars=1)
+    return [ent.text for doc in docs for ent in doc.ents]
+
+
+def test_short_terms_only_match_exact_case():
+    # "go" and "c" in plain prose are not skills
+    assert _entities("We go to market next quarter, see section c for details.") == []
+    assert _entities("Built services in Go and C with python and Machine Learning.") == \
+        ["Go", "C", "python", "Machine Learning"]
+
+
+def test_shards_come_from_the_manifest():
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, "corpus")
+        output = os.path.join(tmp, "shards")
+        os.makedirs(corpus)
+        with open(os.path.join(corpus, "resume.txt"), "w", encoding="utf-8") as f:
+            f.write("Five years of Python development for AI products.\n")
+
+        generate_annotations([corpus], output, terms=TERMS, negative_ratio=0.0)
+        # A leftover shard from an earlier run must not be read
+        os.replace(os.path.join(output, "shard-000-0000.spacy"), os.path.join(output, "shard-999-0000.spacy"))
+        generate_annotations([corpus], output, terms=TERMS, negative_ratio=0.0)
+
+        docs = list(iter_shard_docs(output, spacy.blank('en').vocab))
+        assert [doc.text for doc in docs] == ["Five years of Python development for AI products."]
+
+
+if __name__ == '__main__':
+    test_short_terms_only_match_exact_case()
+    test_shards_come_from_the_manifest()
+    print("weak supervision checks passed")